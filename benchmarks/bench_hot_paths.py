@@ -0,0 +1,263 @@
+"""Microbenchmarks of the `LiteLLMModel` code that runs on every agent step.
+
+Covers message mapping (cold, and warm from the per-conversation cache) on synthetic histories
+of 10 to 5,000 parts, base64 encoding of 1 and 8 MiB `BinaryContent` images (cold and
+cached), tool definition mapping (cold and cached, with the same and with rebuilt
+definitions) for 1 to 300 tools,
+`_process_response` on responses with many tool calls, and `LiteLLMStreamedResponse` event
+throughput on long chunk streams. Everything runs offline on fake LiteLLM objects.
+
+Each case is timed with an auto-calibrated loop and the best of `--repeat` runs is reported
+per call. Save a baseline and compare a later commit against it:
+
+Usage:
+    uv run python benchmarks/bench_hot_paths.py --save baseline.json
+    uv run python benchmarks/bench_hot_paths.py --compare baseline.json [--threshold 0.2]
+
+With `--compare`, exits with a non-zero status if any case is more than `--threshold`
+(a fraction, 0.2 = 20%) slower than in the baseline. `--filter` runs only the cases whose
+name contains the given text.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import sys
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import replace
+from itertools import cycle
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from pydantic_ai.messages import (
+    BinaryContent,
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+from pydantic_ai.models import ModelRequestParameters
+from pydantic_ai.tools import ToolDefinition
+
+from pydantic_ai_litellm import LiteLLMModel
+
+HISTORY_PARTS = (10, 100, 1000, 5000)
+TOOL_COUNTS = (1, 30, 300)
+RESPONSE_TOOL_CALLS = (1, 30, 300)
+STREAM_CHUNKS = (1000, 10000)
+IMAGE_MIB = (1, 8)
+
+Operation = Callable[[], Any]
+
+
+def make_history(parts: int) -> list[ModelMessage]:
+    """A tool loop of user prompts, text + tool call responses and tool returns, `parts` parts long."""
+    messages: list[ModelMessage] = [ModelRequest([SystemPromptPart('You are a helpful assistant.')])]
+    count, step = 1, 0
+    while count < parts:
+        call_id = f'call_{step}'
+        messages.append(ModelRequest([UserPromptPart(f'Question {step}: what is the weather in city {step}?')]))
+        messages.append(
+            ModelResponse(
+                [
+                    TextPart('Let me look that up.'),
+                    ToolCallPart('get_weather', {'city': f'city {step}', 'units': 'metric'}, call_id),
+                ]
+            )
+        )
+        messages.append(ModelRequest([ToolReturnPart('get_weather', {'temperature': 21, 'sky': 'clear'}, call_id)]))
+        count += 4
+        step += 1
+    return messages
+
+
+def rebuild_tools(params: ModelRequestParameters) -> ModelRequestParameters:
+    """`params` with new copies of its tool definitions, as pydantic-ai prepares them for each step."""
+    return replace(params, function_tools=[replace(tool) for tool in params.function_tools])
+
+
+def make_tools(count: int) -> list[ToolDefinition]:
+    return [
+        ToolDefinition(
+            name=f'tool_{i}',
+            description=f'Tool number {i}, which looks up records by id and filters.',
+            parameters_json_schema={
+                'type': 'object',
+                'properties': {
+                    'id': {'type': 'string', 'description': 'Record id'},
+                    'limit': {'type': 'integer', 'minimum': 1, 'maximum': 100},
+                    'filters': {'type': 'array', 'items': {'type': 'string'}},
+                },
+                'required': ['id'],
+            },
+        )
+        for i in range(count)
+    ]
+
+
+def make_response(tool_calls: int) -> SimpleNamespace:
+    calls = [
+        SimpleNamespace(
+            id=f'call_{i}',
+            function=SimpleNamespace(name=f'tool_{i % 30}', arguments=json.dumps({'id': str(i), 'limit': 10})),
+        )
+        for i in range(tool_calls)
+    ]
+    message = SimpleNamespace(content='Calling tools.', tool_calls=calls)
+    usage = SimpleNamespace(prompt_tokens=1000, completion_tokens=tool_calls * 20)
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=message)], usage=usage, model='gpt-4o', id='resp_1', created=1_700_000_000
+    )
+
+
+def make_chunks(count: int) -> list[SimpleNamespace]:
+    """Text deltas followed by one tool call whose arguments are streamed over a tenth of the chunks."""
+    chunks = []
+    text_chunks = count - count // 10
+    for i in range(text_chunks):
+        delta = SimpleNamespace(content='ab ' if i % 2 else 'cd', tool_calls=None)
+        chunks.append(SimpleNamespace(created=1_700_000_000, usage=None, choices=[SimpleNamespace(delta=delta)]))
+    args = ['{"items": ['] + ['"x", '] * (count // 10 - 2) + ['"y"]}']
+    for i, fragment in enumerate(args):
+        function = SimpleNamespace(name='tool_0' if i == 0 else None, arguments=fragment)
+        tool_call = SimpleNamespace(index=0, id='call_0' if i == 0 else None, function=function)
+        delta = SimpleNamespace(content=None, tool_calls=[tool_call])
+        chunks.append(SimpleNamespace(created=1_700_000_000, usage=None, choices=[SimpleNamespace(delta=delta)]))
+    return chunks
+
+
+async def _iterate(chunks: list[SimpleNamespace]):
+    for chunk in chunks:
+        yield chunk
+
+
+def cases() -> Iterator[tuple[str, Operation]]:
+    no_tools = ModelRequestParameters(function_tools=[], output_tools=[], allow_text_output=True)
+
+    for parts in HISTORY_PARTS:
+        history = make_history(parts)
+        cold = LiteLLMModel('gpt-4o', message_cache_size=0)
+        yield f'map_messages[cold,parts={parts}]', lambda m=cold, h=history: m._map_messages(h, no_tools)
+        warm = LiteLLMModel('gpt-4o')
+        yield f'map_messages[warm,parts={parts}]', lambda m=warm, h=history: m._map_messages(h, no_tools)
+
+    for mib in IMAGE_MIB:
+        image = BinaryContent(os.urandom(mib * 1024 * 1024), media_type='image/png')
+        history = [ModelRequest([UserPromptPart(['What is in this image?', image])])]
+        # Without the message cache, so every call maps the image again, as a new conversation would.
+        cold = LiteLLMModel('gpt-4o', message_cache_size=0, base64_cache_size=0)
+        yield f'map_image[cold,mib={mib}]', lambda m=cold, h=history: m._map_messages(h, no_tools)
+        warm = LiteLLMModel('gpt-4o', message_cache_size=0)
+        yield f'map_image[warm,mib={mib}]', lambda m=warm, h=history: m._map_messages(h, no_tools)
+
+    for count in TOOL_COUNTS:
+        params = ModelRequestParameters(function_tools=make_tools(count), output_tools=[], allow_text_output=True)
+        cold = LiteLLMModel('gpt-4o', tool_cache_size=0)
+        yield f'get_tools[cold,tools={count}]', lambda m=cold, p=params: m._get_tools(p)
+        warm = LiteLLMModel('gpt-4o')
+        yield f'get_tools[warm,tools={count}]', lambda m=warm, p=params: m._get_tools(p)
+        # pydantic-ai builds new tool definitions, around the same schema dicts, on every step; copies
+        # are made up front and taken in turn, so building them isn't timed.
+        for cache, size in (('cold', 0), ('warm', 256)):
+            model = LiteLLMModel('gpt-4o', tool_cache_size=size)
+            steps = cycle([rebuild_tools(params) for _ in range(8)])
+            yield f'get_tools[{cache},rebuilt,tools={count}]', lambda m=model, s=steps: m._get_tools(next(s))
+
+    model = LiteLLMModel('gpt-4o')
+    for tool_calls in RESPONSE_TOOL_CALLS:
+        response = make_response(tool_calls)
+        yield f'process_response[tool_calls={tool_calls}]', lambda r=response: model._process_response(r)
+
+    for count in STREAM_CHUNKS:
+        chunks = make_chunks(count)
+
+        async def consume(c: list[SimpleNamespace] = chunks) -> None:
+            streamed = await model._process_streamed_response(_iterate(c), no_tools)
+            async for _ in streamed:
+                pass
+
+        yield f'stream_events[chunks={count}]', consume
+
+
+async def _run(operation: Operation, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        result = operation()
+        if inspect.isawaitable(result):
+            await result
+    return time.perf_counter() - start
+
+
+async def measure(operation: Operation, *, repeat: int, min_time: float) -> float:
+    """The best time of `repeat` runs per call of `operation`, each run lasting at least `min_time`."""
+    number = 1
+    while (elapsed := await _run(operation, number)) < min_time:
+        number *= 2
+    best = min([elapsed] + [await _run(operation, number) for _ in range(repeat - 1)])
+    return best / number
+
+
+def _format(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f'{seconds * 1e6:9.1f}us'
+    return f'{seconds * 1e3:9.2f}ms'
+
+
+async def run(name_filter: str | None, repeat: int, min_time: float) -> dict[str, float]:
+    results: dict[str, float] = {}
+    for name, operation in cases():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = await measure(operation, repeat=repeat, min_time=min_time)
+        print(f'{name:<40} {_format(results[name])}', flush=True)
+    return results
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """The names of the cases that regressed by more than `threshold` relative to `baseline`."""
+    regressions = []
+    print(f'\n{"case":<40} {"baseline":>11} {"current":>11} {"change":>8}')
+    for name, seconds in results.items():
+        if (before := baseline.get(name)) is None:
+            continue
+        change = seconds / before - 1
+        flag = ' REGRESSION' if change > threshold else ''
+        print(f'{name:<40} {_format(before)} {_format(seconds)} {change:+8.1%}{flag}')
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', default=None)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.05)
+    parser.add_argument('--save', type=Path, default=None)
+    parser.add_argument('--compare', type=Path, default=None)
+    parser.add_argument('--threshold', type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.filter, args.repeat, args.min_time))
+    if args.save is not None:
+        args.save.write_text(json.dumps(results, indent=2) + '\n')
+    if args.compare is not None:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.threshold)
+        if regressions:
+            print(f'FAIL: {len(regressions)} case(s) more than {args.threshold:.0%} slower than the baseline')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""Measure the cold import time of `pydantic_ai_litellm` versus `litellm`.
+
+Each measurement runs in a fresh interpreter so nothing is cached in `sys.modules`.
+
+Usage:
+    uv run python benchmarks/bench_import.py [--repeat 5] [--max-seconds 1.5]
+
+With `--max-seconds`, exits with a non-zero status if the median import time of
+`pydantic_ai_litellm` exceeds the threshold, or if importing it pulls in litellm.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed, 'litellm' in sys.modules)
+"""
+
+
+def measure(module: str, repeat: int) -> tuple[float, bool]:
+    timings: list[float] = []
+    imported_litellm = False
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(module=module)], capture_output=True, text=True, check=True
+        ).stdout.split()
+        timings.append(float(output[0]))
+        imported_litellm = output[1] == 'True'
+    return statistics.median(timings), imported_litellm
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-seconds', type=float, default=None)
+    args = parser.parse_args()
+
+    ours, imported_litellm = measure('pydantic_ai_litellm', args.repeat)
+    theirs, _ = measure('litellm', args.repeat)
+    print(f'pydantic_ai_litellm: {ours:.3f}s (litellm imported: {imported_litellm})')
+    print(f'litellm:             {theirs:.3f}s')
+
+    if imported_litellm:
+        print('FAIL: importing pydantic_ai_litellm imported litellm')
+        return 1
+    if args.max_seconds is not None and ours > args.max_seconds:
+        print(f'FAIL: import took longer than {args.max_seconds:.3f}s')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
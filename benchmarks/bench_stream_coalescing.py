@@ -0,0 +1,80 @@
+"""Measure streamed event throughput and CPU use with and without text-delta coalescing.
+
+Runs many concurrent fake streams of small text chunks (1-3 characters, as many providers
+send) through `LiteLLMStreamedResponse` and reports chunks/sec, events/sec and CPU seconds.
+
+Usage:
+    uv run python benchmarks/bench_stream_coalescing.py [--streams 300] [--chunks 500] [--max-chars 64]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+from pydantic_ai.models import ModelRequestParameters
+
+from pydantic_ai_litellm import LiteLLMModel, TextCoalescing
+
+
+def make_chunks(count: int, seed: int) -> list[SimpleNamespace]:
+    rng = random.Random(seed)
+    chunks = []
+    for _ in range(count):
+        text = ''.join(rng.choice('abcdefghij ') for _ in range(rng.randint(1, 3)))
+        delta = SimpleNamespace(content=text, tool_calls=None)
+        chunks.append(SimpleNamespace(created=1_700_000_000, usage=None, choices=[SimpleNamespace(delta=delta)]))
+    return chunks
+
+
+async def fake_stream(chunks: list[SimpleNamespace]):
+    for chunk in chunks:
+        yield chunk
+        # Let other streams run, as a network read would.
+        await asyncio.sleep(0)
+
+
+async def consume(model: LiteLLMModel, chunks: list[SimpleNamespace], params: ModelRequestParameters) -> int:
+    streamed = await model._process_streamed_response(fake_stream(chunks), params)
+    events = 0
+    async for _ in streamed:
+        events += 1
+    return events
+
+
+async def run(model: LiteLLMModel, streams: list[list[SimpleNamespace]]) -> tuple[int, float, float]:
+    params = ModelRequestParameters(function_tools=[], output_tools=[], allow_text_output=True)
+    wall, cpu = time.perf_counter(), time.process_time()
+    events = sum(await asyncio.gather(*(consume(model, chunks, params) for chunks in streams)))
+    return events, time.perf_counter() - wall, time.process_time() - cpu
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--streams', type=int, default=300)
+    parser.add_argument('--chunks', type=int, default=500)
+    parser.add_argument('--max-chars', type=int, default=64)
+    parser.add_argument('--max-delay', type=float, default=0.05)
+    args = parser.parse_args()
+
+    streams = [make_chunks(args.chunks, seed) for seed in range(args.streams)]
+    total_chunks = args.streams * args.chunks
+    models = {
+        'off': LiteLLMModel('gpt-4o'),
+        'on': LiteLLMModel('gpt-4o', text_coalescing=TextCoalescing(max_chars=args.max_chars, max_delay=args.max_delay)),
+    }
+    for name, model in models.items():
+        events, wall, cpu = asyncio.run(run(model, streams))
+        print(
+            f'coalescing {name:>3}: {events:>8} events, {total_chunks / wall:>10.0f} chunks/s, '
+            f'{events / wall:>10.0f} events/s, {cpu:.2f}s CPU'
+        )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""Compare client CPU per 1k output tokens through LiteLLM and through `OpenAICompatibleTransport`.
+
+Both paths send the same requests to `fake_openai_server.py`, started in a subprocess so its
+CPU use isn't counted, and are measured with `time.process_time()` after a warm-up.
+
+Usage:
+    uv run python benchmarks/bench_transport.py [--requests 200] [--concurrency 20] [--output-tokens 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Don't fetch litellm's model cost map over the network.
+os.environ.setdefault('LITELLM_LOCAL_MODEL_COST_MAP', 'True')
+
+from pydantic_ai.messages import ModelRequest, UserPromptPart  # noqa: E402
+from pydantic_ai.models import ModelRequestParameters  # noqa: E402
+
+from pydantic_ai_litellm import LiteLLMModel, OpenAICompatibleTransport  # noqa: E402
+
+_SERVER = Path(__file__).with_name('fake_openai_server.py')
+_PARAMS = ModelRequestParameters(function_tools=[], output_tools=[], allow_text_output=True)
+
+
+async def run_one(model: LiteLLMModel, stream: bool) -> int:
+    messages = [ModelRequest([UserPromptPart('Write a long story.')])]
+    if not stream:
+        return (await model.request(messages, None, _PARAMS)).usage.output_tokens
+    async with model.request_stream(messages, None, _PARAMS) as streamed:
+        async for _ in streamed:
+            pass
+    return streamed.usage.output_tokens
+
+
+async def measure(model: LiteLLMModel, stream: bool, requests: int, concurrency: int) -> tuple[float, float, int]:
+    """Run `requests` requests, returning CPU seconds, wall seconds and output tokens."""
+    queue = iter(range(requests))
+    tokens = 0
+
+    async def worker() -> None:
+        nonlocal tokens
+        for _ in queue:
+            output_tokens = await run_one(model, stream)
+            tokens += output_tokens
+
+    await asyncio.gather(*(run_one(model, stream) for _ in range(concurrency)))  # warm up
+    cpu, wall = time.process_time(), time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.process_time() - cpu, time.perf_counter() - wall, tokens
+
+
+async def run(args: argparse.Namespace, api_base: str) -> None:
+    async with OpenAICompatibleTransport() as transport:
+        paths = {
+            'litellm': LiteLLMModel('openai/fake-model', api_base=api_base, api_key='sk-fake'),
+            'direct': LiteLLMModel('openai/fake-model', api_base=api_base, api_key='sk-fake', transport=transport),
+        }
+        paths['litellm'].warmup()
+        for stream in (True, False) if args.mode == 'both' else (args.mode == 'stream',):
+            results: dict[str, float] = {}
+            for name, model in paths.items():
+                cpu, wall, tokens = await measure(model, stream, args.requests, args.concurrency)
+                results[name] = cpu / tokens * 1000
+                print(
+                    f'{"stream" if stream else "complete":8}  {name:7}  {results[name] * 1e3:8.2f} ms CPU/1k tokens  '
+                    f'{tokens / wall:10.0f} tokens/s  ({tokens} tokens, {cpu:.2f}s CPU, {wall:.2f}s wall)'
+                )
+            print(f'{"":8}  speedup  {results["litellm"] / results["direct"]:8.2f}x')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=('stream', 'complete', 'both'), default='both')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--output-tokens', type=int, default=500)
+    args = parser.parse_args()
+
+    command = [sys.executable, str(_SERVER), '--port', '0', '--output-tokens', str(args.output_tokens)]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    try:
+        assert server.stdout is not None
+        url = server.stdout.readline().strip().removeprefix('listening on ')
+        asyncio.run(run(args, url + '/v1'))
+    finally:
+        server.terminate()
+        server.wait()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""A local OpenAI-compatible chat completions server for load tests, built on asyncio alone.
+
+Serves `POST /v1/chat/completions` (and `/chat/completions`), streamed (SSE) and non-streamed,
+over HTTP/1.1 keep-alive connections. Responses are shaped by:
+
+- `--ttft`: seconds before the first token (or before the whole non-streamed response), with
+  `--ttft-jitter` seconds of uniform jitter.
+- `--tokens-per-second` and `--output-tokens`: the pace and length of the generated text.
+- `--error-rate` / `--rate-limit-rate`: fractions of requests answered with a 500, or with a 429
+  and `Retry-After: --retry-after`.
+- `--script`: a JSON file with a list of steps, picked by the number of assistant messages in the
+  request, each either `{"text": "..."}` or `{"tool_calls": [{"name": "...", "arguments": {...}}]}`.
+  Without a script, a request offering tools first gets a call to its first tool (with arguments
+  made up from the tool's schema) and then a text answer.
+
+Usage:
+    uv run python benchmarks/fake_openai_server.py [--port 8000] [--ttft 0.2] [--tokens-per-second 50]
+
+The first line printed is `listening on http://HOST:PORT`; use `http://HOST:PORT/v1` as `api_base`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class ServerConfig:
+    ttft: float = 0.0
+    ttft_jitter: float = 0.0
+    tokens_per_second: float = 0.0
+    """Output pace; 0 sends all tokens at once."""
+    output_tokens: int = 32
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: float = 1.0
+    script: list[dict[str, Any]] | None = None
+    requests: int = field(default=0, init=False)
+
+
+def _example_value(schema: dict[str, Any]) -> Any:
+    if 'enum' in schema:
+        return schema['enum'][0]
+    kind = schema.get('type')
+    if kind == 'object':
+        return _example_args(schema)
+    if kind == 'array':
+        return [_example_value(schema.get('items') or {})]
+    return {'integer': 1, 'number': 1.5, 'boolean': True, 'null': None}.get(kind, 'example')
+
+
+def _example_args(schema: dict[str, Any]) -> dict[str, Any]:
+    """Arguments satisfying the required properties of a JSON schema."""
+    properties = schema.get('properties') or {}
+    return {name: _example_value(properties.get(name) or {}) for name in schema.get('required') or []}
+
+
+def choose_step(config: ServerConfig, body: dict[str, Any]) -> dict[str, Any]:
+    messages = body.get('messages') or []
+    step = sum(1 for message in messages if message.get('role') == 'assistant')
+    if config.script:
+        return config.script[min(step, len(config.script) - 1)]
+    tools = body.get('tools') or []
+    if tools and step == 0:
+        function = tools[0]['function']
+        return {'tool_calls': [{'name': function['name'], 'arguments': _example_args(function.get('parameters') or {})}]}
+    return {'text': ' '.join(f'tok{i}' for i in range(config.output_tokens))}
+
+
+def _tool_calls(step: dict[str, Any]) -> list[dict[str, Any]]:
+    return [
+        {
+            'id': f'call_{uuid.uuid4().hex[:12]}',
+            'type': 'function',
+            'function': {'name': call['name'], 'arguments': json.dumps(call.get('arguments') or {})},
+        }
+        for call in step['tool_calls']
+    ]
+
+
+def _usage(body: dict[str, Any], completion_tokens: int) -> dict[str, int]:
+    prompt_tokens = len(json.dumps(body.get('messages') or [])) // 4
+    return {
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': completion_tokens,
+        'total_tokens': prompt_tokens + completion_tokens,
+    }
+
+
+class FakeOpenAIServer:
+    """Answers chat completion requests per `config`; see the module docstring."""
+
+    def __init__(self, config: ServerConfig):
+        self.config = config
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers: dict[str, str] = {}
+                while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length') or 0))
+                await self.respond(method, path.split('?', 1)[0], body, writer)
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, method: str, path: str, raw_body: bytes, writer: asyncio.StreamWriter) -> None:
+        config = self.config
+        if method != 'POST' or path.rstrip('/') not in ('/v1/chat/completions', '/chat/completions'):
+            return await self._send_json(writer, 404, {'error': {'message': f'No route for {method} {path}'}})
+        config.requests += 1
+        body = json.loads(raw_body or b'{}')
+
+        roll = random.random()
+        if roll < config.rate_limit_rate:
+            error = {'error': {'message': 'Rate limit reached', 'type': 'rate_limit_error', 'code': 'rate_limit'}}
+            return await self._send_json(writer, 429, error, {'retry-after': f'{config.retry_after:g}'})
+        if roll < config.rate_limit_rate + config.error_rate:
+            error = {'error': {'message': 'Internal server error', 'type': 'server_error'}}
+            return await self._send_json(writer, 500, error)
+
+        step = choose_step(config, body)
+        await asyncio.sleep(config.ttft + random.uniform(0, config.ttft_jitter))
+        if body.get('stream'):
+            await self._stream(writer, body, step)
+        else:
+            await self._complete(writer, body, step)
+
+    async def _complete(self, writer: asyncio.StreamWriter, body: dict[str, Any], step: dict[str, Any]) -> None:
+        message: dict[str, Any] = {'role': 'assistant', 'content': None}
+        if 'tool_calls' in step:
+            message['tool_calls'] = _tool_calls(step)
+            tokens, finish_reason = 20 * len(step['tool_calls']), 'tool_calls'
+        else:
+            message['content'] = step['text']
+            tokens, finish_reason = len(step['text'].split()), 'stop'
+        if self.config.tokens_per_second:
+            await asyncio.sleep(tokens / self.config.tokens_per_second)
+        await self._send_json(
+            writer,
+            200,
+            {
+                'id': f'chatcmpl-{uuid.uuid4().hex}',
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': body.get('model', 'fake'),
+                'choices': [{'index': 0, 'message': message, 'finish_reason': finish_reason}],
+                'usage': _usage(body, tokens),
+            },
+        )
+
+    async def _stream(self, writer: asyncio.StreamWriter, body: dict[str, Any], step: dict[str, Any]) -> None:
+        writer.write(
+            b'HTTP/1.1 200 OK\r\ncontent-type: text/event-stream\r\ncache-control: no-cache\r\n'
+            b'transfer-encoding: chunked\r\n\r\n'
+        )
+        base = {
+            'id': f'chatcmpl-{uuid.uuid4().hex}',
+            'object': 'chat.completion.chunk',
+            'created': int(time.time()),
+            'model': body.get('model', 'fake'),
+        }
+
+        async def send(delta: dict[str, Any], finish_reason: str | None = None, **extra: Any) -> None:
+            chunk = {**base, 'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}], **extra}
+            data = f'data: {json.dumps(chunk)}\n\n'.encode()
+            writer.write(b'%x\r\n%s\r\n' % (len(data), data))
+            await writer.drain()
+
+        if 'tool_calls' in step:
+            tokens, finish_reason = 20 * len(step['tool_calls']), 'tool_calls'
+            for index, call in enumerate(_tool_calls(step)):
+                await send({'role': 'assistant', 'tool_calls': [{'index': index, **call}]})
+        else:
+            words = step['text'].split()
+            tokens, finish_reason = len(words), 'stop'
+            delay = 1 / self.config.tokens_per_second if self.config.tokens_per_second else 0
+            for i, word in enumerate(words):
+                if i and delay:
+                    await asyncio.sleep(delay)
+                await send({'role': 'assistant', 'content': word if i == 0 else f' {word}'})
+        await send({}, finish_reason)
+        if (body.get('stream_options') or {}).get('include_usage'):
+            chunk = {**base, 'choices': [], 'usage': _usage(body, tokens)}
+            data = f'data: {json.dumps(chunk)}\n\n'.encode()
+            writer.write(b'%x\r\n%s\r\n' % (len(data), data))
+        data = b'data: [DONE]\n\n'
+        writer.write(b'%x\r\n%s\r\n0\r\n\r\n' % (len(data), data))
+        await writer.drain()
+
+    async def _send_json(
+        self, writer: asyncio.StreamWriter, status: int, payload: Any, headers: dict[str, str] | None = None
+    ) -> None:
+        data = json.dumps(payload).encode()
+        reason = {200: 'OK', 404: 'Not Found', 429: 'Too Many Requests', 500: 'Internal Server Error'}[status]
+        head = f'HTTP/1.1 {status} {reason}\r\ncontent-type: application/json\r\ncontent-length: {len(data)}\r\n'
+        for name, value in (headers or {}).items():
+            head += f'{name}: {value}\r\n'
+        writer.write(head.encode() + b'\r\n' + data)
+        await writer.drain()
+
+
+async def serve(config: ServerConfig, host: str = '127.0.0.1', port: int = 0) -> asyncio.Server:
+    """Start a server for `config`; with `port=0` a free port is picked (see `server.sockets`)."""
+    return await asyncio.start_server(FakeOpenAIServer(config).handle, host, port, backlog=4096)
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    config = ServerConfig(
+        ttft=args.ttft,
+        ttft_jitter=args.ttft_jitter,
+        tokens_per_second=args.tokens_per_second,
+        output_tokens=args.output_tokens,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        script=json.loads(open(args.script).read()) if args.script else None,
+    )
+    server = await serve(config, args.host, args.port)
+    host, port = server.sockets[0].getsockname()[:2]
+    print(f'listening on http://{host}:{port}', flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--ttft', type=float, default=0.0)
+    parser.add_argument('--ttft-jitter', type=float, default=0.0)
+    parser.add_argument('--tokens-per-second', type=float, default=0.0)
+    parser.add_argument('--output-tokens', type=int, default=32)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--retry-after', type=float, default=1.0)
+    parser.add_argument('--script', default=None)
+    try:
+        asyncio.run(main_async(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""Drive `LiteLLMModel` or a pydantic-ai `Agent` at high concurrency against a local stand-in server.
+
+Requests go through the real `api_base` path (litellm's OpenAI client, HTTP connection pool and
+response parsing) to `fake_openai_server.py`, which is started in a subprocess unless `--url`
+points at one already running. Server behaviour (TTFT, tokens/sec, error and 429 rates, tool
+call scripts) is set with the same options as the server's own CLI.
+
+Reports throughput, latency and time-to-first-event percentiles, errors by type, event loop
+lag (how late a 10 ms timer fires) and RSS.
+
+Usage:
+    uv run python benchmarks/load_test.py --target model --stream --concurrency 1000 --requests 20000
+    uv run python benchmarks/load_test.py --target agent --concurrency 500 --duration 60 --ttft 0.3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Don't fetch litellm's model cost map over the network.
+os.environ.setdefault('LITELLM_LOCAL_MODEL_COST_MAP', 'True')
+
+from pydantic_ai import Agent  # noqa: E402
+from pydantic_ai.messages import ModelRequest, UserPromptPart  # noqa: E402
+from pydantic_ai.models import ModelRequestParameters  # noqa: E402
+
+from pydantic_ai_litellm import (  # noqa: E402
+    ConnectionPools,
+    LiteLLMModel,
+    OpenAICompatibleTransport,
+    PoolLimits,
+    RetryPolicy,
+)
+
+_SERVER = Path(__file__).with_name('fake_openai_server.py')
+_SERVER_OPTIONS = (
+    'ttft',
+    'ttft_jitter',
+    'tokens_per_second',
+    'output_tokens',
+    'error_rate',
+    'rate_limit_rate',
+    'retry_after',
+    'script',
+)
+
+
+@dataclass
+class Results:
+    latencies: list[float] = field(default_factory=list)
+    first_events: list[float] = field(default_factory=list)
+    output_tokens: int = 0
+    errors: Counter[str] = field(default_factory=Counter)
+    loop_lags: list[float] = field(default_factory=list)
+    peak_rss: int = 0
+
+
+def rss_bytes() -> int:
+    """The current resident set size, or the peak where that isn't available."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+async def monitor(results: Results, stop: asyncio.Event, interval: float = 0.01) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        results.loop_lags.append(max(loop.time() - start - interval, 0.0))
+        if len(results.loop_lags) % 50 == 0:
+            results.peak_rss = max(results.peak_rss, rss_bytes())
+
+
+async def model_run(model: LiteLLMModel, prompt: str, results: Results) -> None:
+    messages = [ModelRequest([UserPromptPart(prompt)])]
+    params = ModelRequestParameters(function_tools=[], output_tools=[], allow_text_output=True)
+    start = time.perf_counter()
+    response = await model.request(messages, None, params)
+    results.latencies.append(time.perf_counter() - start)
+    results.output_tokens += response.usage.output_tokens
+
+
+async def model_stream_run(model: LiteLLMModel, prompt: str, results: Results) -> None:
+    messages = [ModelRequest([UserPromptPart(prompt)])]
+    params = ModelRequestParameters(function_tools=[], output_tools=[], allow_text_output=True)
+    start = time.perf_counter()
+    first_event: float | None = None
+    async with model.request_stream(messages, None, params) as streamed:
+        async for _ in streamed:
+            if first_event is None:
+                first_event = time.perf_counter() - start
+    results.latencies.append(time.perf_counter() - start)
+    if first_event is not None:
+        results.first_events.append(first_event)
+    results.output_tokens += streamed.usage.output_tokens
+
+
+def make_agent(model: LiteLLMModel) -> Agent[None, str]:
+    agent = Agent(model, instructions='You are a weather assistant. Use the tool to answer.')
+
+    @agent.tool_plain
+    def get_weather(city: str) -> str:
+        """Look up the current weather in a city."""
+        return f'It is sunny in {city}.'
+
+    return agent
+
+
+async def agent_run(agent: Agent[None, str], stream: bool, prompt: str, results: Results) -> None:
+    start = time.perf_counter()
+    if stream:
+        first_event: float | None = None
+        async with agent.run_stream(prompt) as result:
+            async for _ in result.stream_text(delta=True):
+                if first_event is None:
+                    first_event = time.perf_counter() - start
+            usage = result.usage
+        if first_event is not None:
+            results.first_events.append(first_event)
+    else:
+        usage = (await agent.run(prompt)).usage
+    results.latencies.append(time.perf_counter() - start)
+    results.output_tokens += usage.output_tokens
+
+
+async def drive(args: argparse.Namespace, api_base: str) -> tuple[Results, float]:
+    retry_policy = RetryPolicy(max_attempts=args.retries + 1) if args.retries else None
+    pools = ConnectionPools(PoolLimits(max_connections=args.max_connections)) if args.max_connections else None
+    transport = OpenAICompatibleTransport() if args.direct else None
+    model = LiteLLMModel(
+        'openai/fake-model',
+        api_base=api_base,
+        api_key='sk-fake',
+        retry_policy=retry_policy,
+        connection_pools=pools,
+        transport=transport,
+    )
+    # Import litellm before measuring; `bench_import.py` covers cold starts.
+    model.warmup()
+    agent = make_agent(model) if args.target == 'agent' else None
+    results = Results()
+    deadline = time.perf_counter() + args.duration if args.duration else None
+    issued = 0
+
+    async def worker(worker_id: int) -> None:
+        nonlocal issued
+        while (deadline is None and issued < args.requests) or (deadline is not None and time.perf_counter() < deadline):
+            issued += 1
+            prompt = f'What is the weather in city {worker_id}-{issued}?'
+            try:
+                if agent is not None:
+                    await agent_run(agent, args.stream, prompt, results)
+                elif args.stream:
+                    await model_stream_run(model, prompt, results)
+                else:
+                    await model_run(model, prompt, results)
+            except Exception as e:
+                results.errors[type(e).__name__] += 1
+
+    stop = asyncio.Event()
+    monitor_task = asyncio.create_task(monitor(results, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await monitor_task
+    results.peak_rss = max(results.peak_rss, rss_bytes())
+    if pools is not None:
+        stats = pools.stats(api_base)
+        print(
+            f'connection pool: {stats.connections_created} opened, {stats.connections_reused} reused, '
+            f'{stats.waits} waits (mean {stats.mean_wait * 1e3:.1f}ms)'
+        )
+        await pools.aclose()
+    if transport is not None:
+        await transport.aclose()
+    return results, elapsed
+
+
+def percentiles(values: list[float]) -> str:
+    if len(values) < 2:
+        return 'n/a'
+    cuts = statistics.quantiles(values, n=100, method='inclusive')
+    return f'p50 {cuts[49] * 1e3:8.1f}ms  p90 {cuts[89] * 1e3:8.1f}ms  p99 {cuts[98] * 1e3:8.1f}ms  max {max(values) * 1e3:8.1f}ms'
+
+
+def report(results: Results, elapsed: float) -> None:
+    completed = len(results.latencies)
+    print(f'completed:      {completed} in {elapsed:.1f}s ({completed / elapsed:.1f} runs/s)')
+    print(f'output tokens:  {results.output_tokens} ({results.output_tokens / elapsed:.0f}/s)')
+    print(f'latency:        {percentiles(results.latencies)}')
+    if results.first_events:
+        print(f'first event:    {percentiles(results.first_events)}')
+    print(f'event loop lag: {percentiles(results.loop_lags)}')
+    print(f'peak RSS:       {results.peak_rss / 2**20:.0f} MiB')
+    if results.errors:
+        print('errors:         ' + ', '.join(f'{name} x{count}' for name, count in results.errors.most_common()))
+
+
+def start_server(args: argparse.Namespace) -> tuple[subprocess.Popen[str], str]:
+    command = [sys.executable, str(_SERVER), '--port', '0']
+    for option in _SERVER_OPTIONS:
+        if (value := getattr(args, option)) is not None:
+            command += [f'--{option.replace("_", "-")}', str(value)]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    assert server.stdout is not None
+    line = server.stdout.readline().strip()
+    if not line.startswith('listening on '):
+        server.kill()
+        raise RuntimeError(f'The stand-in server failed to start: {line!r}')
+    return server, line.removeprefix('listening on ')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', choices=('model', 'agent'), default='model')
+    parser.add_argument('--stream', action='store_true')
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=1000, help='total runs, unless --duration is set')
+    parser.add_argument('--duration', type=float, default=None, help='seconds to keep issuing runs for')
+    parser.add_argument('--retries', type=int, default=0, help='retry 429s and 5xx up to this many times')
+    parser.add_argument('--max-connections', type=int, default=0, help='use a shared ConnectionPools of this size')
+    parser.add_argument('--direct', action='store_true', help='send requests with OpenAICompatibleTransport')
+    parser.add_argument('--url', default=None, help='base URL of an already running stand-in server')
+    server_options = parser.add_argument_group('stand-in server (ignored with --url)')
+    server_options.add_argument('--ttft', type=float, default=None)
+    server_options.add_argument('--ttft-jitter', type=float, default=None)
+    server_options.add_argument('--tokens-per-second', type=float, default=None)
+    server_options.add_argument('--output-tokens', type=int, default=None)
+    server_options.add_argument('--error-rate', type=float, default=None)
+    server_options.add_argument('--rate-limit-rate', type=float, default=None)
+    server_options.add_argument('--retry-after', type=float, default=None)
+    server_options.add_argument('--script', default=None)
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        server, url = start_server(args)
+    try:
+        results, elapsed = asyncio.run(drive(args, url.rstrip('/') + '/v1'))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    report(results, elapsed)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,27 @@
 from importlib import metadata
 
+from .connection_pool import ConnectionPools, PoolLimits, PoolStats
+from .exceptions import (
+    LiteLLMAPIError,
+    LiteLLMConnectionError,
+    LiteLLMContentPolicyError,
+    LiteLLMContextWindowExceededError,
+    LiteLLMRateLimitError,
+    LiteLLMServiceUnavailableError,
+    LiteLLMTimeoutError,
+    LiteLLMStreamTimeoutError,
+)
+from .hedging import HedgePolicy
 from .litellm_model import LiteLLMModel, LiteLLMModelSettings
+from .profiling import PhaseTiming, RequestProfile, SlowRequestLog
+from .rate_limit import RateLimiter, RateLimitStats
+from .response_cache import InMemoryResponseCache, ResponseCache, SQLiteResponseCache
+from .retry import RetryPolicy
+from .routing import AffinityRouter, Deployment, DeploymentStats, LatencyRouter, Router
+from .single_flight import SingleFlight
+from .streaming import StreamResume, TextCoalescing
+from .telemetry import Telemetry
+from .transport import OpenAICompatibleTransport
 
 try:
     __version__ = metadata.version(__package__)
@@ -12,5 +33,36 @@ del metadata  # optional, avoids polluting the results of dir(__package__)
 __all__ = [
     "LiteLLMModel",
     "LiteLLMModelSettings",
+    "RateLimiter",
+    "RateLimitStats",
+    "ResponseCache",
+    "InMemoryResponseCache",
+    "SQLiteResponseCache",
+    "SingleFlight",
+    "TextCoalescing",
+    "StreamResume",
+    "Telemetry",
+    "RequestProfile",
+    "PhaseTiming",
+    "SlowRequestLog",
+    "ConnectionPools",
+    "PoolLimits",
+    "PoolStats",
+    "OpenAICompatibleTransport",
+    "RetryPolicy",
+    "HedgePolicy",
+    "Router",
+    "LatencyRouter",
+    "AffinityRouter",
+    "Deployment",
+    "DeploymentStats",
+    "LiteLLMAPIError",
+    "LiteLLMRateLimitError",
+    "LiteLLMTimeoutError",
+    "LiteLLMStreamTimeoutError",
+    "LiteLLMConnectionError",
+    "LiteLLMServiceUnavailableError",
+    "LiteLLMContextWindowExceededError",
+    "LiteLLMContentPolicyError",
     "__version__",
 ]
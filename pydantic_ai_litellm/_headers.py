@@ -0,0 +1,55 @@
+"""Helpers for reading provider response headers surfaced by LiteLLM."""
+
+from __future__ import annotations as _annotations
+
+import re
+import time
+from collections.abc import Mapping
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|s|m|h)')
+_DURATION_UNITS = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+
+
+def response_headers(obj: Any) -> Mapping[str, str]:
+    """Find the provider response headers LiteLLM attaches to a response, stream or exception."""
+    hidden_params = getattr(obj, '_hidden_params', None)
+    if isinstance(hidden_params, Mapping) and isinstance(headers := hidden_params.get('additional_headers'), Mapping):
+        return {k.lower(): v for k, v in headers.items()}
+    for headers in (getattr(obj, 'litellm_response_headers', None), getattr(getattr(obj, 'response', None), 'headers', None)):
+        if isinstance(headers, Mapping) and headers:
+            return {k.lower(): v for k, v in headers.items()}
+    return {}
+
+
+def retry_after(headers: Mapping[str, str]) -> float | None:
+    """Seconds to wait according to `retry-after-ms` or `retry-after` (seconds or an HTTP date), if present."""
+    if (ms := parse_float(headers.get('retry-after-ms'))) is not None:
+        return ms / 1000
+    value = headers.get('retry-after')
+    if value is None:
+        return None
+    if (seconds := parse_float(value)) is not None:
+        return seconds
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_duration(value: str | None) -> float | None:
+    """Parse OpenAI-style reset durations such as `1s`, `250ms` or `6m0s`."""
+    if value is None:
+        return None
+    if (seconds := parse_float(value)) is not None:
+        return seconds
+    parts = _DURATION_PART.findall(value)
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts) if parts else None
+
+
+def parse_float(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,120 @@
+"""Per-conversation cache of mapped LiteLLM messages."""
+
+from __future__ import annotations as _annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from operator import is_
+from typing import Any
+
+from pydantic_ai.messages import ModelMessage
+
+__all__ = ('MessageMappingCache',)
+
+
+def _message_signature(message: ModelMessage) -> tuple[Any, ...]:
+    """Build an identity signature of everything `_map_messages` reads from a message.
+
+    Agents append new message objects rather than rebuilding old ones, so comparing the
+    parts list, each part and each part attribute by identity is enough to tell whether
+    a message still maps to the same dicts, without paying for the mapping itself.
+    Note that mutating a mutable value in place (e.g. appending to a list passed as
+    `UserPromptPart.content`) is not detected; assign a new value instead.
+    """
+    signature: list[Any] = [message.parts, len(message.parts)]
+    for part in message.parts:
+        attrs = vars(part)
+        signature.append(part)
+        signature.append(len(attrs))
+        signature.extend(attrs.values())
+    return tuple(signature)
+
+
+def _same_signature(a: tuple[Any, ...], b: tuple[Any, ...]) -> bool:
+    return len(a) == len(b) and all(map(is_, a, b))
+
+
+@dataclass
+class _CachedMessage:
+    message: ModelMessage
+    signature: tuple[Any, ...]
+    context: Hashable
+    mapped: list[dict[str, Any]]
+
+
+class MessageMappingCache:
+    """Remembers the LiteLLM dicts produced for each `ModelMessage` of recent conversations.
+
+    On every request only messages that are new, replaced or changed since the previous
+    request of the same conversation are mapped again, so a tool loop of N steps does
+    O(N) mapping work instead of O(N²). Entries are dropped as soon as a message
+    disappears from the history (e.g. trimmed by a history processor), and at most
+    `max_conversations` conversations are kept, evicting the least recently used.
+
+    The cached dicts are shared between requests and must not be mutated.
+    """
+
+    def __init__(self, max_conversations: int = 32):
+        self.max_conversations = max_conversations
+        self._conversations: OrderedDict[Hashable, dict[int, _CachedMessage]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def map(
+        self,
+        messages: list[ModelMessage],
+        map_message: Callable[[ModelMessage], list[dict[str, Any]]],
+        context: Hashable = None,
+    ) -> list[dict[str, Any]]:
+        """Map `messages` with `map_message`, reusing the results of unchanged messages.
+
+        `context` identifies anything besides the messages that the mapping depends on (e.g. the
+        provider the request is sent to); results mapped under another context aren't reused.
+        """
+        if not messages or self.max_conversations <= 0:
+            return [mapped for message in messages for mapped in map_message(message)]
+
+        key, previous = self._pop_conversation(messages)
+        current: dict[int, _CachedMessage] = {}
+        result: list[dict[str, Any]] = []
+
+        for message in messages:
+            signature = _message_signature(message)
+            cached = previous.get(id(message))
+            if (
+                cached is not None
+                and cached.message is message
+                and cached.context == context
+                and _same_signature(cached.signature, signature)
+            ):
+                self.hits += 1
+            else:
+                self.misses += 1
+                cached = _CachedMessage(message, signature, context, map_message(message))
+            current[id(message)] = cached
+            result.extend(cached.mapped)
+
+        self._conversations[key] = current
+        while len(self._conversations) > self.max_conversations:
+            self._conversations.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        """Forget all cached conversations."""
+        self._conversations.clear()
+
+    def _pop_conversation(self, messages: list[ModelMessage]) -> tuple[Hashable, dict[int, _CachedMessage]]:
+        first = messages[0]
+        if first.conversation_id:
+            return first.conversation_id, self._conversations.pop(first.conversation_id, None) or {}
+
+        # Without a conversation ID, find the conversation that already contains the first message,
+        # so histories trimmed from the front by a history processor keep their cached entries.
+        key: Hashable = ('message', id(first))
+        for existing_key, entries in self._conversations.items():
+            cached = entries.get(id(first))
+            if cached is not None and cached.message is first:
+                del self._conversations[existing_key]
+                return key, entries
+        return key, {}
@@ -0,0 +1,104 @@
+"""Placement of provider prompt-caching (`cache_control`) breakpoints on mapped requests."""
+
+from __future__ import annotations as _annotations
+
+from typing import Any, Literal
+
+CacheStrategy = Literal['breakpoints', 'prefix']
+
+_EPHEMERAL: dict[str, str] = {'type': 'ephemeral'}
+
+# Anthropic allows at most 4 cache breakpoints per request, wherever Claude is hosted.
+MAX_BREAKPOINTS = 4
+
+# Providers that host Claude models and forward `cache_control` to them.
+_CLAUDE_HOSTS = frozenset({'bedrock', 'bedrock_converse', 'vertex_ai', 'vertex_ai_beta', 'azure_ai', 'openrouter'})
+_GEMINI_HOSTS = frozenset({'gemini', 'vertex_ai', 'vertex_ai_beta'})
+
+
+def cache_strategy(model: str, custom_llm_provider: str | None = None) -> CacheStrategy | None:
+    """How prompt caching is requested from the provider serving `model`, if it needs explicit markers.
+
+    `'breakpoints'`: Anthropic-style markers, up to `MAX_BREAKPOINTS`, each caching everything before it.
+    `'prefix'`: Gemini context caching, which caches a single contiguous block of marked messages.
+    `None`: no markers, either because the provider caches automatically (e.g. OpenAI) or doesn't cache.
+    """
+    provider, _, name = model.rpartition('/')
+    provider = custom_llm_provider or provider.split('/', 1)[0]
+    name = name.lower()
+    if provider == 'anthropic' or ('claude' in name and (not provider or provider in _CLAUDE_HOSTS)):
+        return 'breakpoints'
+    if provider == 'gemini' or ('gemini' in name and (not provider or provider in _GEMINI_HOSTS)):
+        return 'prefix'
+    return None
+
+
+def add_cache_breakpoints(completion_kwargs: dict[str, Any], strategy: CacheStrategy) -> int:
+    """Mark the stable prefix of the request in `completion_kwargs` for provider prompt caching.
+
+    With `'breakpoints'` the last tool definition, the system/instruction block and the last
+    message are marked, in that order of priority, so each request writes a cache entry that the
+    next step of the conversation reads. With `'prefix'` only the system/instruction block is
+    marked, as Gemini creates a separate cached content object for every distinct marked block.
+
+    Marked messages and tools are copies: the originals may be shared with the mapping caches.
+    Returns the number of breakpoints placed.
+    """
+    messages: list[dict[str, Any]] = list(completion_kwargs.get('messages') or [])
+    system_count = next((i for i, m in enumerate(messages) if m.get('role') != 'system'), len(messages))
+    placed = 0
+
+    if strategy == 'prefix':
+        for i in range(system_count):
+            messages[i] = _mark_message(messages[i])
+        completion_kwargs['messages'] = messages
+        return system_count
+
+    tools: list[dict[str, Any]] = list(completion_kwargs.get('tools') or [])
+    # Markers already present (e.g. set by the caller on tool definitions) count towards the limit.
+    budget = MAX_BREAKPOINTS - sum(map(_count_markers, tools)) - sum(map(_count_markers, messages))
+    if tools and placed < budget:
+        tools[-1] = {**tools[-1], 'cache_control': _EPHEMERAL}
+        completion_kwargs['tools'] = tools
+        placed += 1
+    if system_count and placed < budget:
+        messages[system_count - 1] = _mark_message(messages[system_count - 1])
+        placed += 1
+    if len(messages) > system_count and placed < budget:
+        messages[-1] = _mark_message(messages[-1])
+        placed += 1
+
+    completion_kwargs['messages'] = messages
+    return placed
+
+
+def _mark_message(message: dict[str, Any]) -> dict[str, Any]:
+    """A copy of `message` with a cache breakpoint at its end."""
+    content = message.get('content')
+    if isinstance(content, str) and content and message.get('role') != 'tool':
+        return {**message, 'content': [{'type': 'text', 'text': content, 'cache_control': _EPHEMERAL}]}
+    if isinstance(content, list) and content and isinstance(content[-1], dict):
+        return {**message, 'content': [*content[:-1], {**content[-1], 'cache_control': _EPHEMERAL}]}
+    # Tool results and content-less assistant tool calls take the marker on the message itself.
+    return {**message, 'cache_control': _EPHEMERAL}
+
+
+def _count_markers(item: dict[str, Any]) -> int:
+    count = int('cache_control' in item)
+    content = item.get('content')
+    if isinstance(content, list):
+        count += sum(isinstance(block, dict) and 'cache_control' in block for block in content)
+    return count
+
+
+def without_cache_control(message: dict[str, Any]) -> dict[str, Any]:
+    """`message` as it was before `add_cache_breakpoints` marked it."""
+    if 'cache_control' in message:
+        message = {k: v for k, v in message.items() if k != 'cache_control'}
+    content = message.get('content')
+    if isinstance(content, list) and content and isinstance(content[-1], dict) and 'cache_control' in content[-1]:
+        last = {k: v for k, v in content[-1].items() if k != 'cache_control'}
+        if len(content) == 1 and last.get('type') == 'text' and set(last) == {'type', 'text'}:
+            return {**message, 'content': last['text']}
+        return {**message, 'content': [*content[:-1], last]}
+    return message
@@ -0,0 +1,103 @@
+"""Reading an async iterator ahead of its consumer in a background task."""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from typing import Any
+
+from pydantic_ai import _utils
+
+TIMED_OUT = object()
+"""Returned by `ReadAhead.get` when its deadline passes before an item arrives."""
+
+
+class _Failed:
+    __slots__ = ('error',)
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class ReadAhead:
+    """Iterates `source` in a background task, buffering up to `maxsize` items.
+
+    Unlike an `asyncio.Queue` read under `asyncio.wait_for`, waiting with a deadline costs a
+    timer rather than a task per item, and timing out never cancels the read of `source`.
+    Exceptions raised by `source` are re-raised by `get` after the items read before them.
+    """
+
+    def __init__(self, source: AsyncIterator[Any], maxsize: int = 64):
+        self._source = source
+        self._maxsize = max(maxsize, 1)
+        self._items: deque[Any] = deque()
+        self._item_waiter: asyncio.Future[None] | None = None
+        self._space_waiter: asyncio.Future[None] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            async for item in self._source:
+                self._put(item)
+                while len(self._items) >= self._maxsize:
+                    self._space_waiter = loop.create_future()
+                    await self._space_waiter
+            self._put(_utils.UNSET)
+        except Exception as e:
+            self._put(_Failed(e))
+
+    def _put(self, item: Any) -> None:
+        self._items.append(item)
+        if self._item_waiter is not None and not self._item_waiter.done():
+            self._item_waiter.set_result(None)
+
+    async def get(self, deadline: float | None = None) -> Any:
+        """The next item, `UNSET` at the end of `source`, or `TIMED_OUT` if `deadline` (loop time) passes first."""
+        self.start()
+        if not self._items:
+            loop = asyncio.get_running_loop()
+            self._item_waiter = waiter = loop.create_future()
+            timer = None if deadline is None else loop.call_at(deadline, _wake, waiter)
+            try:
+                await waiter
+            finally:
+                self._item_waiter = None
+                if timer is not None:
+                    timer.cancel()
+            if not self._items:
+                return TIMED_OUT
+
+        item = self._items.popleft()
+        if self._space_waiter is not None and not self._space_waiter.done():
+            self._space_waiter.set_result(None)
+        if isinstance(item, _Failed):
+            raise item.error
+        return item
+
+    def __aiter__(self) -> ReadAhead:
+        return self
+
+    async def __anext__(self) -> Any:
+        item = await self.get()
+        if isinstance(item, _utils.Unset):
+            raise StopAsyncIteration
+        return item
+
+    async def aclose(self) -> None:
+        """Stop reading and close `source`."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        if (aclose := getattr(self._source, 'aclose', None)) is not None:
+            await aclose()
+
+
+def _wake(waiter: asyncio.Future[None]) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
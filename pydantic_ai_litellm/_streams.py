@@ -0,0 +1,53 @@
+"""Stream wrappers whose cleanup runs even if they are closed before being iterated."""
+
+from __future__ import annotations as _annotations
+
+from collections.abc import AsyncIterable, Awaitable, Callable
+from inspect import isawaitable
+from typing import Any
+
+
+class ClosingStream:
+    """Iterates `chunks`, calling `on_chunk` with each, and runs `on_close` once when it ends, fails or is closed.
+
+    An async generator's `finally` block doesn't run if the generator is closed before its first
+    chunk was requested, as happens to a hedged stream that lost the race, so wrappers that hold
+    resources (an open provider stream, a rate limit slot, a deployment's in-flight count) use
+    this instead.
+    """
+
+    def __init__(
+        self,
+        chunks: AsyncIterable[Any],
+        on_close: Callable[[], Awaitable[None] | None],
+        on_chunk: Callable[[Any], None] | None = None,
+    ):
+        self._chunks = aiter(chunks)
+        self._on_close = on_close
+        self._on_chunk = on_chunk
+        self._closed = False
+
+    def __aiter__(self) -> ClosingStream:
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            chunk = await self._chunks.__anext__()
+        except BaseException:
+            await self.aclose()
+            raise
+        if self._on_chunk is not None:
+            self._on_chunk(chunk)
+        return chunk
+
+    async def aclose(self) -> None:
+        """Close `chunks` and run `on_close`; closing again is a no-op."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if (aclose := getattr(self._chunks, 'aclose', None)) is not None:
+                await aclose()
+        finally:
+            if isawaitable(result := self._on_close()):
+                await result
@@ -0,0 +1,48 @@
+"""Native and prompted structured output: model capabilities and the `response_format` they are requested with."""
+
+from __future__ import annotations as _annotations
+
+from typing import Any
+
+from pydantic_ai._output import DEFAULT_OUTPUT_TOOL_NAME
+from pydantic_ai.models import ModelRequestParameters
+from pydantic_ai.profiles import ModelProfile
+
+
+def litellm_model_profile(model_name: str, custom_llm_provider: str | None = None) -> ModelProfile:
+    """A `ModelProfile` with the structured output support LiteLLM's local model tables report for `model_name`.
+
+    Native output (`response_format` with a JSON schema) follows `litellm.supports_response_schema`;
+    JSON mode, used for prompted output, whether `response_format` is a supported parameter.
+    Models LiteLLM doesn't know get the default profile, which supports neither.
+    """
+    import litellm
+
+    try:
+        _, provider, _, _ = litellm.get_llm_provider(model_name, custom_llm_provider)
+        json_schema = bool(litellm.supports_response_schema(model_name, provider))
+        json_object = 'response_format' in (litellm.get_supported_openai_params(model_name, provider) or ())
+    except Exception:
+        return ModelProfile()
+    return ModelProfile(supports_json_schema_output=json_schema, supports_json_object_output=json_schema or json_object)
+
+
+def response_format(
+    model_request_parameters: ModelRequestParameters, profile: ModelProfile
+) -> dict[str, Any] | None:
+    """The `response_format` requesting the output of `model_request_parameters`, if it is native or prompted."""
+    if model_request_parameters.output_mode == 'native':
+        output_object = model_request_parameters.output_object
+        assert output_object is not None
+        json_schema: dict[str, Any] = {
+            'name': output_object.name or DEFAULT_OUTPUT_TOOL_NAME,
+            'schema': output_object.json_schema,
+        }
+        if output_object.description:
+            json_schema['description'] = output_object.description
+        if output_object.strict is not None:
+            json_schema['strict'] = output_object.strict
+        return {'type': 'json_schema', 'json_schema': json_schema}
+    if model_request_parameters.output_mode == 'prompted' and profile.supports_json_object_output:
+        return {'type': 'json_object'}
+    return None
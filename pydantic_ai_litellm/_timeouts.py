@@ -0,0 +1,38 @@
+"""Timeouts on a single await that don't need a task of their own."""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+T = TypeVar('T')
+
+
+async def wait_with_timeout(awaitable: Awaitable[T], delay: float, on_timeout: Callable[[], BaseException]) -> T:
+    """Await `awaitable` in the current task, raising `on_timeout()` if it takes longer than `delay` seconds.
+
+    Like `asyncio.timeout` (Python 3.11+): when the delay passes the current task is cancelled
+    and the cancellation is turned into the timeout error, so unlike `asyncio.wait_for` no task
+    is created per call. Cancellations from elsewhere propagate unchanged.
+    """
+    task = asyncio.current_task()
+    assert task is not None
+    expired = False
+
+    def expire() -> None:
+        nonlocal expired
+        expired = True
+        task.cancel()
+
+    handle = asyncio.get_running_loop().call_later(delay, expire)
+    try:
+        return await awaitable
+    except asyncio.CancelledError:
+        if not expired:
+            raise
+        if (uncancel := getattr(task, 'uncancel', None)) is not None:
+            uncancel()
+        raise on_timeout() from None
+    finally:
+        handle.cancel()
@@ -0,0 +1,118 @@
+"""LRU cache of mapped LiteLLM tool payloads, keyed on the identity of tool parameter schemas."""
+
+from __future__ import annotations as _annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from typing import Any, NamedTuple
+
+from pydantic_ai.tools import ToolDefinition
+
+__all__ = (
+    'CacheInfo',
+    'ToolDefinitionCache',
+)
+
+
+class CacheInfo(NamedTuple):
+    """Hit/miss statistics of a cache, in the spirit of `functools.lru_cache`'s `cache_info()`."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+_Key = tuple[str, 'str | None', 'bool | None', int]
+# The schema is held so that its `id` in the key can't be reused by another dict while the entry exists.
+_Entry = tuple[dict[str, Any], dict[str, Any]]
+
+# Number of distinct tool lists (e.g. one per agent, or per step of an agent with `prepare` functions) remembered whole.
+_MAX_TOOL_SETS = 32
+
+
+def _key(tool_def: ToolDefinition) -> _Key:
+    return tool_def.name, tool_def.description, tool_def.strict, id(tool_def.parameters_json_schema)
+
+
+class ToolDefinitionCache:
+    """Reuses mapped tool payloads for tool definitions that have been mapped before.
+
+    pydantic-ai builds new `ToolDefinition` objects on every step, but their parameters schema
+    dicts are built once per tool and reused, so payloads are keyed on the name, description,
+    `strict` flag and the identity of the schema. A lookup never serializes or compares a
+    schema. At most `maxsize` payloads are kept, evicting the least recently used, and
+    `get_many` also remembers whole tool lists, so a stable tool set is reused however many
+    tools it has.
+
+    Mutating a schema dict in place after it has been mapped is not detected; build a new
+    dict instead. The cached payloads are shared and must not be mutated.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[_Key, _Entry] = OrderedDict()
+        self._tool_sets: OrderedDict[tuple[_Key, ...], list[_Entry]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        tool_def: ToolDefinition,
+        map_tool_definition: Callable[[ToolDefinition], dict[str, Any]],
+    ) -> dict[str, Any]:
+        """Return the mapped payload for `tool_def`, calling `map_tool_definition` on a miss."""
+        if self.maxsize <= 0:
+            return map_tool_definition(tool_def)
+        return self._get(_key(tool_def), tool_def, map_tool_definition)[1]
+
+    def get_many(
+        self,
+        tool_defs: Sequence[ToolDefinition],
+        map_tool_definition: Callable[[ToolDefinition], dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Return the mapped payloads for `tool_defs`, reusing those of the same list of tools as a whole."""
+        if self.maxsize <= 0:
+            return [map_tool_definition(tool_def) for tool_def in tool_defs]
+
+        keys = tuple(map(_key, tool_defs))
+        tool_set = self._tool_sets.get(keys)
+        if tool_set is not None:
+            self._tool_sets.move_to_end(keys)
+            self.hits += len(keys)
+            return [payload for _, payload in tool_set]
+
+        tool_set = [self._get(key, tool_def, map_tool_definition) for key, tool_def in zip(keys, tool_defs)]
+        self._tool_sets[keys] = tool_set
+        if len(self._tool_sets) > _MAX_TOOL_SETS:
+            self._tool_sets.popitem(last=False)
+        return [payload for _, payload in tool_set]
+
+    def cache_info(self) -> CacheInfo:
+        """Report cache statistics."""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        """Forget all cached payloads and reset the statistics."""
+        self._entries.clear()
+        self._tool_sets.clear()
+        self.hits = self.misses = 0
+
+    def _get(
+        self,
+        key: _Key,
+        tool_def: ToolDefinition,
+        map_tool_definition: Callable[[ToolDefinition], dict[str, Any]],
+    ) -> _Entry:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = (tool_def.parameters_json_schema, map_tool_definition(tool_def))
+        self._entries[key] = entry
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
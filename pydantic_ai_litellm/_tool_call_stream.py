@@ -0,0 +1,70 @@
+"""Detecting when streamed tool call arguments are complete."""
+
+from __future__ import annotations as _annotations
+
+
+class _JsonCloseScanner:
+    """Incrementally scans a JSON document and reports when its top-level value has closed."""
+
+    __slots__ = ('depth', 'in_string', 'escaped', 'started', 'closed')
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.started = False
+        self.closed = False
+
+    def feed(self, text: str) -> bool:
+        """Scan `text`; returns whether the top-level object or array has closed."""
+        if self.closed:
+            return True
+        for char in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in '{[':
+                self.depth += 1
+                self.started = True
+            elif char in '}]':
+                self.depth -= 1
+                if self.started and self.depth == 0:
+                    self.closed = True
+                    return True
+        return False
+
+
+class ToolCallCompletionTracker:
+    """Tracks streamed tool calls by provider index and reports each one once its arguments are complete.
+
+    A call is complete when its JSON arguments close, when a call with a different index starts
+    after it (providers stream parallel calls one after another), or when the stream ends.
+    """
+
+    def __init__(self) -> None:
+        self._scanners: dict[int, _JsonCloseScanner] = {}
+        self._completed: set[int] = set()
+
+    def feed(self, index: int, args: str | None) -> list[int]:
+        """Record an argument delta for call `index`; returns the calls that became complete."""
+        completed: list[int] = []
+        scanner = self._scanners.get(index)
+        if scanner is None:
+            completed = [i for i in self._scanners if i not in self._completed]
+            scanner = self._scanners[index] = _JsonCloseScanner()
+        if args and index not in self._completed and scanner.feed(args):
+            completed.append(index)
+        self._completed.update(completed)
+        return completed
+
+    def finish(self) -> list[int]:
+        """The calls not yet reported as complete, at the end of the stream."""
+        completed = [i for i in self._scanners if i not in self._completed]
+        self._completed.update(completed)
+        return completed
@@ -0,0 +1,218 @@
+"""Mapping of multimodal user prompt content to LiteLLM content parts, with cached base64 encoding."""
+
+from __future__ import annotations as _annotations
+
+import binascii
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from pydantic_ai.exceptions import UserError
+from pydantic_ai.messages import (
+    AudioUrl,
+    BinaryContent,
+    CachePoint,
+    DocumentUrl,
+    FileUrl,
+    ImageUrl,
+    TextContent,
+    UploadedFile,
+    UserContent,
+    VideoUrl,
+)
+
+from ._tool_cache import CacheInfo
+
+__all__ = (
+    'Base64Cache',
+    'file_url_provider',
+    'map_user_content',
+)
+
+# Input per `b2a_base64` call: a multiple of 3 bytes, so chunks encode without padding.
+_CHUNK = 3 * 64 * 1024
+_TEXT_MEDIA_TYPES = frozenset({'application/json', 'application/xml', 'application/yaml', 'application/x-yaml'})
+# The audio formats of OpenAI's `input_audio` parts; other audio is sent as a file part.
+_INPUT_AUDIO_FORMATS = {'audio/wav': 'wav', 'audio/x-wav': 'wav', 'audio/mpeg': 'mp3', 'audio/mp3': 'mp3'}
+# Providers whose LiteLLM translation hands document, audio and video URLs to the provider (or fetches them into a
+# new request part). The OpenAI-compatible translation instead downloads them into the content part itself, naming
+# every file `my_file.pdf`.
+_FILE_URL_PROVIDERS = frozenset({'anthropic', 'gemini', 'vertex_ai', 'vertex_ai_beta'})
+
+
+def _b64encode(data: bytes, prefix: bytes = b'') -> str:
+    """`prefix` followed by the base64 encoding of `data`, as a `str`.
+
+    Chunks of `data` are encoded through a `memoryview` straight into one buffer holding the
+    prefix, so the only full-size copies are that buffer and the returned string.
+    """
+    view = memoryview(data)
+    out = bytearray(len(prefix) + (len(view) + 2) // 3 * 4)
+    out[: len(prefix)] = prefix
+    position = len(prefix)
+    for start in range(0, len(view), _CHUNK):
+        encoded = binascii.b2a_base64(view[start : start + _CHUNK], newline=False)
+        out[position : position + len(encoded)] = encoded
+        position += len(encoded)
+    return out.decode('ascii')
+
+
+class Base64Cache:
+    """Reuses the base64 encodings of binary content sent with earlier requests.
+
+    `BinaryContent` is re-sent with every step of a tool loop, and encoding a multi-megabyte
+    image or document each time costs far more than looking it up. Entries are keyed by the
+    identity of the `bytes` object, so a lookup never hashes or compares the payload; equal
+    content in a different object is encoded again. Each entry keeps its `bytes` object alive,
+    so both it and the encoded text count towards `max_bytes`, evicting the least recently used
+    entries; larger items are encoded every time.
+
+    The bound only covers this cache: mapped messages held by `MessageMappingCache` keep their
+    encodings alive as well, evicted and oversized ones included, until their conversation is
+    dropped from that cache.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        # The `bytes` object is held (and compared) so its `id` can't be reused by other data while cached.
+        self._encoded: OrderedDict[tuple[int, bytes], tuple[bytes, str]] = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def encode(self, data: bytes, prefix: bytes = b'') -> str:
+        """`prefix` (e.g. `b'data:image/png;base64,'`) followed by the base64 encoding of `data`."""
+        if self.max_bytes <= 0:
+            return _b64encode(data, prefix)
+
+        key = (id(data), prefix)
+        entry = self._encoded.get(key)
+        if entry is not None and entry[0] is data:
+            self._encoded.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        encoded = _b64encode(data, prefix)
+        if len(data) + len(encoded) <= self.max_bytes:
+            self._encoded[key] = (data, encoded)
+            self._size += len(data) + len(encoded)
+            while self._size > self.max_bytes:
+                _, (evicted_data, evicted) = self._encoded.popitem(last=False)
+                self._size -= len(evicted_data) + len(evicted)
+        return encoded
+
+    def cache_info(self) -> CacheInfo:
+        """Hit/miss statistics, with `maxsize` and `currsize` in bytes of retained data and encoded text."""
+        return CacheInfo(self.hits, self.misses, self.max_bytes, self._size)
+
+    def clear(self) -> None:
+        """Forget all cached encodings."""
+        self._encoded.clear()
+        self._size = 0
+
+
+def _data_uri(item: BinaryContent, encode: Callable[[bytes, bytes], str]) -> str:
+    return encode(item.data, f'data:{item.media_type};base64,'.encode())
+
+
+def _is_text(media_type: str) -> bool:
+    return media_type.startswith('text/') or media_type in _TEXT_MEDIA_TYPES
+
+
+def _map_binary(item: BinaryContent, encode: Callable[[bytes, bytes], str]) -> dict[str, Any]:
+    if _is_text(item.media_type):
+        # Few providers accept text files as file parts, so they are inlined like pydantic-ai's OpenAI model does.
+        text = '\n'.join(
+            [
+                f'-----BEGIN FILE id="{item.identifier}" type="{item.media_type}"-----',
+                item.data.decode('utf-8'),
+                f'-----END FILE id="{item.identifier}"-----',
+            ]
+        )
+        return {'type': 'text', 'text': text}
+    if item.is_image:
+        image_url = {'url': _data_uri(item, encode)}
+        if detail := (item.vendor_metadata or {}).get('detail'):
+            image_url['detail'] = detail
+        return {'type': 'image_url', 'image_url': image_url}
+    if audio_format := _INPUT_AUDIO_FORMATS.get(item.media_type):
+        return {'type': 'input_audio', 'input_audio': {'data': encode(item.data, b''), 'format': audio_format}}
+    file: dict[str, Any] = {'file_data': _data_uri(item, encode), 'format': item.media_type}
+    if item.is_document:
+        file['filename'] = f'filename.{item.format}'
+    elif item.is_video and item.vendor_metadata:
+        file['video_metadata'] = dict(item.vendor_metadata)
+    return {'type': 'file', 'file': file}
+
+
+def file_url_provider(model: str, custom_llm_provider: str | None = None) -> str | None:
+    """The LiteLLM provider of `model` if document, audio and video URLs can be sent to it, else `None`."""
+    import litellm
+
+    try:
+        _, provider, _, _ = litellm.get_llm_provider(model, custom_llm_provider)
+    except Exception:
+        return None
+    return provider if provider in _FILE_URL_PROVIDERS else None
+
+
+def _map_url(item: FileUrl, provider: Callable[[], str | None] | None) -> dict[str, Any]:
+    if item.force_download:
+        raise UserError(
+            f'`force_download` is not supported by `LiteLLMModel` ({item.url!r}); '
+            'download the file and pass it as `BinaryContent` instead.'
+        )
+    if isinstance(item, ImageUrl):
+        image_url = {'url': item.url}
+        if detail := (item.vendor_metadata or {}).get('detail'):
+            image_url['detail'] = detail
+        return {'type': 'image_url', 'image_url': image_url}
+    if provider is None or (provider_name := provider()) is None:
+        raise UserError(
+            f'`{type(item).__name__}` is only supported by `LiteLLMModel` for Anthropic, Gemini and Vertex AI '
+            f'models ({item.url!r}); download the file and pass it as `BinaryContent` instead.'
+        )
+    file: dict[str, Any] = {'file_id': item.url}
+    # With a `format`, Anthropic reads the URL as the ID of an uploaded file; it infers the type from the URL itself.
+    if provider_name != 'anthropic':
+        try:
+            file['format'] = item.media_type
+        except ValueError:
+            pass  # Gemini infers it from the URL too, or reports a type it can't handle.
+    if isinstance(item, VideoUrl) and item.vendor_metadata:
+        file['video_metadata'] = dict(item.vendor_metadata)
+    return {'type': 'file', 'file': file}
+
+
+def map_user_content(
+    content: Sequence[UserContent],
+    encode: Callable[[bytes, bytes], str] = _b64encode,
+    provider: Callable[[], str | None] | None = None,
+) -> list[dict[str, Any]]:
+    """Map the items of a `UserPromptPart` to OpenAI-format content parts, which LiteLLM translates.
+
+    Binary content is sent inline, base64-encoded with `encode` (e.g. `Base64Cache.encode`). Image
+    URLs are passed through without being downloaded, and so are audio, document and video URLs
+    if the provider returned by `provider` (e.g. from `file_url_provider`) accepts them; otherwise
+    they raise `UserError`. `provider` is only called for such URLs. A
+    `CachePoint` marks the preceding part as a prompt caching breakpoint.
+    """
+    parts: list[dict[str, Any]] = []
+    for item in content:
+        if isinstance(item, str):
+            parts.append({'type': 'text', 'text': item})
+        elif isinstance(item, TextContent):
+            parts.append({'type': 'text', 'text': item.content})
+        elif isinstance(item, BinaryContent):
+            parts.append(_map_binary(item, encode))
+        elif isinstance(item, (ImageUrl, AudioUrl, DocumentUrl, VideoUrl)):
+            parts.append(_map_url(item, provider))
+        elif isinstance(item, UploadedFile):
+            parts.append({'type': 'file', 'file': {'file_id': item.file_id}})
+        elif isinstance(item, CachePoint):
+            if parts:
+                parts[-1]['cache_control'] = {'type': 'ephemeral'}
+        else:
+            raise UserError(f'Unsupported user prompt content: {type(item).__name__}')
+    return parts
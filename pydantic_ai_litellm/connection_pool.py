@@ -0,0 +1,187 @@
+"""Shared, tunable HTTP connection pools for LiteLLM requests."""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+__all__ = (
+    'ConnectionPools',
+    'PoolLimits',
+    'PoolStats',
+)
+
+
+@dataclass(kw_only=True)
+class PoolLimits:
+    """Sizing and keep-alive settings of one connection pool."""
+
+    max_connections: int = 100
+    """Maximum number of open connections; further requests wait for one to be released. 0 means no limit."""
+    max_connections_per_host: int = 0
+    """Maximum number of open connections to a single host. 0 means no limit beyond `max_connections`."""
+    keepalive_timeout: float = 30.0
+    """Seconds an idle connection is kept open for reuse."""
+    dns_cache_ttl: int | None = 300
+    """Seconds resolved addresses are cached; `None` caches them forever."""
+
+
+@dataclass
+class PoolStats:
+    """Counters for one endpoint of `ConnectionPools`."""
+
+    requests: int = 0
+    """Number of HTTP requests sent."""
+    connections_created: int = 0
+    """Number of connections opened, each paying for a TCP (and TLS) handshake."""
+    connections_reused: int = 0
+    """Number of requests sent over an idle, already open connection."""
+    total_connect_time: float = 0.0
+    """Total seconds spent opening connections."""
+    waits: int = 0
+    """Number of requests that waited for a connection because the pool was full."""
+    total_wait: float = 0.0
+    """Total seconds spent waiting for a connection."""
+    max_wait: float = 0.0
+    """Longest single wait for a connection, in seconds."""
+    active: int = 0
+    """Connections currently in use, as of the last `ConnectionPools.stats` call."""
+    idle: int = 0
+    """Open connections currently available for reuse, as of the last `ConnectionPools.stats` call."""
+
+    @property
+    def mean_wait(self) -> float:
+        """Average seconds spent waiting for a connection, over the requests that waited."""
+        return self.total_wait / self.waits if self.waits else 0.0
+
+
+class _Pool:
+    def __init__(self, session: ClientSession, loop: asyncio.AbstractEventLoop, stats: PoolStats):
+        self.session = session
+        self.loop = loop
+        self.stats = stats
+
+
+class ConnectionPools:
+    """HTTP client sessions shared by every `LiteLLMModel` that is given this instance, one per endpoint.
+
+    Each endpoint (the request's `api_base`, or its provider when it has none) gets its own
+    `aiohttp.ClientSession` with a bounded, keep-alive connection pool. It is passed to LiteLLM
+    as `shared_session`, so models and deployments talking to the same endpoint reuse warm
+    connections instead of opening new ones under bursty traffic. Sessions are created on first
+    use in the running event loop. Close them with `aclose` (or `async with`) on shutdown.
+
+    LiteLLM's default transport is aiohttp, which only speaks HTTP/1.1. Requests sent with
+    `litellm.disable_aiohttp_transport` set bypass these pools.
+
+    Args:
+        limits: Pool limits for endpoints without an entry in `endpoint_limits`.
+        endpoint_limits: Pool limits per endpoint, keyed like `stats`.
+    """
+
+    def __init__(self, limits: PoolLimits | None = None, *, endpoint_limits: dict[str, PoolLimits] | None = None):
+        self.limits = limits or PoolLimits()
+        self.endpoint_limits = dict(endpoint_limits or {})
+        self._pools: dict[str, _Pool] = {}
+        self._stats: dict[str, PoolStats] = {}
+
+    @staticmethod
+    def endpoint(completion_kwargs: dict[str, Any]) -> str:
+        """The endpoint a request with these `acompletion` arguments is sent to."""
+        if api_base := completion_kwargs.get('api_base'):
+            return api_base
+        model: str = completion_kwargs['model']
+        return completion_kwargs.get('custom_llm_provider') or (model.split('/', 1)[0] if '/' in model else 'default')
+
+    def session(self, endpoint: str) -> ClientSession:
+        """The session of `endpoint`, created if missing, closed, or bound to another event loop."""
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(endpoint)
+        if pool is None or pool.session.closed or pool.loop is not loop:
+            pool = self._pools[endpoint] = self._create(endpoint, loop)
+        return pool.session
+
+    def stats(self, endpoint: str) -> PoolStats:
+        """Counters for `endpoint`, with the current number of active and idle connections."""
+        stats = self._stats.setdefault(endpoint, PoolStats())
+        if (pool := self._pools.get(endpoint)) is not None and not pool.session.closed:
+            connector = pool.session.connector
+            # aiohttp doesn't expose these counts publicly.
+            stats.active = len(getattr(connector, '_acquired', ()))
+            stats.idle = sum(map(len, getattr(connector, '_conns', {}).values()))
+        else:
+            stats.active = stats.idle = 0
+        return stats
+
+    @property
+    def endpoints(self) -> list[str]:
+        """The endpoints that have been sent requests."""
+        return list(self._stats)
+
+    async def aclose(self) -> None:
+        """Close every session and its connections. Later requests open new sessions."""
+        pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            if not pool.session.closed and pool.loop is asyncio.get_running_loop():
+                await pool.session.close()
+
+    async def __aenter__(self) -> ConnectionPools:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    def _create(self, endpoint: str, loop: asyncio.AbstractEventLoop) -> _Pool:
+        import aiohttp
+
+        limits = self.endpoint_limits.get(endpoint, self.limits)
+        stats = self._stats.setdefault(endpoint, PoolStats())
+        connector = aiohttp.TCPConnector(
+            limit=limits.max_connections,
+            limit_per_host=limits.max_connections_per_host,
+            keepalive_timeout=limits.keepalive_timeout,
+            ttl_dns_cache=limits.dns_cache_ttl,
+            use_dns_cache=True,
+        )
+        session = aiohttp.ClientSession(connector=connector, trace_configs=[_trace_config(stats)])
+        return _Pool(session, loop, stats)
+
+
+def _trace_config(stats: PoolStats) -> Any:
+    import aiohttp
+
+    async def on_request_start(session: Any, context: Any, params: Any) -> None:
+        stats.requests += 1
+
+    async def on_queued_start(session: Any, context: Any, params: Any) -> None:
+        context.queued_at = time.perf_counter()
+
+    async def on_queued_end(session: Any, context: Any, params: Any) -> None:
+        wait = time.perf_counter() - context.queued_at
+        stats.waits += 1
+        stats.total_wait += wait
+        stats.max_wait = max(stats.max_wait, wait)
+
+    async def on_create_start(session: Any, context: Any, params: Any) -> None:
+        context.connecting_at = time.perf_counter()
+
+    async def on_create_end(session: Any, context: Any, params: Any) -> None:
+        stats.connections_created += 1
+        stats.total_connect_time += time.perf_counter() - context.connecting_at
+
+    async def on_reuse(session: Any, context: Any, params: Any) -> None:
+        stats.connections_reused += 1
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_connection_queued_start.append(on_queued_start)
+    trace_config.on_connection_queued_end.append(on_queued_end)
+    trace_config.on_connection_create_start.append(on_create_start)
+    trace_config.on_connection_create_end.append(on_create_end)
+    trace_config.on_connection_reuseconn.append(on_reuse)
+    return trace_config
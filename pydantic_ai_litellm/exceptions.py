@@ -0,0 +1,146 @@
+"""Typed errors for failed LiteLLM requests."""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import sys
+from typing import ClassVar, Literal
+
+import httpx
+from pydantic_ai import ModelHTTPError
+
+from ._headers import response_headers, retry_after
+
+__all__ = (
+    'LiteLLMAPIError',
+    'LiteLLMRateLimitError',
+    'LiteLLMTimeoutError',
+    'LiteLLMStreamTimeoutError',
+    'LiteLLMConnectionError',
+    'LiteLLMServiceUnavailableError',
+    'LiteLLMContextWindowExceededError',
+    'LiteLLMContentPolicyError',
+    'classify_error',
+)
+
+
+class LiteLLMAPIError(ModelHTTPError):
+    """Base class for classified LiteLLM request failures.
+
+    Subclasses `ModelHTTPError`, so existing `except ModelHTTPError` handlers keep working.
+    """
+
+    retryable: ClassVar[bool] = False
+    """Whether sending the same request again may succeed."""
+
+    default_status_code: ClassVar[int] = 500
+
+    retry_after: float | None
+    """Seconds the provider asked to wait before retrying, from the `Retry-After` header."""
+
+    def __init__(
+        self,
+        status_code: int | None,
+        model_name: str,
+        body: object | None = None,
+        *,
+        retry_after: float | None = None,
+    ):
+        self.retry_after = retry_after
+        super().__init__(status_code=status_code or self.default_status_code, model_name=model_name, body=body)
+
+
+class LiteLLMRateLimitError(LiteLLMAPIError):
+    """The provider rejected the request because a rate limit or quota was exceeded."""
+
+    retryable = True
+    default_status_code = 429
+
+
+class LiteLLMTimeoutError(LiteLLMAPIError):
+    """The request timed out."""
+
+    retryable = True
+    default_status_code = 408
+
+
+class LiteLLMStreamTimeoutError(LiteLLMTimeoutError):
+    """A streamed response stalled: its first chunk, or the next one, didn't arrive in time."""
+
+    stage: Literal['first_chunk', 'next_chunk']
+    """Which chunk was being waited for."""
+    timeout: float
+    """The timeout that passed, in seconds."""
+
+    def __init__(self, model_name: str, stage: Literal['first_chunk', 'next_chunk'], timeout: float):
+        self.stage = stage
+        self.timeout = timeout
+        chunk = 'first chunk' if stage == 'first_chunk' else 'chunk'
+        super().__init__(None, model_name, f'No {chunk} received within {timeout:g}s')
+
+
+class LiteLLMConnectionError(LiteLLMAPIError):
+    """The provider could not be reached, or the connection failed mid-request."""
+
+    retryable = True
+
+
+class LiteLLMServiceUnavailableError(LiteLLMAPIError):
+    """The provider is overloaded, unavailable or failed internally (5xx)."""
+
+    retryable = True
+    default_status_code = 503
+
+
+class LiteLLMContextWindowExceededError(LiteLLMAPIError):
+    """The request doesn't fit in the model's context window; retrying the same request won't help."""
+
+    default_status_code = 400
+
+
+class LiteLLMContentPolicyError(LiteLLMAPIError):
+    """The request or response was blocked by the provider's content policy."""
+
+    default_status_code = 400
+
+
+def _litellm_error(name: str) -> type[BaseException] | tuple[()]:
+    # Only look at litellm's exception types if litellm has been imported; if it hasn't,
+    # the error can't have come from it, and importing it just to check would be slow.
+    litellm = sys.modules.get('litellm')
+    return getattr(litellm, name, ()) if litellm is not None else ()
+
+
+def classify_error(error: BaseException, model_name: str) -> ModelHTTPError | None:
+    """Map an exception raised by LiteLLM (or its transport) to a typed error.
+
+    Returns `None` for exceptions that aren't request failures, which should be re-raised as-is.
+    Unclassified HTTP errors become a plain `ModelHTTPError`.
+    """
+    status_code = getattr(error, 'status_code', None)
+    if not isinstance(status_code, int):
+        status_code = None
+
+    error_type: type[LiteLLMAPIError] | None
+    if isinstance(error, _litellm_error('ContextWindowExceededError')) or (
+        getattr(error, 'code', None) == 'context_length_exceeded'
+    ):
+        error_type = LiteLLMContextWindowExceededError
+    elif isinstance(error, _litellm_error('ContentPolicyViolationError')):
+        error_type = LiteLLMContentPolicyError
+    elif isinstance(error, _litellm_error('RateLimitError')) or status_code == 429:
+        error_type = LiteLLMRateLimitError
+    elif isinstance(error, (_litellm_error('Timeout'), TimeoutError, asyncio.TimeoutError, httpx.TimeoutException)):
+        error_type = LiteLLMTimeoutError
+    elif status_code == 408:
+        error_type = LiteLLMTimeoutError
+    elif isinstance(error, (_litellm_error('APIConnectionError'), httpx.TransportError, ConnectionError)):
+        error_type = LiteLLMConnectionError
+    elif status_code is not None and status_code >= 500:
+        error_type = LiteLLMServiceUnavailableError
+    elif status_code is not None and status_code >= 400:
+        return ModelHTTPError(status_code=status_code, model_name=model_name, body=str(error))
+    else:
+        return None
+
+    return error_type(status_code, model_name, str(error), retry_after=retry_after(response_headers(error)))
@@ -0,0 +1,139 @@
+"""Hedged requests: racing a duplicate request against a slow one to cut tail latency."""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from typing import Any, TypeVar
+
+__all__ = ('HedgePolicy',)
+
+T = TypeVar('T')
+
+
+class HedgePolicy:
+    """When to send a duplicate ("hedge") of a request that hasn't responded yet.
+
+    If the primary request hasn't completed after the hedge delay, a duplicate is sent, either
+    to the same deployment or to the next of `alternates`. The first successful response wins
+    and the others are cancelled. For streamed requests an attempt completes when its first
+    chunk arrives, so hedging races on time to first chunk.
+
+    The hedge delay is `delay` seconds, or, once `min_samples` latencies have been observed,
+    the `percentile` of the last `window` observed latencies (tracked separately for streamed
+    and non-streamed requests). A policy can be shared between models.
+
+    Args:
+        delay: Fixed hedge delay in seconds, also used until enough latencies are observed.
+        percentile: Percentile (0-100) of observed latencies to use as the hedge delay, e.g. `95`.
+        max_hedges: Maximum number of duplicates per request.
+        alternates: Completion argument overrides (e.g. `{'api_base': ..., 'api_key': ...}`) used
+            for successive hedges, in round-robin order. Hedges go to the same deployment if empty.
+        window: Number of recent latencies kept for the percentile.
+        min_samples: Number of latencies needed before the percentile replaces `delay`.
+    """
+
+    def __init__(
+        self,
+        *,
+        delay: float = 1.0,
+        percentile: float | None = None,
+        max_hedges: int = 1,
+        alternates: Sequence[Mapping[str, Any]] = (),
+        window: int = 200,
+        min_samples: int = 20,
+    ):
+        self.delay = delay
+        self.percentile = percentile
+        self.max_hedges = max_hedges
+        self.alternates = list(alternates)
+        self.min_samples = min_samples
+        self._latencies: dict[bool, deque[float]] = {False: deque(maxlen=window), True: deque(maxlen=window)}
+        self.requests = 0
+        """Number of requests run under this policy."""
+        self.hedges = 0
+        """Number of duplicate requests sent."""
+        self.hedge_wins = 0
+        """Number of requests won by a duplicate rather than the primary."""
+
+    def hedge_delay(self, stream: bool = False) -> float:
+        """Seconds to wait for the primary (or previous hedge) before sending a hedge."""
+        samples = self._latencies[stream]
+        if self.percentile is None or len(samples) < self.min_samples:
+            return self.delay
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return ordered[index]
+
+    def observe(self, latency: float, stream: bool = False) -> None:
+        """Record the latency of a successful request."""
+        self._latencies[stream].append(latency)
+
+    async def run(
+        self,
+        attempt: Callable[[Mapping[str, Any]], Awaitable[T]],
+        *,
+        stream: bool = False,
+        usage_details: dict[str, int] | None = None,
+        discard: Callable[[T], Awaitable[None]] | None = None,
+    ) -> T:
+        """Run `attempt({})`, hedging it with `attempt(overrides)` while it is slow.
+
+        Args:
+            attempt: Makes one request, with the given completion argument overrides.
+            stream: Whether the request is streamed, which selects the latency samples.
+            usage_details: If given, `hedged_requests` is incremented by the number of hedges sent.
+            discard: Releases a successful result that lost the race (e.g. closes a stream).
+        """
+        self.requests += 1
+        started: dict[asyncio.Future[T], float] = {}
+        primary = asyncio.ensure_future(attempt({}))
+        started[primary] = time.monotonic()
+        pending: set[asyncio.Future[T]] = {primary}
+        errors: dict[asyncio.Future[T], BaseException] = {}
+        hedges = 0
+        winner: asyncio.Future[T] | None = None
+
+        try:
+            while pending:
+                timeout = None
+                if hedges < self.max_hedges:
+                    last_start = max(started.values())
+                    timeout = max(0.0, last_start + self.hedge_delay(stream) - time.monotonic())
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    overrides = self.alternates[hedges % len(self.alternates)] if self.alternates else {}
+                    hedge = asyncio.ensure_future(attempt(overrides))
+                    started[hedge] = time.monotonic()
+                    pending.add(hedge)
+                    hedges += 1
+                    self.hedges += 1
+                    if usage_details is not None:
+                        usage_details['hedged_requests'] = usage_details.get('hedged_requests', 0) + 1
+                    continue
+
+                for task in done:
+                    if (error := task.exception()) is not None:
+                        errors[task] = error
+                    elif winner is None:
+                        winner = task
+                    elif discard is not None:
+                        await discard(task.result())
+                if winner is not None:
+                    self.observe(time.monotonic() - started[winner], stream)
+                    if winner is not primary:
+                        self.hedge_wins += 1
+                    return winner.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            # Wait for the losers to finish cancelling so their connections are released.
+            for result in await asyncio.gather(*pending, return_exceptions=True):
+                if discard is not None and not isinstance(result, BaseException):
+                    await discard(result)
+
+        # Every attempt failed: report the primary's error.
+        raise errors.get(primary) or next(iter(errors.values()))
@@ -2,15 +2,23 @@
 
 from __future__ import annotations as _annotations
 
-from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import aclosing, asynccontextmanager, contextmanager, nullcontext
+from copy import deepcopy
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cache, partial
+from importlib.util import find_spec
+from inspect import isasyncgen
+from types import ModuleType
 from typing import Any, cast
 
+import httpx
 from typing_extensions import assert_never
 
-from pydantic_ai import ModelHTTPError, UnexpectedModelBehavior, _utils, usage
+from pydantic_ai import ModelHTTPError, UnexpectedModelBehavior, UserError, _utils, usage
 from pydantic_ai._run_context import RunContext
 from pydantic_ai._utils import guard_tool_call_id as _guard_tool_call_id, now_utc as _now_utc
 from pydantic_ai.messages import (
@@ -19,6 +27,7 @@ from pydantic_ai.messages import (
     ModelResponse,
     ModelResponsePart,
     ModelResponseStreamEvent,
+    PartStartEvent,
     RetryPromptPart,
     SystemPromptPart,
     TextPart,
@@ -26,16 +35,38 @@ from pydantic_ai.messages import (
     ToolReturnPart,
     UserPromptPart,
 )
+from pydantic_ai.profiles import ModelProfileSpec
 from pydantic_ai.settings import ModelSettings
 from pydantic_ai.tools import ToolDefinition
 from pydantic_ai.models import Model, ModelRequestParameters, StreamedResponse, check_allow_model_requests, get_user_agent
 
-try:
-    from litellm import acompletion
-except ImportError as _import_error:
+if find_spec('litellm') is None:
     raise ImportError(
         'Please install `litellm` to use the LiteLLM model'
-    ) from _import_error
+    )
+
+from ._message_cache import MessageMappingCache
+from ._tool_cache import CacheInfo, ToolDefinitionCache
+from ._headers import response_headers
+from ._prompt_caching import add_cache_breakpoints, cache_strategy
+from ._read_ahead import TIMED_OUT, ReadAhead
+from ._streams import ClosingStream
+from ._structured_output import litellm_model_profile, response_format
+from ._tool_call_stream import ToolCallCompletionTracker
+from ._user_content import Base64Cache, file_url_provider, map_user_content
+from .connection_pool import ConnectionPools
+from ._timeouts import wait_with_timeout
+from .exceptions import LiteLLMAPIError, LiteLLMStreamTimeoutError, classify_error
+from .hedging import HedgePolicy
+from .profiling import RequestProfile, TimedIterator
+from .rate_limit import RateLimiter, RateLimitPermit, estimate_tokens
+from .response_cache import ResponseCache, response_cache_key
+from .retry import RetryPolicy
+from .routing import Router
+from .single_flight import SingleFlight, single_flight_key
+from .streaming import StreamResume, TextCoalescing
+from .telemetry import Telemetry
+from .transport import OpenAICompatibleTransport
 
 __all__ = (
     'LiteLLMModel',
@@ -43,6 +74,182 @@ __all__ = (
 )
 
 
+def _import_litellm() -> ModuleType:
+    """Import `litellm` on first use.
+
+    Importing litellm takes seconds and tens of MB, so it is deferred until the first request
+    (or an explicit `LiteLLMModel.warmup()`) instead of happening when this package is imported.
+    """
+    import litellm
+
+    return litellm
+
+
+async def acompletion(**kwargs: Any) -> Any:
+    """Call `litellm.acompletion`, importing litellm if that hasn't happened yet."""
+    return await _import_litellm().acompletion(**kwargs)
+
+
+async def _aclose(iterator: Any) -> None:
+    """Close an async iterator if it supports closing."""
+    if (aclose := getattr(iterator, 'aclose', None)) is not None:
+        await aclose()
+
+
+async def _close_stream(response: Any) -> None:
+    """Close a stream returned by `_acompletion_attempt`; non-streamed responses need no cleanup."""
+    if isinstance(response, ClosingStream):
+        await response.aclose()
+
+
+@dataclass
+class _StreamControl:
+    """Per-request stream settings, and the state of the LiteLLM streams its attempts opened."""
+
+    first_chunk_timeout: float | None = None
+    chunk_timeout: float | None = None
+    opened: list[Any] = field(default_factory=list)
+    resumes: int = 0
+    closed: bool = False
+
+
+async def _abort_stream(stream: Any) -> None:
+    """Close a stream opened by `acompletion`, even while another task is waiting for its next chunk.
+
+    LiteLLM's stream wrapper closes the underlying HTTP response, failing any pending read.
+    Async generators can't be closed while running; those are closed by their reader instead.
+    """
+    if not (isasyncgen(stream) and stream.ag_running):
+        await _aclose(stream)
+
+
+# A shorter repeat at the start of a continuation is more likely a coincidence than the model starting over.
+_MIN_OVERLAP = 8
+
+
+def _overlap(text: str, continuation: str) -> int:
+    """Length of the start of `continuation` that repeats the end of `text`."""
+    for length in range(min(len(text), len(continuation)), 0, -1):
+        if text.endswith(continuation[:length]):
+            return length if length >= _MIN_OVERLAP or length == len(text) else 0
+    return 0
+
+
+def _drop_text(chunks: list[Any], length: int) -> None:
+    """Remove the first `length` characters of text content from `chunks`, in place."""
+    for chunk in chunks:
+        if length <= 0:
+            return
+        if chunk.choices and (delta := chunk.choices[0].delta) and delta.content:
+            content = delta.content
+            delta.content = content[length:]
+            length -= len(content)
+
+
+async def _skip_repeated_text(stream: AsyncIterator[Any], text: str, max_overlap: int) -> AsyncIterator[Any]:
+    """Iterate a continuation of `text`, dropping any of `text` it repeats at its start.
+
+    Chunks are held back until `max_overlap` characters (or all of `text`, if shorter) have
+    arrived, a tool call starts or the stream ends, whichever comes first.
+    """
+    window = min(len(text), max_overlap)
+    held: list[Any] = []
+    held_text: list[str] = []
+    held_chars = 0
+    try:
+        async for chunk in stream:
+            if held_chars >= window:
+                yield chunk
+                continue
+            held.append(chunk)
+            if chunk.choices and (delta := chunk.choices[0].delta):
+                if delta.content:
+                    held_text.append(delta.content)
+                    held_chars += len(delta.content)
+                if delta.tool_calls:
+                    held_chars = window
+            if held_chars >= window:
+                _drop_text(held, _overlap(text, ''.join(held_text)))
+                for held_chunk in held:
+                    yield held_chunk
+                held.clear()
+        _drop_text(held, _overlap(text, ''.join(held_text)))
+        for held_chunk in held:
+            yield held_chunk
+    finally:
+        await _aclose(stream)
+
+
+def _resume_kwargs(
+    completion_kwargs: dict[str, Any], text: str, prefill: bool, continuation_prompt: str
+) -> dict[str, Any]:
+    """The `acompletion` arguments requesting the rest of a response of which `text` has been received."""
+    if not text:
+        return completion_kwargs
+    messages = list(completion_kwargs['messages'])
+    if prefill:
+        messages.append({'role': 'assistant', 'content': text, 'prefix': True})
+    else:
+        messages += [{'role': 'assistant', 'content': text}, {'role': 'user', 'content': continuation_prompt}]
+    return {**completion_kwargs, 'messages': messages}
+
+
+def _supports_assistant_prefill(model: str, custom_llm_provider: str | None) -> bool:
+    try:
+        info = _import_litellm().get_model_info(model, custom_llm_provider)
+    except Exception:
+        # Models missing from LiteLLM's model map raise.
+        return False
+    return bool(info.get('supports_assistant_prefill'))
+
+
+def _int(value: Any) -> int:
+    return value if isinstance(value, int) else 0
+
+
+def _map_usage(litellm_usage: Any) -> usage.RunUsage:
+    """Map LiteLLM's (OpenAI-style) usage, including cache, audio and reasoning token details, to a `RunUsage`."""
+    prompt_details = getattr(litellm_usage, 'prompt_tokens_details', None)
+    completion_details = getattr(litellm_usage, 'completion_tokens_details', None)
+    # Anthropic reports cache reads and writes separately; OpenAI-compatible providers in `prompt_tokens_details`.
+    cache_read_tokens = _int(getattr(litellm_usage, 'cache_read_input_tokens', None)) or _int(
+        getattr(prompt_details, 'cached_tokens', None)
+    )
+    cache_write_tokens = _int(getattr(litellm_usage, 'cache_creation_input_tokens', None)) or _int(
+        getattr(prompt_details, 'cache_creation_tokens', None)
+    )
+    details: dict[str, int] = {}
+    for name in ('reasoning_tokens', 'accepted_prediction_tokens', 'rejected_prediction_tokens'):
+        if value := _int(getattr(completion_details, name, None)):
+            details[name] = value
+    return usage.RunUsage(
+        input_tokens=_int(getattr(litellm_usage, 'prompt_tokens', 0)),
+        output_tokens=_int(getattr(litellm_usage, 'completion_tokens', 0)),
+        cache_read_tokens=cache_read_tokens,
+        cache_write_tokens=cache_write_tokens,
+        input_audio_tokens=_int(getattr(prompt_details, 'audio_tokens', None)),
+        output_audio_tokens=_int(getattr(completion_details, 'audio_tokens', None)),
+        details=details,
+    )
+
+
+def _completion_cost(model: str, custom_llm_provider: str | None, run_usage: usage.RunUsage) -> float | None:
+    """Cost in USD of a request with `run_usage`, from litellm's local model cost table, if the model is listed."""
+    try:
+        prompt_cost, completion_cost = _import_litellm().cost_per_token(
+            model=model,
+            custom_llm_provider=custom_llm_provider,
+            prompt_tokens=run_usage.input_tokens,
+            completion_tokens=run_usage.output_tokens,
+            cache_creation_input_tokens=run_usage.cache_write_tokens,
+            cache_read_input_tokens=run_usage.cache_read_tokens,
+        )
+    except Exception:
+        # Unknown models raise; a missing cost shouldn't fail the request.
+        return None
+    return prompt_cost + completion_cost
+
+
 def _merge_leading_system_messages(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """Merge consecutive leading system messages into one.
 
@@ -60,6 +267,24 @@ def _merge_leading_system_messages(messages: list[dict[str, Any]]) -> list[dict[
     merged = {**messages[0], 'content': merged_content}
     return [merged, *messages[leading_count:]]
 
+def _detach_content(message: dict[str, Any]) -> dict[str, Any]:
+    """Copy a message with list `content` down to its parts' nested dicts, leaving other messages shared.
+
+    LiteLLM rewrites content parts in place while transforming a request (e.g. replacing a
+    file URL with the downloaded data), so the dicts held by `_message_cache` must not reach it.
+    """
+    content = message.get('content')
+    if not isinstance(content, list):
+        return message
+    return {
+        **message,
+        'content': [
+            {k: dict(v) if isinstance(v, dict) else v for k, v in part.items()} if isinstance(part, dict) else part
+            for part in content
+        ],
+    }
+
+
 class LiteLLMModelSettings(ModelSettings, total=False):
     """Settings used for a LiteLLM model request."""
 
@@ -77,6 +302,24 @@ class LiteLLMModelSettings(ModelSettings, total=False):
     """Additional metadata to pass to LiteLLM."""
     litellm_metadata: dict[str, Any]
 
+    """Add provider prompt-caching (`cache_control`) breakpoints to the system block, tools and last message.
+
+    Only applied for providers that need explicit markers (Anthropic and Gemini, wherever hosted).
+    """
+    litellm_prompt_caching: bool
+
+    """Add the request's cost in USD, from litellm's local model cost table, to `provider_details['cost']`."""
+    litellm_include_cost: bool
+
+    """Seconds to wait for the first chunk of a streamed response, from sending the request.
+
+    A stalled stream fails with `LiteLLMStreamTimeoutError`, which a `RetryPolicy` retries.
+    """
+    litellm_first_chunk_timeout: float
+
+    """Seconds to wait for each further chunk of a streamed response before failing with `LiteLLMStreamTimeoutError`."""
+    litellm_chunk_timeout: float
+
 
 @dataclass(init=False)
 class LiteLLMModel(Model):
@@ -93,6 +336,23 @@ class LiteLLMModel(Model):
     _api_base: str | None = field(default=None, repr=False)
     _custom_llm_provider: str | None = field(default=None, repr=False)
     _system: str = field(default='litellm', repr=False)
+    _message_cache: MessageMappingCache = field(repr=False)
+    _tool_cache: ToolDefinitionCache = field(repr=False)
+    _base64_cache: Base64Cache = field(repr=False)
+    _response_cache: ResponseCache | None = field(default=None, repr=False)
+    _single_flight: SingleFlight | None = field(default=None, repr=False)
+    _rate_limiter: RateLimiter | None = field(default=None, repr=False)
+    _retry_policy: RetryPolicy | None = field(default=None, repr=False)
+    _hedge_policy: HedgePolicy | None = field(default=None, repr=False)
+    _router: Router | None = field(default=None, repr=False)
+    _text_coalescing: TextCoalescing | None = field(default=None, repr=False)
+    _stream_read_ahead: int = field(default=0, repr=False)
+    _on_tool_call_complete: Callable[[ToolCallPart], None] | None = field(default=None, repr=False)
+    _telemetry: Telemetry | None = field(default=None, repr=False)
+    _profiler: Callable[[RequestProfile], None] | None = field(default=None, repr=False)
+    _connection_pools: ConnectionPools | None = field(default=None, repr=False)
+    _stream_resume: StreamResume | None = field(default=None, repr=False)
+    _transport: OpenAICompatibleTransport | None = field(default=None, repr=False)
 
     def __init__(
         self,
@@ -102,6 +362,24 @@ class LiteLLMModel(Model):
         api_base: str | None = None,
         custom_llm_provider: str | None = None,
         settings: ModelSettings | None = None,
+        profile: ModelProfileSpec | None = None,
+        message_cache_size: int = 32,
+        tool_cache_size: int = 256,
+        base64_cache_size: int = 64 * 1024 * 1024,
+        response_cache: ResponseCache | None = None,
+        single_flight: SingleFlight | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        hedge_policy: HedgePolicy | None = None,
+        router: Router | None = None,
+        text_coalescing: TextCoalescing | None = None,
+        stream_read_ahead: int = 0,
+        on_tool_call_complete: Callable[[ToolCallPart], None] | None = None,
+        telemetry: Telemetry | None = None,
+        profiler: Callable[[RequestProfile], None] | None = None,
+        connection_pools: ConnectionPools | None = None,
+        stream_resume: StreamResume | None = None,
+        transport: OpenAICompatibleTransport | None = None,
     ):
         """Initialize a LiteLLM model.
 
@@ -111,19 +389,102 @@ class LiteLLMModel(Model):
             api_base: Base URL for the model provider. Use this for custom endpoints or self-hosted models.
             custom_llm_provider: Custom LLM provider name for LiteLLM. Use this if LiteLLM can't auto-detect the provider.
             settings: Default model settings for this model instance.
+            profile: The model profile to use. By default, support for native (JSON schema) and prompted (JSON
+                mode) structured output is looked up in LiteLLM's model tables on first use.
+            message_cache_size: Number of conversations whose mapped messages are cached between requests,
+                so each agent step only maps newly appended messages. Set to 0 to disable the cache.
+            tool_cache_size: Maximum number of mapped tool definitions reused across requests and agent runs
+                sharing this model instance. Set to 0 to disable the cache.
+            base64_cache_size: Maximum total size, in bytes, of the `BinaryContent` data and base64 encodings kept
+                so that images, audio and documents re-sent on later steps aren't encoded again. Set to 0 to
+                disable the cache.
+            response_cache: Optional cache of whole responses, keyed on the final completion arguments
+                (excluding secrets). Hits skip the LiteLLM call and are replayed as a stream for `request_stream`.
+            single_flight: Optional `SingleFlight` that makes concurrent identical non-streamed requests share
+                one LiteLLM call, each receiving its own copy of the response. Can be shared between models.
+            rate_limiter: Optional `RateLimiter` enforcing concurrency, requests-per-minute and tokens-per-minute
+                limits per `(api_base, model_name)`. Share one instance between models to share the budget.
+            retry_policy: Optional `RetryPolicy` for retrying rate limits, timeouts, connection failures and
+                unavailable services with exponential backoff. Streamed requests are retried only until the first
+                chunk arrives.
+            hedge_policy: Optional `HedgePolicy` that sends a duplicate request, to the same or an alternate
+                deployment, when the first one is slow; the first successful response wins. Hedges are counted in
+                `usage.details['hedged_requests']`.
+            router: Optional `Router` (e.g. `LatencyRouter`) that picks one of several deployments for each
+                attempt. A deployment's `api_base`, `api_key`, `custom_llm_provider` and `model_name` override
+                the model's own; retries and hedges are routed too.
+            text_coalescing: Optional `TextCoalescing` that merges consecutive streamed text deltas into fewer,
+                larger events, up to a size or time threshold. Tool call events and ordering are unaffected.
+            stream_read_ahead: Number of streamed chunks to read ahead of the consumer in a background task, so
+                the connection keeps draining while the consumer is busy. Set to 0 (the default) to read chunks
+                only when the consumer asks for them.
+            on_tool_call_complete: Optional callback invoked with each streamed `ToolCallPart` as soon as its
+                arguments are complete (its JSON closes or the next call starts), before the rest of the response
+                has arrived, so slow tools can be started early. It is called synchronously from the stream.
+            telemetry: Optional `Telemetry` recording OpenTelemetry spans and queue wait, latency, time to first
+                chunk, inter-chunk gap and throughput histograms. Nothing is recorded without it.
+            profiler: Optional callback receiving a `RequestProfile` with the wall and CPU time of each pipeline
+                phase (message and tool mapping, argument assembly, the LiteLLM call, first chunk, response
+                processing, stream event handling) when a request or stream finishes, e.g. a `SlowRequestLog`.
+            connection_pools: Optional `ConnectionPools` providing a shared, bounded keep-alive HTTP session per
+                endpoint. Share one instance between models so they reuse connections to the same `api_base`.
+            stream_resume: Optional `StreamResume` that recovers from streams failing part-way through a text
+                response by requesting the rest of it, with the text received so far as an assistant prefill or
+                followed by a continuation prompt, and splicing it onto the same stream.
+            transport: Optional `OpenAICompatibleTransport` that sends requests to OpenAI-compatible endpoints
+                (vLLM, TGI, llama.cpp, gateways) itself and decodes their responses without LiteLLM's per-chunk
+                object construction. Requests it doesn't handle go through LiteLLM.
         """
         self._model_name = model_name
         self._api_key = api_key
         self._api_base = api_base
         self._custom_llm_provider = custom_llm_provider
-
-        super().__init__(settings=settings)
+        self._message_cache = MessageMappingCache(max_conversations=message_cache_size)
+        self._tool_cache = ToolDefinitionCache(maxsize=tool_cache_size)
+        self._base64_cache = Base64Cache(max_bytes=base64_cache_size)
+        self._response_cache = response_cache
+        self._single_flight = single_flight
+        self._rate_limiter = rate_limiter
+        self._retry_policy = retry_policy
+        self._hedge_policy = hedge_policy
+        self._router = router
+        self._text_coalescing = text_coalescing
+        self._stream_read_ahead = stream_read_ahead
+        self._on_tool_call_complete = on_tool_call_complete
+        self._telemetry = telemetry
+        self._profiler = profiler
+        self._connection_pools = connection_pools
+        self._stream_resume = stream_resume
+        self._transport = transport
+
+        super().__init__(
+            settings=settings,
+            profile=profile or partial(litellm_model_profile, custom_llm_provider=custom_llm_provider),
+        )
 
     @property
     def base_url(self) -> str | None:
         """The base URL for the provider API, if available."""
         return self._api_base
 
+    def warmup(self) -> None:
+        """Import litellm now rather than on the first request.
+
+        Useful for services that prefer to pay litellm's import cost at boot instead of on the
+        first request they serve.
+        """
+        _import_litellm()
+
+    @property
+    def tool_cache_info(self) -> CacheInfo:
+        """Hit/miss statistics of the mapped tool definition cache."""
+        return self._tool_cache.cache_info()
+
+    @property
+    def base64_cache_info(self) -> CacheInfo:
+        """Hit/miss statistics of the binary content encoding cache, with sizes in bytes."""
+        return self._base64_cache.cache_info()
+
     async def request(
         self,
         messages: list[ModelMessage],
@@ -131,10 +492,57 @@ class LiteLLMModel(Model):
         model_request_parameters: ModelRequestParameters,
     ) -> ModelResponse:
         check_allow_model_requests()
-        response = await self._completion_create(
-            messages, False, cast(LiteLLMModelSettings, model_settings or {}), model_request_parameters
+        model_settings, model_request_parameters = self.prepare_request(model_settings, model_request_parameters)
+        with self._profiling(stream=False) as profile:
+            return await self._request(messages, model_settings, model_request_parameters, profile)
+
+    async def _request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+        profile: RequestProfile | None,
+    ) -> ModelResponse:
+        completion_kwargs = await self._prepare_completion_kwargs(
+            messages, False, cast(LiteLLMModelSettings, model_settings or {}), model_request_parameters, profile
         )
-        return self._process_response(response)
+        response_cache, single_flight = self._response_cache, self._single_flight
+        request_key = ''
+        if response_cache is not None or single_flight is not None:
+            request_key = response_cache_key(completion_kwargs)
+        if response_cache is not None and (cached := await response_cache.lookup(request_key)) is not None:
+            return cached
+
+        async def completion() -> ModelResponse:
+            usage_details: dict[str, int] = {}
+            dispatched: dict[str, Any] = {}
+            telemetry = self._telemetry.start_request(completion_kwargs) if self._telemetry is not None else None
+            try:
+                with telemetry.use_span() if telemetry is not None else nullcontext():
+                    litellm_response = await self._acompletion(
+                        completion_kwargs, usage_details, profile, dispatched=dispatched
+                    )
+                with profile.phase('process_response') if profile is not None else nullcontext():
+                    response = self._process_response(litellm_response)
+            except BaseException as e:
+                if telemetry is not None:
+                    telemetry.end(error=e)
+                raise
+            if telemetry is not None:
+                telemetry.end(response.usage)
+            response.usage.details.update(usage_details)
+            cost_model = self._cost_model(dispatched or completion_kwargs, model_settings)
+            if cost_model is not None and (cost := _completion_cost(*cost_model, response.usage)) is not None:
+                response.provider_details = {**(response.provider_details or {}), 'cost': cost}
+            if response_cache is not None:
+                await response_cache.store(request_key, response)
+            return response
+
+        if single_flight is None:
+            return await completion()
+        response, shared = await single_flight.do(single_flight_key(request_key, completion_kwargs), completion)
+        # Every caller gets its own copy, as pydantic-ai writes run metadata onto the response it returns.
+        return deepcopy(response) if shared else response
 
     @asynccontextmanager
     async def request_stream(
@@ -145,10 +553,87 @@ class LiteLLMModel(Model):
         run_context: RunContext[Any] | None = None,
     ) -> AsyncIterator[StreamedResponse]:
         check_allow_model_requests()
-        response = await self._completion_create(
-            messages, True, cast(LiteLLMModelSettings, model_settings or {}), model_request_parameters
+        model_settings, model_request_parameters = self.prepare_request(model_settings, model_request_parameters)
+        with self._profiling(stream=True) as profile:
+            async with self._request_stream(
+                messages, model_settings, model_request_parameters, profile
+            ) as streamed_response:
+                yield streamed_response
+
+    @asynccontextmanager
+    async def _request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+        profile: RequestProfile | None,
+    ) -> AsyncIterator[StreamedResponse]:
+        completion_kwargs = await self._prepare_completion_kwargs(
+            messages, True, cast(LiteLLMModelSettings, model_settings or {}), model_request_parameters, profile
+        )
+        cache_key = None
+        if self._response_cache is not None:
+            cache_key = response_cache_key(completion_kwargs)
+            if (cached := await self._response_cache.lookup(cache_key)) is not None:
+                yield _ReplayedStreamedResponse(
+                    _model_name=cached.model_name or self._model_name,
+                    _response=cached,
+                    _timestamp=cached.timestamp,
+                    model_request_parameters=model_request_parameters,
+                )
+                return
+
+        usage_details: dict[str, int] = {}
+        dispatched: dict[str, Any] = {}
+        settings = cast(LiteLLMModelSettings, model_settings or {})
+        stream_control = _StreamControl(
+            settings.get('litellm_first_chunk_timeout'), settings.get('litellm_chunk_timeout')
         )
-        yield await self._process_streamed_response(response, model_request_parameters)
+        telemetry = self._telemetry.start_request(completion_kwargs) if self._telemetry is not None else None
+        try:
+            with telemetry.use_span() if telemetry is not None else nullcontext():
+                stream = response = await self._acompletion(
+                    completion_kwargs, usage_details, profile, stream_control, dispatched
+                )
+        except BaseException as e:
+            if telemetry is not None:
+                telemetry.end(error=e)
+            raise
+
+        if self._stream_resume is not None:
+            response = self._resume_stream(response, completion_kwargs, self._stream_resume, profile, stream_control)
+        chunks = telemetry.observe_chunks(response) if telemetry is not None else response
+        streamed_response: LiteLLMStreamedResponse | None = None
+        error: BaseException | None = None
+        try:
+            with profile.phase('process_response') if profile is not None else nullcontext():
+                streamed_response = await self._process_streamed_response(
+                    chunks,
+                    model_request_parameters,
+                    cost_model=self._cost_model(dispatched or completion_kwargs, model_settings),
+                    profile=profile,
+                    stream_control=stream_control,
+                )
+            streamed_response._usage.details.update(usage_details)
+            yield streamed_response
+
+            if cache_key is not None and (final_response := streamed_response.get()).state == 'complete':
+                await self._response_cache.store(cache_key, final_response)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            if streamed_response is not None:
+                # Stop any background read-ahead before closing the stream it reads from.
+                await streamed_response._close_reader()
+            if chunks is not response:
+                await chunks.aclose()
+            await _aclose(response)
+            if response is not stream:
+                # Release what the stream holds (e.g. its rate limit slot) even if it was never consumed.
+                await _close_stream(stream)
+            if telemetry is not None:
+                telemetry.end(streamed_response.usage if streamed_response is not None else None, error)
 
     @property
     def model_name(self) -> str:
@@ -160,6 +645,30 @@ class LiteLLMModel(Model):
         """The system / model provider."""
         return self._system
 
+    @contextmanager
+    def _profiling(self, *, stream: bool) -> Iterator[RequestProfile | None]:
+        """Profile the request run in the `with` block, if the model has a `profiler`."""
+        if self._profiler is None:
+            yield None
+            return
+        profile = RequestProfile(model_name=self._model_name, stream=stream)
+        error: BaseException | None = None
+        try:
+            yield profile
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._profiler(profile.finish(error))
+
+    def _cost_model(
+        self, completion_kwargs: dict[str, Any], model_settings: ModelSettings | None
+    ) -> tuple[str, str | None] | None:
+        """The model and provider to price a request by, if `litellm_include_cost` is set."""
+        if not cast(LiteLLMModelSettings, model_settings or {}).get('litellm_include_cost'):
+            return None
+        return completion_kwargs['model'], completion_kwargs.get('custom_llm_provider')
+
     async def _completion_create(
         self,
         messages: list[ModelMessage],
@@ -167,8 +676,26 @@ class LiteLLMModel(Model):
         model_settings: LiteLLMModelSettings,
         model_request_parameters: ModelRequestParameters,
     ) -> Any:
-        tools = self._get_tools(model_request_parameters)
-        
+        completion_kwargs = await self._prepare_completion_kwargs(
+            messages, stream, model_settings, model_request_parameters
+        )
+        return await self._acompletion(completion_kwargs)
+
+    async def _prepare_completion_kwargs(
+        self,
+        messages: list[ModelMessage],
+        stream: bool,
+        model_settings: LiteLLMModelSettings,
+        model_request_parameters: ModelRequestParameters,
+        profile: RequestProfile | None = None,
+    ) -> dict[str, Any]:
+        """Build the keyword arguments for `acompletion`."""
+        with profile.phase('get_tools') if profile is not None else nullcontext():
+            tools = self._get_tools(model_request_parameters)
+        with profile.phase('map_messages') if profile is not None else nullcontext():
+            litellm_messages = await self._map_messages(messages, model_request_parameters, model_settings)
+        start = profile.clock() if profile is not None else None
+
         tool_choice: str | None = None
         if tools:
             if not model_request_parameters.allow_text_output:
@@ -176,14 +703,15 @@ class LiteLLMModel(Model):
             else:
                 tool_choice = 'auto'
 
-        litellm_messages = await self._map_messages(messages, model_request_parameters)
-
         # Prepare completion arguments
         completion_kwargs: dict[str, Any] = {
             'model': self._model_name,
             'messages': litellm_messages,
             'stream': stream,
         }
+        if stream:
+            # Ask for the final usage chunk; LiteLLM drops this for providers that always send usage.
+            completion_kwargs['stream_options'] = {'include_usage': True}
 
         # Add optional parameters from model settings
         if tools:
@@ -191,6 +719,9 @@ class LiteLLMModel(Model):
             if tool_choice:
                 completion_kwargs['tool_choice'] = tool_choice
 
+        if (output_format := response_format(model_request_parameters, self.profile)) is not None:
+            completion_kwargs['response_format'] = output_format
+
         if parallel_tool_calls := model_settings.get('parallel_tool_calls'):
             completion_kwargs['parallel_tool_calls'] = parallel_tool_calls
 
@@ -236,18 +767,225 @@ class LiteLLMModel(Model):
         if extra_body := model_settings.get('extra_body'):
             completion_kwargs['extra_body'] = extra_body
 
+        if model_settings.get('litellm_prompt_caching') and (
+            strategy := cache_strategy(self._model_name, custom_provider)
+        ):
+            add_cache_breakpoints(completion_kwargs, strategy)
+
+        if profile is not None and start is not None:
+            profile.record('build_kwargs', start)
+        return completion_kwargs
+
+    async def _acompletion(
+        self,
+        completion_kwargs: dict[str, Any],
+        usage_details: dict[str, int] | None = None,
+        profile: RequestProfile | None = None,
+        stream_control: _StreamControl | None = None,
+        dispatched: dict[str, Any] | None = None,
+    ) -> Any:
+        """Call `acompletion`, routing, hedging and retrying attempts per the configured policies.
+
+        Counters such as the number of hedged requests are added to `usage_details`, and attempt
+        timings to `profile`, if given. Streams are opened per `stream_control`. The arguments the
+        returned response was requested with, after routing and hedging, are copied to `dispatched`.
+        """
+        acompletion_attempt = self._acompletion_attempt
+        if profile is not None or stream_control is not None or dispatched is not None:
+            acompletion_attempt = partial(
+                self._acompletion_attempt, profile=profile, stream_control=stream_control, dispatched=dispatched
+            )
+
+        async def send(kwargs: dict[str, Any]) -> Any:
+            if self._router is None:
+                return await acompletion_attempt(kwargs)
+            return await self._router.run(kwargs, acompletion_attempt)
+
+        async def attempt() -> Any:
+            if self._hedge_policy is None:
+                return await send(completion_kwargs)
+            return await self._hedge_policy.run(
+                lambda overrides: send({**completion_kwargs, **overrides}),
+                stream=bool(completion_kwargs.get('stream')),
+                usage_details=usage_details,
+                discard=_close_stream,
+            )
+
+        if self._retry_policy is None:
+            return await attempt()
+        return await self._retry_policy.run(attempt)
+
+    async def _acompletion_attempt(
+        self,
+        completion_kwargs: dict[str, Any],
+        profile: RequestProfile | None = None,
+        stream_control: _StreamControl | None = None,
+        dispatched: dict[str, Any] | None = None,
+    ) -> Any:
+        """Make a single `acompletion` call, raising classified errors.
+
+        For streamed requests the first chunk is awaited as part of the attempt, so failures
+        that happen before any content arrives can be retried. If this is the first attempt to
+        succeed, its arguments are copied to `dispatched`.
+        """
+        if (pools := self._connection_pools) is not None:
+            completion_kwargs = {**completion_kwargs, 'shared_session': pools.session(pools.endpoint(completion_kwargs))}
+        permit = None
+        if self._rate_limiter is not None:
+            permit = await self._rate_limiter.acquire(
+                completion_kwargs.get('api_base'), completion_kwargs['model'], estimate_tokens(completion_kwargs)
+            )
+            if self._telemetry is not None:
+                self._telemetry.record_queue_wait(permit.queue_wait, completion_kwargs)
         try:
-            return await acompletion(**completion_kwargs)
+            start = time.perf_counter()
+            sending = self._send(completion_kwargs, permit, profile, stream_control)
+            if stream_control is not None and (timeout := stream_control.first_chunk_timeout) is not None:
+                response = await wait_with_timeout(
+                    sending, timeout, partial(LiteLLMStreamTimeoutError, self.model_name, 'first_chunk', timeout)
+                )
+            else:
+                response = await sending
+            if completion_kwargs.get('stream') and self._telemetry is not None:
+                self._telemetry.record_time_to_first_chunk(time.perf_counter() - start, completion_kwargs)
         except Exception as e:
+            if permit is not None:
+                permit.observe_error(e)
+                permit.release()
+            if isinstance(e, LiteLLMStreamTimeoutError):
+                raise
             # LiteLLM may raise various exceptions depending on the provider
-            # We'll wrap them in ModelHTTPError if they look like HTTP errors
-            if hasattr(e, 'status_code') and isinstance(e.status_code, int) and e.status_code >= 400:
-                raise ModelHTTPError(
-                    status_code=e.status_code, 
-                    model_name=self.model_name, 
-                    body=str(e)
-                ) from e
+            # We'll wrap them in typed errors if they look like request failures
+            if (error := classify_error(e, self.model_name)) is not None:
+                raise error from e
             raise  # Re-raise other exceptions as-is
+        except BaseException:
+            if permit is not None:
+                permit.release()
+            raise
+
+        if dispatched is not None and not dispatched:
+            # A hedged attempt that completes after the winner doesn't overwrite it.
+            dispatched.update(completion_kwargs)
+        if permit is None:
+            return response
+        if completion_kwargs.get('stream'):
+            # The concurrency slot stays taken until the stream has been consumed.
+            return permit.wrap_stream(response)
+        permit.observe_response(response)
+        permit.release()
+        return response
+
+    async def _send(
+        self,
+        completion_kwargs: dict[str, Any],
+        permit: RateLimitPermit | None,
+        profile: RequestProfile | None,
+        stream_control: _StreamControl | None,
+    ) -> Any:
+        """Call `acompletion` and, for streamed requests, wait for the first chunk."""
+        with profile.phase('acompletion') if profile is not None else nullcontext():
+            if (transport := self._transport) is not None and transport.provider(completion_kwargs) is not None:
+                response = await transport.acompletion(completion_kwargs)
+            else:
+                response = await acompletion(**completion_kwargs)
+        if not completion_kwargs.get('stream'):
+            return response
+        if stream_control is not None:
+            stream_control.opened.append(response)
+        if permit is not None:
+            permit.observe_headers(response_headers(response))
+        with profile.phase('first_chunk') if profile is not None else nullcontext():
+            return await self._start_stream(response, stream_control.chunk_timeout if stream_control else None)
+
+    async def _start_stream(self, stream: Any, chunk_timeout: float | None = None) -> ClosingStream:
+        """Wait for the first chunk of `stream` and return an iterator over all of its chunks.
+
+        With `chunk_timeout`, waiting longer than that for any further chunk raises `LiteLLMStreamTimeoutError`.
+        """
+        iterator = aiter(stream)
+        try:
+            first_chunk = await anext(iterator)
+        except StopAsyncIteration:
+            first_chunk = _utils.UNSET
+        except BaseException:
+            await _aclose(iterator)
+            raise
+        return ClosingStream(self._iter_stream(first_chunk, iterator, chunk_timeout), partial(_aclose, iterator))
+
+    async def _iter_stream(
+        self, first_chunk: Any, iterator: AsyncIterator[Any], chunk_timeout: float | None = None
+    ) -> AsyncIterator[Any]:
+        try:
+            if isinstance(first_chunk, _utils.Unset):
+                return
+            yield first_chunk
+            if chunk_timeout is None:
+                async for chunk in iterator:
+                    yield chunk
+                return
+            on_timeout = partial(LiteLLMStreamTimeoutError, self.model_name, 'next_chunk', chunk_timeout)
+            while True:
+                try:
+                    chunk = await wait_with_timeout(anext(iterator), chunk_timeout, on_timeout)
+                except StopAsyncIteration:
+                    return
+                yield chunk
+        except LiteLLMStreamTimeoutError:
+            raise
+        except Exception as e:
+            if (error := classify_error(e, self.model_name)) is not None:
+                raise error from e
+            raise
+        finally:
+            await _aclose(iterator)
+
+    async def _resume_stream(
+        self,
+        stream: AsyncIterator[Any],
+        completion_kwargs: dict[str, Any],
+        resume: StreamResume,
+        profile: RequestProfile | None,
+        stream_control: _StreamControl,
+    ) -> AsyncIterator[Any]:
+        """Iterate `stream`, continuing it with a new request for the rest of the text if it fails part-way."""
+        received: list[str] = []
+        tool_calls = False
+        try:
+            while True:
+                try:
+                    async for chunk in stream:
+                        if chunk.choices and (delta := chunk.choices[0].delta):
+                            if delta.content:
+                                received.append(delta.content)
+                            tool_calls = tool_calls or bool(delta.tool_calls)
+                        yield chunk
+                    return
+                except LiteLLMAPIError as e:
+                    if (
+                        not e.retryable
+                        or tool_calls
+                        or stream_control.closed
+                        or stream_control.resumes >= resume.max_resumes
+                    ):
+                        raise
+                await _aclose(stream)
+                stream_control.resumes += 1
+                text = ''.join(received)
+                prefill = resume.prefill
+                if prefill is None:
+                    prefill = _supports_assistant_prefill(
+                        completion_kwargs['model'], completion_kwargs.get('custom_llm_provider')
+                    )
+                stream = await self._acompletion(
+                    _resume_kwargs(completion_kwargs, text, prefill, resume.continuation_prompt),
+                    profile=profile,
+                    stream_control=stream_control,
+                )
+                if text and not prefill:
+                    stream = _skip_repeated_text(stream, text, resume.max_overlap)
+        finally:
+            await _aclose(stream)
 
     def _process_response(self, response: Any) -> ModelResponse:
         """Process a non-streamed response, and prepare a message to return."""
@@ -276,10 +1014,7 @@ class LiteLLMModel(Model):
         # Map usage
         usage_obj = usage.RunUsage()
         if response.usage:
-            usage_obj = usage.RunUsage(
-                input_tokens=getattr(response.usage, 'prompt_tokens', 0),
-                output_tokens=getattr(response.usage, 'completion_tokens', 0),
-            )
+            usage_obj = _map_usage(response.usage)
 
         # Get timestamp
         timestamp = _now_utc()
@@ -295,8 +1030,14 @@ class LiteLLMModel(Model):
         )
 
     async def _process_streamed_response(
-        self, response: Any, model_request_parameters: ModelRequestParameters
-    ) -> StreamedResponse:
+        self,
+        response: Any,
+        model_request_parameters: ModelRequestParameters,
+        *,
+        cost_model: tuple[str, str | None] | None = None,
+        profile: RequestProfile | None = None,
+        stream_control: _StreamControl | None = None,
+    ) -> LiteLLMStreamedResponse:
         """Process a streamed response, and prepare a streaming response to return."""
         peekable_response = _utils.PeekableAsyncStream(response)
         first_chunk = await peekable_response.peek()
@@ -313,13 +1054,19 @@ class LiteLLMModel(Model):
             _model_name=self._model_name,
             _response=peekable_response,
             _timestamp=timestamp,
+            _cost_model=cost_model,
+            _text_coalescing=self._text_coalescing,
+            _read_ahead=self._stream_read_ahead,
+            _on_tool_call_complete=self._on_tool_call_complete,
+            _profile=profile,
+            _stream_control=stream_control,
             model_request_parameters=model_request_parameters,
         )
 
     def _get_tools(self, model_request_parameters: ModelRequestParameters) -> list[dict[str, Any]]:
         """Convert tool definitions to LiteLLM format (OpenAI-compatible)."""
-        all_tools = model_request_parameters.function_tools + model_request_parameters.output_tools
-        return [self._map_tool_definition(tool_def) for tool_def in all_tools]
+        all_tools = [*model_request_parameters.function_tools, *model_request_parameters.output_tools]
+        return self._tool_cache.get_many(all_tools, self._map_tool_definition)
 
     def _map_tool_definition(self, tool_def: ToolDefinition) -> dict[str, Any]:
         """Map a ToolDefinition to LiteLLM/OpenAI format."""
@@ -333,87 +1080,27 @@ class LiteLLMModel(Model):
         }
 
     async def _map_messages(
-        self, messages: list[ModelMessage], model_request_parameters: ModelRequestParameters
+        self,
+        messages: list[ModelMessage],
+        model_request_parameters: ModelRequestParameters,
+        model_settings: ModelSettings | None = None,
     ) -> list[dict[str, Any]]:
-        """Map pydantic_ai messages to LiteLLM format (OpenAI-compatible)."""
-        litellm_messages: list[dict[str, Any]] = []
-        
-        for message in messages:
-            if isinstance(message, ModelRequest):
-                for part in message.parts:
-                    if isinstance(part, SystemPromptPart):
-                        litellm_messages.append({
-                            'role': 'system',
-                            'content': part.content,
-                        })
-                    elif isinstance(part, UserPromptPart):
-                        # For now, we'll handle simple string content
-                        # More complex content (images, etc.) would need additional handling
-                        content = part.content
-                        if isinstance(content, str):
-                            litellm_messages.append({
-                                'role': 'user',
-                                'content': content,
-                            })
-                        else:
-                            # For complex content, we'll convert to string for now
-                            # In a full implementation, we'd handle images, files, etc.
-                            content_str = ' '.join(str(item) for item in content if item)
-                            if content_str:
-                                litellm_messages.append({
-                                    'role': 'user',
-                                    'content': content_str,
-                                })
-                    elif isinstance(part, ToolReturnPart):
-                        litellm_messages.append({
-                            'role': 'tool',
-                            'tool_call_id': _guard_tool_call_id(t=part),
-                            'content': part.model_response_str(),
-                        })
-                    elif isinstance(part, RetryPromptPart):
-                        if part.tool_name is None:
-                            litellm_messages.append({
-                                'role': 'user',
-                                'content': part.model_response(),
-                            })
-                        else:
-                            litellm_messages.append({
-                                'role': 'tool',
-                                'tool_call_id': _guard_tool_call_id(t=part),
-                                'content': part.model_response(),
-                            })
-                    else:
-                        assert_never(part)
-                        
-            elif isinstance(message, ModelResponse):
-                message_content = None
-                tool_calls = []
-                
-                for part in message.parts:
-                    if isinstance(part, TextPart):
-                        message_content = part.content
-                    elif isinstance(part, ToolCallPart):
-                        tool_calls.append({
-                            'id': _guard_tool_call_id(t=part),
-                            'type': 'function',
-                            'function': {
-                                'name': part.tool_name,
-                                'arguments': part.args_as_json_str(),
-                            },
-                        })
-                    else:
-                        # Handle other part types as needed
-                        pass
-                
-                assistant_message: dict[str, Any] = {'role': 'assistant'}
-                if message_content:
-                    assistant_message['content'] = message_content
-                if tool_calls:
-                    assistant_message['tool_calls'] = tool_calls
-                    
-                litellm_messages.append(assistant_message)
-            else:
-                assert_never(message)
+        """Map pydantic_ai messages to LiteLLM format (OpenAI-compatible).
+
+        Messages unchanged since the previous request of the same conversation are served
+        from `_message_cache`, so only the newly appended tail is mapped on each step. Messages
+        with list content are copied, as LiteLLM modifies content parts in place.
+        """
+        custom_provider = (
+            cast(LiteLLMModelSettings, model_settings or {}).get('litellm_custom_llm_provider')
+            or self._custom_llm_provider
+        )
+        # Only resolved, once per request, if a document, audio or video URL needs mapping.
+        provider = cache(partial(self._file_url_provider, custom_provider))
+        litellm_messages = [
+            _detach_content(m)
+            for m in self._message_cache.map(messages, partial(self._map_message, provider=provider), custom_provider)
+        ]
 
         if instruction_parts := self._get_instruction_parts(messages, model_request_parameters):
             system_prompt_count = next(
@@ -429,6 +1116,106 @@ class LiteLLMModel(Model):
 
         return litellm_messages
 
+    def _file_url_provider(self, custom_llm_provider: str | None) -> str | None:
+        """The provider document, audio and video URLs are sent to, or `None` if they can't be sent.
+
+        With a router, the request may go to any of its deployments, so they must all agree.
+        """
+        if self._router is None:
+            return file_url_provider(self._model_name, custom_llm_provider)
+        providers = {
+            file_url_provider(d.model_name or self._model_name, d.custom_llm_provider or custom_llm_provider)
+            for d in self._router.deployments
+        }
+        if len(providers) > 1:
+            found = ', '.join(sorted(p or 'unsupported' for p in providers))
+            raise UserError(
+                f'Document, audio and video URLs need all router deployments to use the same provider ({found}); '
+                'pass the file as `BinaryContent` instead.'
+            )
+        return providers.pop()
+
+    def _map_message(
+        self, message: ModelMessage, provider: Callable[[], str | None] | None = None
+    ) -> list[dict[str, Any]]:
+        """Map a single pydantic_ai message to one or more LiteLLM messages.
+
+        `provider` returns the provider document, audio and video URLs are sent to.
+        """
+        litellm_messages: list[dict[str, Any]] = []
+
+        if isinstance(message, ModelRequest):
+            for part in message.parts:
+                if isinstance(part, SystemPromptPart):
+                    litellm_messages.append({
+                        'role': 'system',
+                        'content': part.content,
+                    })
+                elif isinstance(part, UserPromptPart):
+                    content = part.content
+                    if isinstance(content, str):
+                        litellm_messages.append({
+                            'role': 'user',
+                            'content': content,
+                        })
+                    elif content_parts := map_user_content(content, self._base64_cache.encode, provider):
+                        litellm_messages.append({
+                            'role': 'user',
+                            'content': content_parts,
+                        })
+                elif isinstance(part, ToolReturnPart):
+                    litellm_messages.append({
+                        'role': 'tool',
+                        'tool_call_id': _guard_tool_call_id(t=part),
+                        'content': part.model_response_str(),
+                    })
+                elif isinstance(part, RetryPromptPart):
+                    if part.tool_name is None:
+                        litellm_messages.append({
+                            'role': 'user',
+                            'content': part.model_response(),
+                        })
+                    else:
+                        litellm_messages.append({
+                            'role': 'tool',
+                            'tool_call_id': _guard_tool_call_id(t=part),
+                            'content': part.model_response(),
+                        })
+                else:
+                    assert_never(part)
+
+        elif isinstance(message, ModelResponse):
+            message_content = None
+            tool_calls = []
+
+            for part in message.parts:
+                if isinstance(part, TextPart):
+                    message_content = part.content
+                elif isinstance(part, ToolCallPart):
+                    tool_calls.append({
+                        'id': _guard_tool_call_id(t=part),
+                        'type': 'function',
+                        'function': {
+                            'name': part.tool_name,
+                            'arguments': part.args_as_json_str(),
+                        },
+                    })
+                else:
+                    # Handle other part types as needed
+                    pass
+
+            assistant_message: dict[str, Any] = {'role': 'assistant'}
+            if message_content:
+                assistant_message['content'] = message_content
+            if tool_calls:
+                assistant_message['tool_calls'] = tool_calls
+
+            litellm_messages.append(assistant_message)
+        else:
+            assert_never(message)
+
+        return litellm_messages
+
 
 @dataclass
 class LiteLLMStreamedResponse(StreamedResponse):
@@ -437,21 +1224,91 @@ class LiteLLMStreamedResponse(StreamedResponse):
     _model_name: str
     _response: Any
     _timestamp: datetime
+    _cost_model: tuple[str, str | None] | None = None
+    _text_coalescing: TextCoalescing | None = None
+    _read_ahead: int = 0
+    _on_tool_call_complete: Callable[[ToolCallPart], None] | None = None
+    _profile: RequestProfile | None = None
+    _stream_control: _StreamControl | None = None
+    _reader: ReadAhead | None = field(default=None, init=False, repr=False)
+    _tool_call_tracker: ToolCallCompletionTracker = field(
+        default_factory=ToolCallCompletionTracker, init=False, repr=False
+    )
+    _tool_call_part_indices: dict[int, int] = field(default_factory=dict, init=False, repr=False)
+    completed_tool_calls: list[ToolCallPart] = field(default_factory=list, init=False, repr=False)
+    """Streamed tool calls whose arguments are complete, in the order they completed."""
 
     async def _get_event_iterator(self) -> AsyncIterator[ModelResponseStreamEvent]:
-        async for chunk in self._response:
+        async with aclosing(self._iter_chunk_events()) as events:
+            timed_events = events if self._profile is None else TimedIterator(events, self._profile, 'stream_events')
+            async for event in timed_events:
+                yield event
+
+        if self._stream_control is not None and self._stream_control.resumes:
+            self._usage.details['stream_resumes'] = self._stream_control.resumes
+        if self._cost_model is not None and (cost := _completion_cost(*self._cost_model, self._usage)) is not None:
+            self.provider_details = {**(self.provider_details or {}), 'cost': cost}
+
+    async def _iter_chunk_events(self) -> AsyncIterator[ModelResponseStreamEvent]:
+        if self._read_ahead or self._text_coalescing is not None:
+            # Coalescing always reads ahead, so its deadline can interrupt the wait for the next chunk.
+            self._reader = ReadAhead(aiter(self._response), self._read_ahead or 16)
+        try:
+            if self._text_coalescing is not None:
+                async with aclosing(
+                    self._iter_coalesced_chunk_events(cast(ReadAhead, self._reader), self._text_coalescing)
+                ) as events:
+                    async for event in events:
+                        yield event
+            else:
+                chunks = self._reader or self._response
+                if self._profile is not None:
+                    chunks = TimedIterator(aiter(chunks), self._profile, 'stream_wait')
+                async with aclosing(self._iter_plain_chunk_events(chunks)) as events:
+                    async for event in events:
+                        yield event
+            self._complete_tool_calls(self._tool_call_tracker.finish())
+        finally:
+            await self._close_reader()
+
+    async def _close_reader(self) -> None:
+        """Stop the background read-ahead, if any; called when the stream is finished or abandoned."""
+        if self._reader is not None:
+            await self._reader.aclose()
+
+    async def close_stream(self) -> None:
+        """Close the LiteLLM stream so the provider stops generating; used by `cancel()`."""
+        await self._close_reader()
+        if self._stream_control is not None:
+            self._stream_control.closed = True
+            for stream in self._stream_control.opened:
+                await _abort_stream(stream)
+
+    def get_stream_cancel_errors(self) -> tuple[type[BaseException], ...]:
+        # What a stream closed under its reader raises: errors `_iter_stream` has already classified, and the
+        # bare transport errors of LiteLLM's httpx and aiohttp clients. Anything else is a real failure.
+        import aiohttp
+
+        return (
+            LiteLLMAPIError,
+            ModelHTTPError,
+            httpx.StreamError,
+            httpx.TransportError,
+            aiohttp.ClientError,
+            ConnectionError,
+        )
+
+    async def _iter_plain_chunk_events(self, chunks: AsyncIterator[Any]) -> AsyncIterator[ModelResponseStreamEvent]:
+        async for chunk in chunks:
             # Update usage if available
             if hasattr(chunk, 'usage') and chunk.usage:
-                self._usage += usage.RunUsage(
-                    input_tokens=getattr(chunk.usage, 'prompt_tokens', 0),
-                    output_tokens=getattr(chunk.usage, 'completion_tokens', 0),
-                )
+                self._usage += _map_usage(chunk.usage)
 
             if not chunk.choices:
                 continue
 
             choice = chunk.choices[0]
-            
+
             # Handle text content
             if choice.delta and choice.delta.content:
                 for event in self._parts_manager.handle_text_delta(
@@ -462,16 +1319,97 @@ class LiteLLMStreamedResponse(StreamedResponse):
 
             # Handle tool calls
             if choice.delta and choice.delta.tool_calls:
-                for i, tool_call_delta in enumerate(choice.delta.tool_calls):
-                    if tool_call_delta.function:
-                        maybe_event = self._parts_manager.handle_tool_call_delta(
-                            vendor_part_id=i,
-                            tool_name=tool_call_delta.function.name,
-                            args=tool_call_delta.function.arguments,
-                            tool_call_id=tool_call_delta.id,
-                        )
-                        if maybe_event is not None:
-                            yield maybe_event
+                for event in self._handle_tool_call_deltas(choice.delta.tool_calls):
+                    yield event
+
+    async def _iter_coalesced_chunk_events(
+        self, reader: ReadAhead, coalescing: TextCoalescing
+    ) -> AsyncIterator[ModelResponseStreamEvent]:
+        """Like `_iter_chunk_events`, but merge consecutive text deltas per `coalescing`.
+
+        Buffered text is flushed when it reaches `max_chars`, when `max_delay` has passed since its
+        first delta (even if no further chunk arrives), before any tool call delta, and at the end.
+        """
+        loop = asyncio.get_running_loop()
+        buffer: list[str] = []
+        buffered_chars = 0
+        deadline: float | None = None
+        profile = self._profile
+        while True:
+            start = profile.clock() if profile is not None else None
+            chunk = await reader.get(deadline)
+            if profile is not None and start is not None:
+                profile.record('stream_wait', start)
+            if chunk is TIMED_OUT or isinstance(chunk, _utils.Unset):
+                if buffer:
+                    for event in self._parts_manager.handle_text_delta(
+                        vendor_part_id='content', content=''.join(buffer)
+                    ):
+                        yield event
+                    buffer.clear()
+                    buffered_chars = 0
+                    deadline = None
+                if chunk is TIMED_OUT:
+                    continue
+                break
+
+            if hasattr(chunk, 'usage') and chunk.usage:
+                self._usage += _map_usage(chunk.usage)
+            if not chunk.choices:
+                continue
+
+            delta = chunk.choices[0].delta
+            if delta and delta.content:
+                if not buffer:
+                    deadline = loop.time() + coalescing.max_delay
+                buffer.append(delta.content)
+                buffered_chars += len(delta.content)
+
+            tool_calls = delta.tool_calls if delta else None
+            if buffer and (
+                tool_calls or buffered_chars >= coalescing.max_chars or loop.time() >= cast(float, deadline)
+            ):
+                for event in self._parts_manager.handle_text_delta(
+                    vendor_part_id='content', content=''.join(buffer)
+                ):
+                    yield event
+                buffer.clear()
+                buffered_chars = 0
+                deadline = None
+
+            if tool_calls:
+                for event in self._handle_tool_call_deltas(tool_calls):
+                    yield event
+
+    def _handle_tool_call_deltas(self, tool_call_deltas: Any) -> Iterator[ModelResponseStreamEvent]:
+        for position, tool_call_delta in enumerate(tool_call_deltas):
+            # Parallel calls are told apart by their provider index, not their position within the chunk.
+            index = getattr(tool_call_delta, 'index', None)
+            if not isinstance(index, int):
+                index = position
+            if tool_call_delta.function:
+                maybe_event = self._parts_manager.handle_tool_call_delta(
+                    vendor_part_id=index,
+                    tool_name=tool_call_delta.function.name,
+                    args=tool_call_delta.function.arguments,
+                    tool_call_id=tool_call_delta.id,
+                )
+                if isinstance(maybe_event, PartStartEvent):
+                    self._tool_call_part_indices[index] = maybe_event.index
+                if maybe_event is not None:
+                    yield maybe_event
+                self._complete_tool_calls(self._tool_call_tracker.feed(index, tool_call_delta.function.arguments))
+
+    def _complete_tool_calls(self, indices: list[int]) -> None:
+        parts = self._parts_manager.get_parts()
+        for index in indices:
+            part_index = self._tool_call_part_indices.get(index)
+            if part_index is None or not isinstance(part := parts[part_index], ToolCallPart):
+                continue
+            self.completed_tool_calls.append(part)
+            if self._on_tool_call_complete is not None:
+                self._on_tool_call_complete(part)
+
     @property
     def provider_url(self) -> str | None:
         """Get the provider base URL."""
@@ -491,3 +1429,20 @@ class LiteLLMStreamedResponse(StreamedResponse):
     def provider_name(self) -> str | None:
         """Get the provider name."""
         return 'litellm'
+
+
+@dataclass
+class _ReplayedStreamedResponse(LiteLLMStreamedResponse):
+    """A `LiteLLMStreamedResponse` that replays a complete `ModelResponse`, e.g. one served from a `ResponseCache`."""
+
+    _response: ModelResponse
+
+    def __post_init__(self) -> None:
+        self.provider_response_id = self._response.provider_response_id
+        self.provider_details = self._response.provider_details
+        self.finish_reason = self._response.finish_reason
+
+    async def _get_event_iterator(self) -> AsyncIterator[ModelResponseStreamEvent]:
+        self._usage = self._response.usage
+        for index, part in enumerate(self._response.parts):
+            yield self._parts_manager.handle_part(vendor_part_id=index, part=part)
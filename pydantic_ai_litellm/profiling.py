@@ -0,0 +1,165 @@
+"""Phase-level wall and CPU timings of the request pipeline, for profiling in-process overhead."""
+
+from __future__ import annotations as _annotations
+
+import json
+import random
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+__all__ = ('PhaseTiming', 'RequestProfile', 'SlowRequestLog')
+
+
+@dataclass
+class PhaseTiming:
+    """Accumulated timings of one phase of a request."""
+
+    wall: float = 0.0
+    """Wall-clock seconds spent in the phase."""
+    cpu: float = 0.0
+    """CPU seconds used by the event loop thread during the phase."""
+    count: int = 0
+    """Number of times the phase ran, e.g. once per attempt for `acompletion`."""
+
+
+@dataclass
+class RequestProfile:
+    """Wall and CPU timings of the phases of one request, passed to a `LiteLLMModel`'s `profiler`.
+
+    Phases are recorded only when they run, so e.g. a response cache hit has no `acompletion`:
+
+    - `get_tools`: mapping tool definitions.
+    - `map_messages`: mapping the message history.
+    - `build_kwargs`: assembling the rest of the `acompletion` arguments, including prompt caching markers.
+    - `acompletion`: the LiteLLM call, per attempt. For streams this ends when the stream is opened.
+    - `first_chunk`: waiting for the first chunk of a stream, per attempt.
+    - `process_response`: turning the LiteLLM response into a `ModelResponse` or streamed response.
+    - `stream_events`: turning streamed chunks into events, excluding `stream_wait`.
+    - `stream_wait`: waiting for the next streamed chunk.
+
+    CPU time is that of the thread running the event loop, so phases that wait (`acompletion`,
+    `first_chunk`, `stream_wait`) include CPU used by other tasks in the meantime. Concurrent
+    hedged attempts each add to `acompletion`, so its wall time can exceed the request's.
+    """
+
+    model_name: str
+    stream: bool
+    started_at: float = field(default_factory=time.time)
+    """Unix time at which the request started."""
+    wall: float = 0.0
+    """Wall-clock seconds from the start of the request until its response (or stream) was complete."""
+    error: str | None = None
+    """The name of the exception the request failed with, if any."""
+    phases: dict[str, PhaseTiming] = field(default_factory=dict)
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+
+    @staticmethod
+    def clock() -> tuple[float, float]:
+        """The current wall and CPU clocks, to pass to `record`."""
+        return time.perf_counter(), time.thread_time()
+
+    def record(self, phase: str, start: tuple[float, float]) -> None:
+        """Add the time since `start` (from `clock`) to `phase`."""
+        wall, cpu = time.perf_counter(), time.thread_time()
+        self.add(phase, wall - start[0], cpu - start[1])
+
+    def add(self, phase: str, wall: float, cpu: float) -> None:
+        timing = self.phases.get(phase)
+        if timing is None:
+            timing = self.phases[phase] = PhaseTiming()
+        timing.wall += wall
+        timing.cpu += cpu
+        timing.count += 1
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        """Record the time spent in the `with` block as `phase`."""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.record(phase, start)
+
+    @property
+    def cpu(self) -> float:
+        """CPU seconds spent in the request's own phases, excluding those waiting on the provider."""
+        return sum(timing.cpu for name, timing in self.phases.items() if name not in _WAITING_PHASES)
+
+    def finish(self, error: BaseException | None = None) -> RequestProfile:
+        self.wall = time.perf_counter() - self._start
+        if error is not None:
+            self.error = type(error).__name__
+        if (events := self.phases.get('stream_events')) is not None and (wait := self.phases.get('stream_wait')):
+            # Chunks are awaited while producing events; report the two separately.
+            events.wall = max(events.wall - wait.wall, 0.0)
+            events.cpu = max(events.cpu - wait.cpu, 0.0)
+        return self
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'model_name': self.model_name,
+            'stream': self.stream,
+            'started_at': self.started_at,
+            'wall': self.wall,
+            'cpu': self.cpu,
+            'error': self.error,
+            'phases': {name: asdict(timing) for name, timing in self.phases.items()},
+        }
+
+
+_WAITING_PHASES = frozenset({'acompletion', 'first_chunk', 'stream_wait'})
+
+
+class TimedIterator:
+    """Iterates `iterator`, recording the time spent waiting for each item as `phase` of `profile`."""
+
+    __slots__ = ('_iterator', '_profile', '_phase')
+
+    def __init__(self, iterator: AsyncIterator[Any], profile: RequestProfile, phase: str):
+        self._iterator = iterator
+        self._profile = profile
+        self._phase = phase
+
+    def __aiter__(self) -> TimedIterator:
+        return self
+
+    async def __anext__(self) -> Any:
+        start = self._profile.clock()
+        try:
+            return await anext(self._iterator)
+        finally:
+            self._profile.record(self._phase, start)
+
+
+class SlowRequestLog:
+    """A `profiler` that appends the profiles of slow requests to a JSONL file.
+
+    Requests that took at least `min_wall` seconds are kept with probability `sample_rate`.
+    Each kept profile is written as one line of `RequestProfile.to_dict()` JSON. Writes are
+    small and synchronous; keep `min_wall` and `sample_rate` such that they stay rare.
+
+    Args:
+        path: The file to append to; created if missing.
+        min_wall: Only log requests taking at least this many seconds.
+        sample_rate: Fraction of slow requests to log.
+    """
+
+    def __init__(self, path: str | Path, *, min_wall: float = 1.0, sample_rate: float = 1.0):
+        self.path = Path(path)
+        self.min_wall = min_wall
+        self.sample_rate = sample_rate
+        self.logged = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, profile: RequestProfile) -> None:
+        if profile.wall < self.min_wall or (self.sample_rate < 1.0 and random.random() >= self.sample_rate):
+            return
+        line = json.dumps(profile.to_dict())
+        with self._lock, self.path.open('a', encoding='utf-8') as f:
+            f.write(line + '\n')
+            self.logged += 1
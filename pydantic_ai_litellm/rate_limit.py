@@ -0,0 +1,266 @@
+"""Client-side concurrency, request-rate and token-rate limiting per LiteLLM endpoint."""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from ._headers import parse_duration, parse_float, response_headers, retry_after
+from ._streams import ClosingStream
+
+__all__ = (
+    'RateLimiter',
+    'RateLimitPermit',
+    'RateLimitStats',
+)
+
+_CHARS_PER_TOKEN = 4
+_TOKENS_PER_MESSAGE = 4
+
+
+@dataclass
+class RateLimitStats:
+    """Counters for one endpoint of a `RateLimiter`."""
+
+    requests: int = 0
+    """Number of permits granted."""
+    in_flight: int = 0
+    """Number of permits currently held."""
+    queued: int = 0
+    """Number of requests currently waiting for a permit."""
+    total_queue_wait: float = 0.0
+    """Total seconds spent waiting for permits."""
+    max_queue_wait: float = 0.0
+    """Longest single wait for a permit, in seconds."""
+    throttled: int = 0
+    """Number of times the provider signalled a rate limit (via `Retry-After` or exhausted remaining quota)."""
+
+    @property
+    def mean_queue_wait(self) -> float:
+        """Average seconds spent waiting for a permit."""
+        return self.total_queue_wait / self.requests if self.requests else 0.0
+
+
+class _TokenBucket:
+    """A token bucket holding up to `per_minute` tokens, refilled continuously."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, cost: float) -> float:
+        """Seconds until `cost` tokens are available; a cost above capacity only needs a full bucket."""
+        self.refill()
+        missing = min(cost, self.capacity) - self.tokens
+        return max(0.0, missing / self.rate)
+
+    def cap(self, remaining: float) -> None:
+        """Lower the bucket to the provider-reported remaining quota."""
+        self.refill()
+        self.tokens = min(self.tokens, remaining)
+
+
+@dataclass
+class _Endpoint:
+    semaphore: asyncio.Semaphore | None
+    requests: _TokenBucket | None
+    tokens: _TokenBucket | None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    blocked_until: float = 0.0
+    stats: RateLimitStats = field(default_factory=RateLimitStats)
+
+    def block_for(self, seconds: float) -> None:
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.stats.throttled += 1
+
+
+class RateLimiter:
+    """An async limiter enforcing concurrency, requests-per-minute and tokens-per-minute limits.
+
+    Limits apply separately to each `(api_base, model_name)` endpoint. A single instance can be
+    shared by many `LiteLLMModel`s in the same process so they draw from the same budget.
+
+    Token costs are estimated before dispatch from the mapped messages and `max_tokens`, and
+    reconciled against the usage reported by the response. The limiter also slows down when
+    the provider reports `Retry-After` or exhausted `x-ratelimit-remaining-*` quotas.
+
+    Args:
+        max_concurrency: Maximum number of requests in flight per endpoint.
+        requests_per_minute: Maximum request rate per endpoint.
+        tokens_per_minute: Maximum token rate (prompt plus completion) per endpoint.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int | None = None,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._endpoints: dict[tuple[str | None, str], _Endpoint] = {}
+
+    def stats(self, api_base: str | None, model_name: str) -> RateLimitStats:
+        """Counters for the `(api_base, model_name)` endpoint."""
+        return self._endpoint(api_base, model_name).stats
+
+    async def acquire(self, api_base: str | None, model_name: str, estimated_tokens: int = 0) -> RateLimitPermit:
+        """Wait until a request costing `estimated_tokens` may be sent to the endpoint.
+
+        The returned permit must be released once the response has been consumed.
+        """
+        endpoint = self._endpoint(api_base, model_name)
+        stats = endpoint.stats
+        start = time.monotonic()
+        stats.queued += 1
+        try:
+            if endpoint.semaphore is not None:
+                await endpoint.semaphore.acquire()
+            try:
+                # The lock keeps waiters in FIFO order while they wait for the buckets to refill.
+                async with endpoint.lock:
+                    while (delay := self._delay(endpoint, estimated_tokens)) > 0:
+                        await asyncio.sleep(delay)
+                    if endpoint.requests is not None:
+                        endpoint.requests.tokens -= 1
+                    if endpoint.tokens is not None:
+                        endpoint.tokens.tokens -= estimated_tokens
+            except BaseException:
+                if endpoint.semaphore is not None:
+                    endpoint.semaphore.release()
+                raise
+        finally:
+            stats.queued -= 1
+
+        wait = time.monotonic() - start
+        stats.requests += 1
+        stats.in_flight += 1
+        stats.total_queue_wait += wait
+        stats.max_queue_wait = max(stats.max_queue_wait, wait)
+        return RateLimitPermit(endpoint, estimated_tokens, wait)
+
+    def _delay(self, endpoint: _Endpoint, estimated_tokens: int) -> float:
+        delay = endpoint.blocked_until - time.monotonic()
+        if endpoint.requests is not None:
+            delay = max(delay, endpoint.requests.delay(1))
+        if endpoint.tokens is not None:
+            delay = max(delay, endpoint.tokens.delay(estimated_tokens))
+        return delay
+
+    def _endpoint(self, api_base: str | None, model_name: str) -> _Endpoint:
+        key = (api_base, model_name)
+        if (endpoint := self._endpoints.get(key)) is None:
+            endpoint = self._endpoints[key] = _Endpoint(
+                semaphore=asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None,
+                requests=_TokenBucket(self.requests_per_minute) if self.requests_per_minute else None,
+                tokens=_TokenBucket(self.tokens_per_minute) if self.tokens_per_minute else None,
+            )
+        return endpoint
+
+
+class RateLimitPermit:
+    """Permission to send one request, granted by `RateLimiter.acquire`."""
+
+    def __init__(self, endpoint: _Endpoint, estimated_tokens: int, queue_wait: float):
+        self._endpoint = endpoint
+        self._released = False
+        self.estimated_tokens = estimated_tokens
+        self.queue_wait = queue_wait
+        """Seconds spent waiting for this permit."""
+
+    def reconcile(self, actual_tokens: int) -> None:
+        """Correct the token bucket by the difference between the actual and estimated token cost."""
+        if (bucket := self._endpoint.tokens) is not None:
+            bucket.refill()
+            bucket.tokens -= actual_tokens - self.estimated_tokens
+            self.estimated_tokens = actual_tokens
+
+    def observe_response(self, response: Any) -> None:
+        """Reconcile token usage and rate-limit headers reported with a (non-streamed) response."""
+        if (tokens := _usage_tokens(getattr(response, 'usage', None))) is not None:
+            self.reconcile(tokens)
+        self.observe_headers(response_headers(response))
+
+    def observe_error(self, error: BaseException) -> None:
+        """Slow down the endpoint according to the rate-limit headers attached to an error."""
+        headers = response_headers(error)
+        self.observe_headers(headers)
+        if getattr(error, 'status_code', None) == 429 and retry_after(headers) is None:
+            self._endpoint.stats.throttled += 1
+
+    def observe_headers(self, headers: Mapping[str, str]) -> None:
+        """Adapt to `Retry-After` and `x-ratelimit-remaining-*`/`x-ratelimit-reset-*` response headers."""
+        if not headers:
+            return
+        endpoint = self._endpoint
+        if (delay := retry_after(headers)) is not None:
+            endpoint.block_for(delay)
+        for kind, bucket in (('requests', endpoint.requests), ('tokens', endpoint.tokens)):
+            remaining = parse_float(headers.get(f'x-ratelimit-remaining-{kind}'))
+            if remaining is None:
+                continue
+            if bucket is not None:
+                bucket.cap(remaining)
+            if remaining <= 0 and (reset := parse_duration(headers.get(f'x-ratelimit-reset-{kind}'))) is not None:
+                endpoint.block_for(reset)
+
+    def wrap_stream(self, stream: Any) -> ClosingStream:
+        """Iterate `stream`, reconciling with its final usage chunk and releasing the permit when it ends or closes."""
+        return ClosingStream(stream, self.release, self._reconcile_chunk)
+
+    def _reconcile_chunk(self, chunk: Any) -> None:
+        if (tokens := _usage_tokens(getattr(chunk, 'usage', None))) is not None:
+            self.reconcile(tokens)
+
+    def release(self) -> None:
+        """Return the concurrency slot; releasing more than once is a no-op."""
+        if self._released:
+            return
+        self._released = True
+        self._endpoint.stats.in_flight -= 1
+        if self._endpoint.semaphore is not None:
+            self._endpoint.semaphore.release()
+
+
+def estimate_tokens(completion_kwargs: Mapping[str, Any]) -> int:
+    """Roughly estimate the token cost of a request from its messages and `max_tokens`.
+
+    Uses ~4 characters per token; tool schemas are not counted. Estimates are corrected
+    against the actual usage once the response arrives.
+    """
+    chars = 0
+    messages = completion_kwargs.get('messages') or []
+    for message in messages:
+        content = message.get('content')
+        if isinstance(content, str):
+            chars += len(content)
+        elif isinstance(content, list):
+            chars += sum(len(item.get('text') or '') for item in content if isinstance(item, dict))
+        for tool_call in message.get('tool_calls') or ():
+            chars += len(tool_call['function']['arguments'])
+    prompt_tokens = chars // _CHARS_PER_TOKEN + _TOKENS_PER_MESSAGE * len(messages)
+    return prompt_tokens + (completion_kwargs.get('max_tokens') or 0)
+
+
+def _usage_tokens(usage: Any) -> int | None:
+    if usage is None:
+        return None
+    total = getattr(usage, 'total_tokens', None)
+    if isinstance(total, int):
+        return total
+    prompt, completion = getattr(usage, 'prompt_tokens', None), getattr(usage, 'completion_tokens', None)
+    if isinstance(prompt, int) and isinstance(completion, int):
+        return prompt + completion
+    return None
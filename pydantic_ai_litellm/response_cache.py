@@ -0,0 +1,184 @@
+"""Opt-in caching of LiteLLM responses, keyed on the final completion arguments."""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import fields
+from pathlib import Path
+from typing import Any
+
+from pydantic_ai import usage
+from pydantic_ai.messages import ModelMessagesTypeAdapter, ModelResponse
+
+__all__ = (
+    'ResponseCache',
+    'InMemoryResponseCache',
+    'SQLiteResponseCache',
+)
+
+_EXCLUDED_KWARGS = frozenset({'api_key', 'stream', 'stream_options', 'metadata', 'timeout'})
+_SECRET_HEADERS = frozenset({'authorization', 'api-key', 'x-api-key', 'proxy-authorization'})
+_CACHE_HIT_DETAIL = 'response_cache_hits'
+
+
+class ResponseCache(ABC):
+    """Storage backend for cached model responses.
+
+    Implementations store opaque serialized responses under a key derived from the completion
+    arguments; entries older than `ttl` seconds are treated as missing.
+    """
+
+    def __init__(self, *, ttl: float | None = None):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """Return the stored value for `key`, or `None` if it is missing or expired."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes) -> None:
+        """Store `value` under `key`."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove all entries."""
+        raise NotImplementedError()
+
+    async def lookup(self, key: str) -> ModelResponse | None:
+        """Return the cached response for `key` with its usage marked as cached, counting hits and misses."""
+        value = await self.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return load_response(value)
+
+    async def store(self, key: str, response: ModelResponse) -> None:
+        """Cache `response` under `key`."""
+        await self.set(key, dump_response(response))
+
+    def _expires_at(self) -> float | None:
+        return None if self.ttl is None else time.time() + self.ttl
+
+
+class InMemoryResponseCache(ResponseCache):
+    """A bounded, in-process LRU response cache."""
+
+    def __init__(self, *, maxsize: int = 1024, ttl: float | None = None):
+        super().__init__(ttl=ttl)
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[float | None, bytes]] = OrderedDict()
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        self._entries[key] = (self._expires_at(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class SQLiteResponseCache(ResponseCache):
+    """A response cache stored in a local SQLite database, so it survives restarts.
+
+    Database access runs in a worker thread to keep the event loop responsive.
+    """
+
+    def __init__(self, path: str | Path, *, ttl: float | None = None):
+        super().__init__(ttl=ttl)
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)'
+            )
+
+    async def get(self, key: str) -> bytes | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: bytes) -> None:
+        await asyncio.to_thread(self._set, key, value, self._expires_at())
+
+    async def clear(self) -> None:
+        await asyncio.to_thread(self._execute, 'DELETE FROM responses')
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _get(self, key: str) -> bytes | None:
+        with self._lock:
+            row = self._connection.execute('SELECT value, expires_at FROM responses WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self._execute('DELETE FROM responses WHERE key = ?', key)
+            return None
+        return value
+
+    def _set(self, key: str, value: bytes, expires_at: float | None) -> None:
+        self._execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?)', key, value, expires_at)
+
+    def _execute(self, sql: str, *params: Any) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(sql, params)
+
+
+def response_cache_key(completion_kwargs: dict[str, Any]) -> str:
+    """Hash the completion arguments that determine the response into a cache key.
+
+    Secrets (`api_key` and auth headers) and arguments that don't affect the generated
+    content (`stream`, `metadata`, `timeout`) are left out, so a streamed request can be
+    served from a response cached by a non-streamed one and vice versa.
+    """
+    canonical = {k: v for k, v in completion_kwargs.items() if k not in _EXCLUDED_KWARGS}
+    if headers := canonical.get('extra_headers'):
+        canonical['extra_headers'] = {k: v for k, v in headers.items() if k.lower() not in _SECRET_HEADERS}
+    payload = json.dumps(canonical, sort_keys=True, separators=(',', ':'), default=repr)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def dump_response(response: ModelResponse) -> bytes:
+    """Serialize a `ModelResponse` for storage in a `ResponseCache`."""
+    return ModelMessagesTypeAdapter.dump_json([response], warnings=False)
+
+
+def load_response(value: bytes) -> ModelResponse:
+    """Rebuild a `ModelResponse` served from a `ResponseCache`, with its usage marked as cached."""
+    response = ModelMessagesTypeAdapter.validate_json(value)[0]
+    assert isinstance(response, ModelResponse)
+    # Stored as `RequestUsage`; restore the `RunUsage` produced by `_process_response`, so the
+    # request isn't double counted, and record the hit in the usage details.
+    cached_usage = usage.RunUsage(**{f.name: getattr(response.usage, f.name) for f in fields(usage.UsageBase)})
+    cached_usage.details[_CACHE_HIT_DETAIL] = 1
+    response.usage = cached_usage
+    if response.provider_details and 'cost' in response.provider_details:
+        # Nothing was spent on a cache hit.
+        response.provider_details['cost'] = 0.0
+    return response
@@ -0,0 +1,72 @@
+"""Retrying failed LiteLLM requests with exponential backoff."""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+from .exceptions import LiteLLMAPIError
+
+__all__ = ('RetryPolicy',)
+
+T = TypeVar('T')
+
+
+@dataclass(kw_only=True)
+class RetryPolicy:
+    """When and how often to retry a failed LiteLLM request.
+
+    Only errors classified as retryable (rate limits, timeouts, connection failures and
+    unavailable services, see `pydantic_ai_litellm.exceptions`) are retried; anything else,
+    such as a context window overflow, fails on the first attempt.
+
+    The delay before retry `n` is `initial_delay * multiplier ** (n - 1)`, capped at `max_delay`
+    and, with `jitter`, drawn uniformly between zero and that value. A `Retry-After` sent by
+    the provider is used as a lower bound. No retry is started if it would end after
+    `max_elapsed` seconds since the first attempt.
+    """
+
+    max_attempts: int = 3
+    """Maximum number of attempts, including the first one."""
+    initial_delay: float = 0.5
+    """Delay before the first retry, in seconds."""
+    multiplier: float = 2.0
+    """Factor applied to the delay after each retry."""
+    max_delay: float = 30.0
+    """Upper bound for a single backoff delay, in seconds."""
+    jitter: bool = True
+    """Whether to randomize delays ("full jitter") so that concurrent clients don't retry in lockstep."""
+    max_elapsed: float | None = 60.0
+    """Total time budget for all attempts, in seconds, or `None` for no budget."""
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """Whether `error` is worth retrying."""
+        return isinstance(error, LiteLLMAPIError) and error.retryable
+
+    def backoff(self, retry: int, error: BaseException | None = None) -> float:
+        """The delay in seconds before retry number `retry` (starting at 1)."""
+        delay = min(self.max_delay, self.initial_delay * self.multiplier ** (retry - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if isinstance(error, LiteLLMAPIError) and error.retry_after is not None:
+            delay = max(delay, error.retry_after)
+        return delay
+
+    async def run(self, attempt: Callable[[], Awaitable[T]]) -> T:
+        """Call `attempt` until it succeeds, fails with a non-retryable error, or attempts or time run out."""
+        start = time.monotonic()
+        for retry in range(1, max(self.max_attempts, 1) + 1):
+            try:
+                return await attempt()
+            except Exception as e:
+                if retry >= max(self.max_attempts, 1) or not self.is_retryable(e):
+                    raise
+                delay = self.backoff(retry, e)
+                if self.max_elapsed is not None and time.monotonic() - start + delay > self.max_elapsed:
+                    raise
+                await asyncio.sleep(delay)
+        raise AssertionError('unreachable')  # pragma: no cover
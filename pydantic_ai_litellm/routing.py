@@ -0,0 +1,331 @@
+"""In-process routing of requests across several deployments of the same model."""
+
+from __future__ import annotations as _annotations
+
+import hashlib
+import json
+import math
+import random
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+from dataclasses import dataclass, field
+from functools import partial
+from inspect import isasyncgen
+from typing import Any, Literal, cast
+
+from ._prompt_caching import without_cache_control
+from ._streams import ClosingStream
+from .exceptions import LiteLLMAPIError
+
+__all__ = (
+    'Deployment',
+    'DeploymentStats',
+    'Router',
+    'LatencyRouter',
+    'AffinityRouter',
+)
+
+
+# Affinity digests remembered per router, for as many distinct system prompt and tool set combinations.
+_DIGEST_CACHE_SIZE = 256
+
+
+def _hashable(value: Any) -> Hashable:
+    """`value` with its dicts and lists turned into tuples; strings hash once per object, unlike a JSON dump."""
+    if isinstance(value, dict):
+        return tuple((k, _hashable(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return tuple(_hashable(v) for v in value)
+    return value
+
+
+def _tool_key(tool: Any) -> tuple[Hashable, Any]:
+    """A cache key for a tool mapped by `LiteLLMModel`, taking its JSON schema by identity, and that schema."""
+    function = tool.get('function') if isinstance(tool, dict) else None
+    if not isinstance(function, dict) or 'parameters' not in function:
+        return _hashable(tool), None
+    schema = function['parameters']
+    name, description, strict = function.get('name'), function.get('description'), function.get('strict')
+    return (id(schema), name, description, strict, 'cache_control' in tool), schema
+
+
+@dataclass
+class DeploymentStats:
+    """Live statistics of a `Deployment`, updated by the router that uses it."""
+
+    requests: int = 0
+    """Number of requests sent to the deployment."""
+    failures: int = 0
+    """Number of requests that failed with a retryable (deployment-side) error."""
+    in_flight: int = 0
+    """Number of requests currently in flight, including streams that haven't been consumed yet."""
+    ewma_latency: float | None = None
+    """Exponentially weighted moving average of non-streamed request latency, in seconds."""
+    ewma_first_chunk_latency: float | None = None
+    """Exponentially weighted moving average of streamed time to first chunk, in seconds."""
+    error_rate: float = 0.0
+    """Exponentially weighted moving average of the failure rate, between 0 and 1."""
+    consecutive_failures: int = 0
+    """Number of failures since the last success."""
+    ejected_until: float = 0.0
+    """`time.monotonic()` until which the deployment is ejected as unhealthy."""
+    ejections: int = 0
+    """Number of times the deployment has been ejected."""
+
+    @property
+    def ejected(self) -> bool:
+        """Whether the deployment is currently ejected."""
+        return self.ejected_until > time.monotonic()
+
+
+@dataclass
+class Deployment:
+    """One endpoint serving the model, e.g. a vLLM node or a cloud region.
+
+    Fields left as `None` fall back to the `LiteLLMModel`'s own settings.
+    """
+
+    api_base: str | None = None
+    api_key: str | None = field(default=None, repr=False)
+    custom_llm_provider: str | None = None
+    model_name: str | None = None
+    """Model name to use on this deployment, if it differs from the `LiteLLMModel`'s."""
+    weight: float = 1.0
+    """Relative share of traffic; a deployment with weight 2 is preferred over one with weight 1 at equal load."""
+    name: str | None = None
+    """Display name; defaults to `api_base`."""
+    stats: DeploymentStats = field(default_factory=DeploymentStats, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.name is None:
+            self.name = self.api_base
+
+    def completion_overrides(self) -> dict[str, Any]:
+        """Completion arguments that send a request to this deployment."""
+        overrides: dict[str, Any] = {}
+        if self.api_base is not None:
+            overrides['api_base'] = self.api_base
+        if self.api_key is not None:
+            overrides['api_key'] = self.api_key
+        if self.custom_llm_provider is not None:
+            overrides['custom_llm_provider'] = self.custom_llm_provider
+        if self.model_name is not None:
+            overrides['model'] = self.model_name
+        return overrides
+
+
+class Router(ABC):
+    """Picks a deployment for each request made by a `LiteLLMModel`.
+
+    Subclasses implement `select`; `run` sends the request and keeps the deployment's stats up
+    to date. Retries and hedges each go through the router again, so they can land on a
+    different deployment.
+    """
+
+    def __init__(
+        self,
+        deployments: Sequence[Deployment],
+        *,
+        ewma_alpha: float = 0.3,
+        eject_after: int = 3,
+        ejection_seconds: float = 30.0,
+    ):
+        if not deployments:
+            raise ValueError('At least one deployment is required')
+        self.deployments = list(deployments)
+        self.ewma_alpha = ewma_alpha
+        self.eject_after = eject_after
+        self.ejection_seconds = ejection_seconds
+
+    @abstractmethod
+    def select(self, completion_kwargs: dict[str, Any]) -> Deployment:
+        """Pick the deployment to send a request with `completion_kwargs` to."""
+        raise NotImplementedError()
+
+    def healthy_deployments(self) -> list[Deployment]:
+        """Deployments that aren't ejected; if all are, the one whose ejection ends first."""
+        healthy = [d for d in self.deployments if not d.stats.ejected]
+        return healthy or [min(self.deployments, key=lambda d: d.stats.ejected_until)]
+
+    async def run(
+        self,
+        completion_kwargs: dict[str, Any],
+        send: Callable[[dict[str, Any]], Awaitable[Any]],
+    ) -> Any:
+        """Send the request to the selected deployment with `send`, recording the outcome."""
+        deployment = self.select(completion_kwargs)
+        stream = bool(completion_kwargs.get('stream'))
+        stats = deployment.stats
+        stats.requests += 1
+        stats.in_flight += 1
+        start = time.monotonic()
+        try:
+            response = await send({**completion_kwargs, **deployment.completion_overrides()})
+        except BaseException as e:
+            stats.in_flight -= 1
+            if isinstance(e, LiteLLMAPIError) and e.retryable:
+                self._record_failure(deployment)
+            raise
+
+        self._record_success(deployment, time.monotonic() - start, stream)
+        if stream and (isasyncgen(response) or isinstance(response, ClosingStream)):
+            # The deployment stays in flight until the stream has been consumed or closed.
+            return ClosingStream(response, partial(self._end_stream, deployment))
+        stats.in_flight -= 1
+        return response
+
+    def _end_stream(self, deployment: Deployment) -> None:
+        deployment.stats.in_flight -= 1
+
+    def _record_success(self, deployment: Deployment, latency: float, stream: bool) -> None:
+        stats = deployment.stats
+        attr = 'ewma_first_chunk_latency' if stream else 'ewma_latency'
+        previous = getattr(stats, attr)
+        setattr(stats, attr, latency if previous is None else self._ewma(previous, latency))
+        stats.error_rate = self._ewma(stats.error_rate, 0.0)
+        stats.consecutive_failures = 0
+
+    def _record_failure(self, deployment: Deployment) -> None:
+        stats = deployment.stats
+        stats.failures += 1
+        stats.consecutive_failures += 1
+        stats.error_rate = self._ewma(stats.error_rate, 1.0)
+        if stats.consecutive_failures >= self.eject_after and not stats.ejected:
+            stats.ejected_until = time.monotonic() + self.ejection_seconds
+            stats.ejections += 1
+
+    def _ewma(self, previous: float, value: float) -> float:
+        return previous + self.ewma_alpha * (value - previous)
+
+
+class LatencyRouter(Router):
+    """Routes each request to the deployment with the lowest expected latency.
+
+    A deployment's score is its EWMA latency (time to first chunk for streams) scaled up by its
+    in-flight requests and recent error rate, and down by its weight. Deployments without latency
+    samples are tried first. Deployments that fail `eject_after` times in a row with a retryable
+    error are ejected for `ejection_seconds`.
+
+    Args:
+        deployments: The deployments to route between.
+        error_penalty: How strongly the recent error rate increases a deployment's score.
+        ewma_alpha: Weight of the newest sample in the moving averages.
+        eject_after: Consecutive failures after which a deployment is ejected.
+        ejection_seconds: How long an ejected deployment receives no traffic.
+    """
+
+    def __init__(
+        self,
+        deployments: Sequence[Deployment],
+        *,
+        error_penalty: float = 10.0,
+        ewma_alpha: float = 0.3,
+        eject_after: int = 3,
+        ejection_seconds: float = 30.0,
+    ):
+        super().__init__(
+            deployments, ewma_alpha=ewma_alpha, eject_after=eject_after, ejection_seconds=ejection_seconds
+        )
+        self.error_penalty = error_penalty
+
+    def select(self, completion_kwargs: dict[str, Any]) -> Deployment:
+        stream = bool(completion_kwargs.get('stream'))
+        candidates = self.healthy_deployments()
+        scores = [self.score(d, stream) for d in candidates]
+        best = min(scores)
+        return random.choice([d for d, score in zip(candidates, scores) if score == best])
+
+    def score(self, deployment: Deployment, stream: bool = False) -> float:
+        """Expected cost of sending a request to `deployment`; lower is better."""
+        stats = deployment.stats
+        latency = stats.ewma_first_chunk_latency if stream else stats.ewma_latency
+        if latency is None:
+            # Explore deployments without samples first, least loaded first.
+            return -1.0 / (1 + stats.in_flight)
+        return latency * (1 + stats.in_flight) * (1 + self.error_penalty * stats.error_rate) / deployment.weight
+
+
+class AffinityRouter(Router):
+    """Routes requests that share a prompt prefix to the same deployment, so it can reuse its KV cache.
+
+    Self-hosted servers such as vLLM and SGLang only skip prefill for a prefix they have already
+    processed. This router hashes the stable start of each request and picks a deployment by
+    weighted rendezvous (highest random weight) hashing: the same key always lands on the same
+    deployment, in every process, and adding or removing a deployment only moves the keys that
+    belong to it. Ejected deployments are skipped in favour of the key's next-ranked deployment.
+
+    Args:
+        deployments: The deployments to route between.
+        key: What to keep together. `'conversation'` hashes the system/instruction messages, the tool
+            definitions and the first non-system message, so every turn of an agent run goes to the
+            same deployment. `'prefix'` hashes only the system/instruction messages and tools, so all
+            conversations sharing them go to the same deployment.
+        ewma_alpha: Weight of the newest sample in the moving averages.
+        eject_after: Consecutive failures after which a deployment is ejected.
+        ejection_seconds: How long an ejected deployment receives no traffic.
+    """
+
+    def __init__(
+        self,
+        deployments: Sequence[Deployment],
+        *,
+        key: Literal['conversation', 'prefix'] = 'conversation',
+        ewma_alpha: float = 0.3,
+        eject_after: int = 3,
+        ejection_seconds: float = 30.0,
+    ):
+        super().__init__(
+            deployments, ewma_alpha=ewma_alpha, eject_after=eject_after, ejection_seconds=ejection_seconds
+        )
+        names = [d.name for d in self.deployments]
+        if None in names or len(set(names)) != len(names):
+            raise ValueError('Deployments must have distinct names (or `api_base` values) to be hashed')
+        self.key = key
+        # Tool schemas are held so their `id`s in the keys can't be reused by other objects while cached.
+        self._digests: OrderedDict[Hashable, tuple[list[Any], bytes]] = OrderedDict()
+
+    def select(self, completion_kwargs: dict[str, Any]) -> Deployment:
+        affinity_key = self.affinity_key(completion_kwargs)
+        return max(self.healthy_deployments(), key=lambda d: self._rank(affinity_key, d))
+
+    def ranking(self, completion_kwargs: dict[str, Any]) -> list[Deployment]:
+        """All deployments in the order they are preferred for `completion_kwargs`, ignoring health."""
+        affinity_key = self.affinity_key(completion_kwargs)
+        return sorted(self.deployments, key=lambda d: self._rank(affinity_key, d), reverse=True)
+
+    def affinity_key(self, completion_kwargs: dict[str, Any]) -> bytes:
+        """Digest of the part of the request that should stay on one deployment.
+
+        Digests are cached on the prefix messages' values and the tool schemas' identity, so the
+        system prompt and tools are only serialized when they change, not on every agent step.
+        """
+        messages = completion_kwargs.get('messages') or []
+        prefix: list[Any] = []
+        for message in messages:
+            # Prompt-caching markers move as the conversation grows, so they aren't part of the key.
+            if message.get('role') != 'system':
+                if self.key == 'conversation':
+                    prefix.append(without_cache_control(message))
+                break
+            prefix.append(without_cache_control(message))
+        tools = completion_kwargs.get('tools')
+        tool_keys = [_tool_key(tool) for tool in tools or ()]
+        cache_key = (completion_kwargs.get('model'), _hashable(prefix), tuple(key for key, _ in tool_keys))
+        if (entry := self._digests.get(cache_key)) is not None:
+            self._digests.move_to_end(cache_key)
+            return entry[1]
+
+        payload = json.dumps([completion_kwargs.get('model'), prefix, tools], default=str).encode()
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        self._digests[cache_key] = ([schema for _, schema in tool_keys], digest)
+        if len(self._digests) > _DIGEST_CACHE_SIZE:
+            self._digests.popitem(last=False)
+        return digest
+
+    def _rank(self, affinity_key: bytes, deployment: Deployment) -> float:
+        digest = hashlib.blake2b(affinity_key + cast(str, deployment.name).encode(), digest_size=8).digest()
+        # Map the hash to (0, 1) and apply weighted rendezvous hashing: -weight / ln(u).
+        unit = (int.from_bytes(digest, 'big') + 1) / (2**64 + 1)
+        return -deployment.weight / math.log(unit)
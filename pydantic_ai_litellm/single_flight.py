@@ -0,0 +1,89 @@
+"""Coalescing of identical in-flight requests into a single upstream call."""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import hashlib
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, Generic, TypeVar
+
+from .response_cache import _SECRET_HEADERS
+
+__all__ = ('SingleFlight',)
+
+T = TypeVar('T')
+
+
+@dataclass
+class _Call(Generic[T]):
+    task: asyncio.Future[T]
+    waiters: int = field(default=0)
+    callers: int = field(default=0)
+
+
+class SingleFlight:
+    """Shares one upstream call between concurrent requests with the same key.
+
+    The first request for a key starts the call; requests with the same key that arrive while
+    it is in flight wait for its result instead of starting their own. Cancelling a waiter
+    only cancels the shared call once no other waiter is left.
+
+    An instance can be shared between several `LiteLLMModel`s; the key includes the model
+    name, endpoint and credentials, so only truly identical requests are coalesced.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[str, _Call[Any]] = {}
+        self.calls = 0
+        """Number of upstream calls started."""
+        self.coalesced = 0
+        """Number of requests that were served by another request's upstream call."""
+
+    @property
+    def in_flight(self) -> int:
+        """Number of upstream calls currently in flight."""
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Run `fn`, or wait for the in-flight call with the same `key`.
+
+        Returns:
+            The result, and whether it is shared with another caller, the first one included
+            (and so must be copied before being modified).
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        call.callers += 1
+        try:
+            result = await asyncio.shield(call.task)
+            # No caller can join once the call is done, so the count is final.
+            return result, call.callers > 1
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+
+    def _forget(self, key: str, call: _Call[Any]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+
+def single_flight_key(request_key: str, completion_kwargs: Mapping[str, Any]) -> str:
+    """`request_key` (from `response_cache_key`, which leaves out secrets) qualified by a digest of the credentials.
+
+    Requests made with different API keys or auth headers are never coalesced, so one tenant's
+    request is never billed to, or failed with the auth error of, another's.
+    """
+    headers = completion_kwargs.get('extra_headers') or {}
+    secrets = [str(completion_kwargs.get('api_key') or '')]
+    secrets += sorted(f'{k.lower()}:{v}' for k, v in headers.items() if k.lower() in _SECRET_HEADERS)
+    return f'{request_key}:{hashlib.sha256(chr(0).join(secrets).encode()).hexdigest()}'
@@ -0,0 +1,57 @@
+"""Options controlling how streamed LiteLLM responses are turned into events."""
+
+from __future__ import annotations as _annotations
+
+from dataclasses import dataclass
+
+__all__ = (
+    'StreamResume',
+    'TextCoalescing',
+)
+
+
+@dataclass(kw_only=True)
+class TextCoalescing:
+    """Merge consecutive streamed text deltas into fewer, larger events.
+
+    Providers often stream one to three characters per chunk, and each becomes an event that
+    downstream consumers (e.g. an SSE fan-out) pay for. With coalescing, text is buffered until
+    `max_chars` characters have accumulated or `max_delay` seconds have passed since the first
+    buffered delta, whichever comes first. Buffered text is always flushed before a tool call
+    delta and at the end of the stream, so the order of events is preserved. To flush on time
+    while the stream is stalled, chunks are read ahead in the background (16 deep, or the model's
+    `stream_read_ahead`).
+    """
+
+    max_chars: int = 64
+    """Flush buffered text once it is at least this many characters long."""
+    max_delay: float = 0.05
+    """Flush buffered text at most this many seconds after its first delta arrived."""
+
+
+@dataclass(kw_only=True)
+class StreamResume:
+    """Resume a streamed response that fails part-way instead of failing the whole request.
+
+    When a stream that has already produced text breaks with a retryable error (a dropped
+    connection, a stalled chunk, a 5xx), the request is sent again with the text received so far,
+    and the new chunks continue the same stream: consumers see one event sequence, as if nothing
+    had happened. Where the model supports assistant prefill (per LiteLLM's model info, e.g.
+    Anthropic, DeepSeek, Mistral) the text is sent as a prefix the model continues from;
+    elsewhere it is sent as an assistant message followed by `continuation_prompt`, and any text
+    the model repeats at the start of its continuation is dropped.
+
+    Streams that have started a tool call are not resumed, as partial arguments can't be continued
+    reliably. Resumes are counted in `usage.details['stream_resumes']`.
+    """
+
+    max_resumes: int = 2
+    """Maximum number of times a single streamed request is resumed."""
+    prefill: bool | None = None
+    """Whether to resume with an assistant prefill; `None` uses it where LiteLLM reports support for it."""
+    continuation_prompt: str = (
+        'Your previous response was cut off. Continue it exactly where it stopped, without repeating any of it.'
+    )
+    """The user message asking the model to continue, when resuming without prefill."""
+    max_overlap: int = 200
+    """Maximum number of characters at the start of a continuation checked for repeated text."""
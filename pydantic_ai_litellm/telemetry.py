@@ -0,0 +1,147 @@
+"""OpenTelemetry spans and latency/throughput metrics for LiteLLM requests."""
+
+from __future__ import annotations as _annotations
+
+import time
+from collections.abc import AsyncIterator, Mapping
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from opentelemetry.metrics import MeterProvider
+    from opentelemetry.trace import Span, TracerProvider
+    from pydantic_ai.usage import RunUsage
+
+__all__ = ('Telemetry', 'RequestTelemetry')
+
+_INSTRUMENTATION_NAME = 'pydantic_ai_litellm'
+
+
+def _attributes(completion_kwargs: Mapping[str, Any]) -> dict[str, str]:
+    model: str = completion_kwargs['model']
+    provider = completion_kwargs.get('custom_llm_provider') or (model.split('/', 1)[0] if '/' in model else None)
+    attributes = {'gen_ai.request.model': model}
+    if provider:
+        attributes['litellm.provider'] = provider
+    if api_base := completion_kwargs.get('api_base'):
+        attributes['litellm.api_base'] = api_base
+    return attributes
+
+
+class Telemetry:
+    """Records OpenTelemetry spans and histograms for the requests of a `LiteLLMModel`.
+
+    Each request gets a span, and these histograms (in seconds unless noted) are recorded with
+    the model, provider and API base as attributes:
+
+    - `litellm.client.queue_wait`: time spent waiting for a `RateLimiter` permit, per attempt.
+    - `litellm.client.request.duration`: time from the start of a request until its response is
+      complete (for streams, until the stream ends), including queueing and retries.
+    - `litellm.client.time_to_first_chunk`: time from sending a streamed attempt to its first chunk.
+    - `litellm.client.inter_chunk_gap`: time between consecutive chunks of a stream.
+    - `litellm.client.output_tokens_per_second` (tokens/s): output tokens over the generation time
+      (for streams, measured from the first chunk).
+
+    Models without `telemetry` do none of this work. `opentelemetry-api` is only imported when a
+    `Telemetry` is created; without an SDK configured its tracer and meter are no-ops.
+
+    Args:
+        tracer_provider: Tracer provider to use; defaults to the global one.
+        meter_provider: Meter provider to use; defaults to the global one.
+    """
+
+    def __init__(
+        self,
+        *,
+        tracer_provider: TracerProvider | None = None,
+        meter_provider: MeterProvider | None = None,
+    ):
+        try:
+            from opentelemetry import metrics, trace
+        except ImportError as e:  # pragma: no cover
+            raise ImportError(
+                'Please install `opentelemetry-api` to use `Telemetry`, '
+                'you can use the `otel` optional group — `pip install "pydantic-ai-litellm[otel]"`'
+            ) from e
+
+        self._trace = trace
+        self._tracer = (tracer_provider or trace.get_tracer_provider()).get_tracer(_INSTRUMENTATION_NAME)
+        meter = (meter_provider or metrics.get_meter_provider()).get_meter(_INSTRUMENTATION_NAME)
+        self.queue_wait = meter.create_histogram(
+            'litellm.client.queue_wait', unit='s', description='Time waiting for a rate limit permit'
+        )
+        self.request_duration = meter.create_histogram(
+            'litellm.client.request.duration', unit='s', description='Time until the response is complete'
+        )
+        self.time_to_first_chunk = meter.create_histogram(
+            'litellm.client.time_to_first_chunk', unit='s', description='Time from sending a request to its first chunk'
+        )
+        self.inter_chunk_gap = meter.create_histogram(
+            'litellm.client.inter_chunk_gap', unit='s', description='Time between consecutive streamed chunks'
+        )
+        self.output_tokens_per_second = meter.create_histogram(
+            'litellm.client.output_tokens_per_second', unit='{token}/s', description='Output token throughput'
+        )
+
+    def start_request(self, completion_kwargs: Mapping[str, Any]) -> RequestTelemetry:
+        """Start the span and clock of a request; the result must be finished with `RequestTelemetry.end`."""
+        attributes = _attributes(completion_kwargs)
+        operation = 'chat.stream' if completion_kwargs.get('stream') else 'chat'
+        span = self._tracer.start_span(f'{operation} {attributes["gen_ai.request.model"]}', attributes=attributes)
+        return RequestTelemetry(self, span, attributes)
+
+    def record_queue_wait(self, seconds: float, completion_kwargs: Mapping[str, Any]) -> None:
+        self.queue_wait.record(seconds, _attributes(completion_kwargs))
+
+    def record_time_to_first_chunk(self, seconds: float, completion_kwargs: Mapping[str, Any]) -> None:
+        self.time_to_first_chunk.record(seconds, _attributes(completion_kwargs))
+
+
+class RequestTelemetry:
+    """The span and timings of one request, created by `Telemetry.start_request`."""
+
+    def __init__(self, telemetry: Telemetry, span: Span, attributes: dict[str, str]):
+        self._telemetry = telemetry
+        self.span = span
+        self._attributes = attributes
+        self._start = time.perf_counter()
+        self._first_chunk: float | None = None
+        self._ended = False
+
+    def use_span(self) -> Any:
+        """A context manager making the request's span current, e.g. while calling LiteLLM."""
+        return self._telemetry._trace.use_span(self.span, end_on_exit=False, record_exception=False)
+
+    async def observe_chunks(self, chunks: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        """Iterate `chunks`, recording the gaps between them."""
+        record_gap = self._telemetry.inter_chunk_gap.record
+        attributes = self._attributes
+        previous: float | None = None
+        async for chunk in chunks:
+            now = time.perf_counter()
+            if previous is None:
+                self._first_chunk = now
+            else:
+                record_gap(now - previous, attributes)
+            previous = now
+            yield chunk
+
+    def end(self, run_usage: RunUsage | None = None, error: BaseException | None = None) -> None:
+        """Record the request's duration and throughput and end its span; later calls are no-ops."""
+        if self._ended:
+            return
+        self._ended = True
+        end = time.perf_counter()
+        telemetry, span, attributes = self._telemetry, self.span, self._attributes
+        telemetry.request_duration.record(end - self._start, attributes)
+        if run_usage is not None:
+            span.set_attribute('gen_ai.usage.input_tokens', run_usage.input_tokens)
+            span.set_attribute('gen_ai.usage.output_tokens', run_usage.output_tokens)
+            generation_time = end - (self._first_chunk or self._start)
+            if run_usage.output_tokens and generation_time > 0:
+                telemetry.output_tokens_per_second.record(run_usage.output_tokens / generation_time, attributes)
+        if error is not None:
+            from opentelemetry.trace import Status, StatusCode
+
+            span.record_exception(error)
+            span.set_status(Status(StatusCode.ERROR, str(error)))
+        span.end()
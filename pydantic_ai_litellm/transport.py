@@ -0,0 +1,234 @@
+"""A direct transport for OpenAI-compatible endpoints that bypasses LiteLLM's request and response handling."""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import os
+from collections.abc import Callable, Mapping
+from typing import TYPE_CHECKING, Any
+
+from pydantic_core import from_json, to_json
+
+from .connection_pool import ConnectionPools
+
+if TYPE_CHECKING:
+    from aiohttp import ClientResponse
+
+__all__ = ('OpenAICompatibleTransport',)
+
+# `acompletion` arguments that configure LiteLLM rather than being part of the request body.
+_CLIENT_ARGUMENTS = frozenset(
+    {
+        'api_key',
+        'api_base',
+        'api_version',
+        'custom_llm_provider',
+        'metadata',
+        'extra_headers',
+        'extra_body',
+        'shared_session',
+        'timeout',
+    }
+)
+
+
+class _JSONObject:
+    """Attribute access to a parsed JSON object, standing in for LiteLLM's response types.
+
+    Missing fields read as `None`, like unset fields of LiteLLM's pydantic models, and
+    assignments write through to the underlying object.
+    """
+
+    __slots__ = ('_data', '_hidden_params')
+
+    def __init__(self, data: dict[str, Any], headers: Mapping[str, str] | None = None):
+        object.__setattr__(self, '_data', data)
+        if headers is not None:
+            # Where LiteLLM puts the provider's response headers (see `response_headers`).
+            object.__setattr__(self, '_hidden_params', {'additional_headers': headers})
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('__') or name == '_hidden_params':
+            raise AttributeError(name)
+        return _wrap(self._data.get(name))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._data[name] = value
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self._data!r})'
+
+
+def _wrap(value: Any) -> Any:
+    if isinstance(value, dict):
+        return _JSONObject(value)
+    if isinstance(value, list):
+        return [_wrap(item) for item in value]
+    return value
+
+
+def _transport_error(error: Exception) -> OSError:
+    """A builtin error for an aiohttp failure, which `classify_error` recognizes as a timeout or connection error."""
+    message = str(error) or type(error).__name__
+    # aiohttp's `ServerTimeoutError` is both a `ClientError` and an `asyncio.TimeoutError`.
+    if isinstance(error, asyncio.TimeoutError):
+        return TimeoutError(message)
+    return ConnectionError(message)
+
+
+class _HTTPStatusError(Exception):
+    """An error response from the endpoint, carrying what `classify_error` looks at."""
+
+    def __init__(self, status_code: int, body: Any, headers: Mapping[str, str]):
+        error = body.get('error') if isinstance(body, dict) else None
+        error = error if isinstance(error, dict) else {}
+        super().__init__(error.get('message') or str(body))
+        self.status_code = status_code
+        self.code = error.get('code')
+        self.body = body
+        self._hidden_params = {'additional_headers': headers}
+
+
+class _SSEStream:
+    """Chat completion chunks from a server-sent events response, one `_JSONObject` per `data:` line.
+
+    Closing the stream closes its connection, failing a read pending in another task; a stream
+    read to the end returns its connection to the pool instead.
+    """
+
+    def __init__(self, response: ClientResponse, headers: Mapping[str, str], loads: Callable[[bytes], Any]):
+        self._response = response
+        self._hidden_params = {'additional_headers': headers}
+        self._loads = loads
+        self._done = False
+
+    def __aiter__(self) -> _SSEStream:
+        return self
+
+    async def __anext__(self) -> _JSONObject:
+        import aiohttp
+
+        content = self._response.content
+        loads = self._loads
+        try:
+            while True:
+                line = await content.readline()
+                if not line:
+                    self._response.release()
+                    raise StopAsyncIteration
+                if self._done or not line.startswith(b'data:'):
+                    continue
+                data = line[5:].strip()
+                if data == b'[DONE]':
+                    # Keep reading to the end of the body, so the connection can be reused.
+                    self._done = True
+                    continue
+                chunk = loads(data)
+                if isinstance(chunk, dict) and 'error' in chunk and 'choices' not in chunk:
+                    raise _HTTPStatusError(500, chunk, self._hidden_params['additional_headers'])
+                return _JSONObject(chunk)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self._response.close()
+            raise _transport_error(e) from e
+
+    async def aclose(self) -> None:
+        self._response.close()
+
+
+class OpenAICompatibleTransport:
+    """Send requests to OpenAI-compatible endpoints directly instead of through LiteLLM.
+
+    For requests with an `api_base` whose provider is one of `providers` (e.g.
+    `LiteLLMModel("hosted_vllm/llama-3", api_base="http://vllm:8000/v1", transport=...)`),
+    the chat completion is POSTed to `{api_base}/chat/completions` and the JSON response or
+    server-sent events are decoded with `pydantic_core.from_json` into light objects that the
+    model processes exactly like LiteLLM's. This skips LiteLLM's provider translation and its
+    per-chunk pydantic model construction, which dominate the CPU cost of streaming. Other
+    requests, and anything needing LiteLLM's callbacks or provider-specific handling, go
+    through LiteLLM as usual.
+
+    Requests use the model's `ConnectionPools` when it has them, and otherwise the transport's
+    own, which `aclose` shuts down.
+
+    Args:
+        providers: LiteLLM provider names (the `model` prefix or `custom_llm_provider`) whose
+            requests are sent directly.
+        connection_pools: Pools to send requests through when the model has none.
+    """
+
+    def __init__(
+        self,
+        *,
+        providers: tuple[str, ...] = ('openai', 'hosted_vllm', 'lm_studio', 'llamafile'),
+        connection_pools: ConnectionPools | None = None,
+    ):
+        self.providers = frozenset(providers)
+        self.connection_pools = connection_pools or ConnectionPools()
+
+    def provider(self, completion_kwargs: Mapping[str, Any]) -> str | None:
+        """The provider of a request with these `acompletion` arguments, if it is sent directly."""
+        if not completion_kwargs.get('api_base'):
+            return None
+        model: str = completion_kwargs['model']
+        provider = completion_kwargs.get('custom_llm_provider') or (model.split('/', 1)[0] if '/' in model else None)
+        return provider if provider in self.providers else None
+
+    async def acompletion(self, completion_kwargs: dict[str, Any]) -> Any:
+        """Send a request that `provider` accepts, returning a response or a chunk stream like LiteLLM's."""
+        import aiohttp
+
+        if (provider := self.provider(completion_kwargs)) is None:
+            raise ValueError(f'Requests for {completion_kwargs["model"]!r} are not sent through this transport')
+        api_base: str = completion_kwargs['api_base']
+        model: str = completion_kwargs['model']
+        body = {k: v for k, v in completion_kwargs.items() if k not in _CLIENT_ARGUMENTS}
+        if model.startswith(f'{provider}/'):
+            body['model'] = model[len(provider) + 1 :]
+        if extra_body := completion_kwargs.get('extra_body'):
+            body.update(extra_body)
+
+        headers = {'Content-Type': 'application/json'}
+        api_key = completion_kwargs.get('api_key') or (os.environ.get('OPENAI_API_KEY') if provider == 'openai' else None)
+        if api_key:
+            headers['Authorization'] = f'Bearer {api_key}'
+        headers.update(completion_kwargs.get('extra_headers') or {})
+        # Like LiteLLM's (httpx) timeout: a limit on connecting and on each read, not on the whole response.
+        timeout = completion_kwargs.get('timeout')
+        client_timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+
+        session = completion_kwargs.get('shared_session')
+        if session is None:
+            session = self.connection_pools.session(ConnectionPools.endpoint(completion_kwargs))
+        try:
+            response = await session.post(
+                f'{api_base.rstrip("/")}/chat/completions', data=to_json(body), headers=headers, timeout=client_timeout
+            )
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            raise _transport_error(e) from e
+
+        response_headers = {k.lower(): v for k, v in response.headers.items()}
+        if response.status >= 400 or not completion_kwargs.get('stream'):
+            try:
+                data = await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise _transport_error(e) from e
+            finally:
+                response.release()
+            if response.status >= 400:
+                try:
+                    error_body = from_json(data)
+                except ValueError:
+                    error_body = data.decode(errors='replace')
+                raise _HTTPStatusError(response.status, error_body, response_headers)
+            return _JSONObject(from_json(data), response_headers)
+        return _SSEStream(response, response_headers, from_json)
+
+    async def aclose(self) -> None:
+        """Close the transport's own connection pools."""
+        await self.connection_pools.aclose()
+
+    async def __aenter__(self) -> OpenAICompatibleTransport:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
@@ -0,0 +1,61 @@
+"""Fake LiteLLM responses and stream chunks, and request arguments, shared by the unit tests."""
+
+from collections.abc import AsyncIterator, Iterable
+from unittest.mock import Mock
+
+from pydantic_ai.messages import ModelMessage, ModelRequest, UserPromptPart
+from pydantic_ai.models import ModelRequestParameters
+from pydantic_ai.tools import ToolDefinition
+
+
+def make_params(*function_tools: ToolDefinition, **kwargs) -> ModelRequestParameters:
+    return ModelRequestParameters(
+        function_tools=list(function_tools), output_tools=[], allow_text_output=True, **kwargs
+    )
+
+
+def make_messages(prompt: str = "Hello") -> list[ModelMessage]:
+    return [ModelRequest([UserPromptPart(prompt)])]
+
+
+def make_tool_call(
+    arguments: str, *, index: int = 0, tool_call_id: str | None = None, name: str | None = None
+) -> Mock:
+    """A tool call, as found in a response message or (with only some fields set) a chunk's delta."""
+    tool_call = Mock(index=index, id=tool_call_id)
+    tool_call.function = Mock(arguments=arguments)
+    tool_call.function.name = name
+    return tool_call
+
+
+def make_response(
+    content: str | None = "Hi",
+    *,
+    tool_calls: Iterable[Mock] = (),
+    usage=None,
+    model: str = "gpt-4o",
+    headers: dict | None = None,
+) -> Mock:
+    """A non-streamed LiteLLM `ModelResponse`; `headers` become the provider response headers."""
+    response = Mock(usage=usage, model=model, id="resp_1", created=1_700_000_000)
+    response.choices = [Mock()]
+    response.choices[0].message = Mock(content=content, tool_calls=list(tool_calls))
+    if headers is not None:
+        response._hidden_params = {'additional_headers': headers}
+    return response
+
+
+def make_chunk(content: str | None = None, *, tool_calls: Iterable[Mock] | None = None, usage=None) -> Mock:
+    """A streamed chunk; one with neither content nor tool calls has no choices, like a final usage chunk."""
+    chunk = Mock(created=1_700_000_000, usage=usage)
+    if content is None and tool_calls is None:
+        chunk.choices = []
+    else:
+        chunk.choices = [Mock()]
+        chunk.choices[0].delta = Mock(content=content, tool_calls=list(tool_calls or ()))
+    return chunk
+
+
+async def make_stream(*chunks: Mock) -> AsyncIterator[Mock]:
+    for chunk in chunks:
+        yield chunk
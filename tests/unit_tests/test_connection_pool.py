@@ -0,0 +1,103 @@
+"""Tests for shared HTTP connection pools."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from aiohttp import web
+
+from pydantic_ai_litellm import ConnectionPools, LiteLLMModel, PoolLimits
+
+from helpers import make_messages, make_params, make_response
+
+
+async def _server(delay: float = 0.0) -> tuple[web.AppRunner, str]:
+    async def handle(request: web.Request) -> web.Response:
+        await asyncio.sleep(delay)
+        return web.json_response({'ok': True})
+
+    app = web.Application()
+    app.router.add_get('/', handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f'http://127.0.0.1:{port}'
+
+
+class TestConnectionPools:
+    @pytest.mark.asyncio
+    async def test_models_share_a_session_per_endpoint(self):
+        pools = ConnectionPools()
+        models = [LiteLLMModel("gpt-4o", api_base="http://a", connection_pools=pools) for _ in range(2)]
+        other = LiteLLMModel("gpt-4o", api_base="http://b", connection_pools=pools)
+        mock = AsyncMock(return_value=make_response())
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', mock):
+            for model in [*models, other]:
+                await model.request(make_messages(), None, make_params())
+
+        sessions = [call.kwargs['shared_session'] for call in mock.await_args_list]
+        assert sessions[0] is sessions[1]
+        assert sessions[2] is not sessions[0]
+        assert pools.endpoints == ['http://a', 'http://b']
+        await pools.aclose()
+        assert all(session.closed for session in sessions)
+
+    @pytest.mark.asyncio
+    async def test_endpoint_without_api_base(self):
+        assert ConnectionPools.endpoint({'model': 'anthropic/claude-sonnet-4'}) == 'anthropic'
+        assert ConnectionPools.endpoint({'model': 'gpt-4o', 'custom_llm_provider': 'openai'}) == 'openai'
+        assert ConnectionPools.endpoint({'model': 'gpt-4o'}) == 'default'
+
+    @pytest.mark.asyncio
+    async def test_connections_are_reused(self):
+        runner, url = await _server()
+        try:
+            async with ConnectionPools() as pools:
+                session = pools.session(url)
+                for _ in range(3):
+                    async with session.get(url) as response:
+                        await response.read()
+
+                stats = pools.stats(url)
+                assert stats.requests == 3
+                assert stats.connections_created == 1
+                assert stats.connections_reused == 2
+                assert stats.idle == 1
+                assert stats.active == 0
+        finally:
+            await runner.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_full_pool_waits(self):
+        runner, url = await _server(delay=0.05)
+        try:
+            async with ConnectionPools(endpoint_limits={url: PoolLimits(max_connections=1)}) as pools:
+                session = pools.session(url)
+
+                async def get() -> None:
+                    async with session.get(url) as response:
+                        await response.read()
+
+                await asyncio.gather(get(), get())
+
+                stats = pools.stats(url)
+                assert stats.connections_created == 1
+                assert stats.waits == 1
+                assert stats.max_wait > 0.03
+        finally:
+            await runner.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_closed_session_is_replaced(self):
+        pools = ConnectionPools()
+        session = pools.session("http://a")
+        await pools.aclose()
+
+        replacement = pools.session("http://a")
+
+        assert session.closed
+        assert replacement is not session
+        await pools.aclose()
@@ -0,0 +1,163 @@
+"""Tests for hedged requests."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from pydantic_ai.messages import TextPart
+
+from pydantic_ai_litellm import Deployment, HedgePolicy, LatencyRouter, LiteLLMModel, RateLimiter
+
+from helpers import make_chunk, make_messages, make_params, make_response
+
+
+class _Deployments:
+    """Stand-in for `acompletion` whose latency depends on `api_base`."""
+
+    def __init__(self, latencies: dict, stream: bool = False):
+        self.latencies = latencies
+        self.stream = stream
+        self.calls: list = []
+        self.cancelled: list = []
+        self.closed: list = []
+
+    async def __call__(self, **kwargs):
+        api_base = kwargs.get('api_base')
+        self.calls.append(api_base)
+        if not self.stream:
+            await self._wait(api_base)
+            return make_response(f"from {api_base}")
+        return self._stream(api_base)
+
+    async def _wait(self, api_base):
+        try:
+            await asyncio.sleep(self.latencies[api_base])
+        except asyncio.CancelledError:
+            self.cancelled.append(api_base)
+            raise
+
+    async def _stream(self, api_base):
+        try:
+            await self._wait(api_base)
+            yield make_chunk(f"from {api_base}")
+        finally:
+            self.closed.append(api_base)
+
+
+class TestHedging:
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self):
+        deployments = _Deployments({'http://a': 0})
+        policy = HedgePolicy(delay=0.5)
+        model = LiteLLMModel(model_name="gpt-4", api_base="http://a", hedge_policy=policy)
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', deployments):
+            response = await model.request(make_messages(), None, make_params())
+
+        assert deployments.calls == ['http://a']
+        assert 'hedged_requests' not in response.usage.details
+        assert (policy.requests, policy.hedges) == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_to_alternate_and_cancelled(self):
+        deployments = _Deployments({'http://a': 10, 'http://b': 0})
+        policy = HedgePolicy(delay=0.01, alternates=[{'api_base': 'http://b'}])
+        model = LiteLLMModel(model_name="gpt-4", api_base="http://a", hedge_policy=policy)
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', deployments):
+            response = await model.request(make_messages(), None, make_params())
+
+        assert deployments.calls == ['http://a', 'http://b']
+        assert deployments.cancelled == ['http://a']
+        assert response.parts == [TextPart("from http://b")]
+        assert response.usage.details == {'hedged_requests': 1}
+        assert (policy.hedges, policy.hedge_wins) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_primary_error_falls_back_to_hedge(self):
+        calls = 0
+
+        async def completion(**kwargs):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(0.02)
+                raise ValueError("primary failed")
+            return make_response("hedge")
+
+        model = LiteLLMModel(model_name="gpt-4", hedge_policy=HedgePolicy(delay=0.01))
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', completion):
+            response = await model.request(make_messages(), None, make_params())
+
+        assert response.parts == [TextPart("hedge")]
+
+    @pytest.mark.asyncio
+    async def test_all_attempts_failing_raises_primary_error(self):
+        async def completion(**kwargs):
+            raise ValueError(kwargs.get('api_base'))
+
+        model = LiteLLMModel(model_name="gpt-4", api_base="http://a", hedge_policy=HedgePolicy(delay=0))
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', completion):
+            with pytest.raises(ValueError, match="http://a"):
+                await model.request(make_messages(), None, make_params())
+
+    @pytest.mark.asyncio
+    async def test_stream_races_on_first_chunk(self):
+        deployments = _Deployments({'http://a': 10, 'http://b': 0}, stream=True)
+        policy = HedgePolicy(delay=0.01, alternates=[{'api_base': 'http://b'}])
+        model = LiteLLMModel(model_name="gpt-4", api_base="http://a", hedge_policy=policy)
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', deployments):
+            async with model.request_stream(make_messages(), None, make_params()) as streamed:
+                _ = [event async for event in streamed]
+
+        assert streamed.get().parts == [TextPart("from http://b")]
+        assert streamed.usage.details == {'hedged_requests': 1}
+        assert deployments.cancelled == ['http://a']
+        assert sorted(deployments.closed) == ['http://a', 'http://b']
+
+    @pytest.mark.asyncio
+    async def test_stream_losing_a_tie_is_closed_and_released(self):
+        """When both attempts get their first chunk at once, the loser's stream, permit and deployment are released."""
+        closed = []
+        both_sent = asyncio.Event()
+
+        async def stream(api_base):
+            try:
+                await both_sent.wait()
+                yield make_chunk(f"from {api_base}")
+            finally:
+                closed.append(api_base)
+
+        async def acompletion(**kwargs):
+            closed.append(None)
+            if closed.count(None) == 2:
+                both_sent.set()
+            return stream(kwargs['api_base'])
+
+        a, b = Deployment(api_base="http://a"), Deployment(api_base="http://b")
+        limiter = RateLimiter(max_concurrency=2)
+        model = LiteLLMModel(
+            model_name="gpt-4",
+            hedge_policy=HedgePolicy(delay=0.01),
+            router=LatencyRouter([a, b]),
+            rate_limiter=limiter,
+        )
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', acompletion):
+            async with model.request_stream(make_messages(), None, make_params()) as streamed:
+                _ = [event async for event in streamed]
+
+        assert sorted(api_base for api_base in closed if api_base) == ["http://a", "http://b"]
+        assert (a.stats.in_flight, b.stats.in_flight) == (0, 0)
+        assert limiter.stats("http://a", "gpt-4").in_flight == limiter.stats("http://b", "gpt-4").in_flight == 0
+
+    def test_learned_percentile_delay(self):
+        policy = HedgePolicy(delay=5, percentile=90, min_samples=10)
+        for latency in range(1, 10):
+            policy.observe(latency / 10)
+        assert policy.hedge_delay() == 5
+
+        policy.observe(1.0)
+        assert policy.hedge_delay() == 1.0
+        assert policy.hedge_delay(stream=True) == 5
@@ -0,0 +1,54 @@
+"""Tests that litellm is only imported when it is first needed."""
+
+import subprocess
+import sys
+import textwrap
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from pydantic_ai_litellm import LiteLLMModel
+
+
+def _run(code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, '-c', textwrap.dedent(code)], capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip()
+
+
+class TestLazyImport:
+    def test_import_and_construction_do_not_import_litellm(self):
+        """Regression guard for cold-start time: importing litellm takes seconds."""
+        output = _run(
+            """
+            import sys
+            from pydantic_ai_litellm import LiteLLMModel
+            LiteLLMModel(model_name="gpt-4", api_key="test-key")
+            print('litellm' in sys.modules)
+            """
+        )
+        assert output == 'False'
+
+    def test_warmup_imports_litellm(self):
+        output = _run(
+            """
+            import sys
+            from pydantic_ai_litellm import LiteLLMModel
+            LiteLLMModel(model_name="gpt-4").warmup()
+            print('litellm' in sys.modules)
+            """
+        )
+        assert output == 'True'
+
+    @pytest.mark.asyncio
+    async def test_acompletion_forwards_to_litellm(self):
+        from pydantic_ai_litellm.litellm_model import acompletion
+
+        with patch('litellm.acompletion', new_callable=AsyncMock, return_value='response') as mock_acompletion:
+            assert await acompletion(model='gpt-4', messages=[]) == 'response'
+
+        mock_acompletion.assert_awaited_once_with(model='gpt-4', messages=[])
+
+    def test_model_constructs_without_litellm(self):
+        assert LiteLLMModel(model_name="gpt-4").model_name == "gpt-4"
@@ -0,0 +1,139 @@
+"""Tests for the incremental, per-conversation message mapping cache."""
+
+import pytest
+
+from pydantic_ai.messages import (
+    DocumentUrl,
+    InstructionPart,
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+
+from pydantic_ai_litellm import LiteLLMModel
+
+from helpers import make_params
+
+
+def _history() -> list:
+    return [
+        ModelRequest([SystemPromptPart("Base prompt."), UserPromptPart("Add 1 and 2")]),
+        ModelResponse([ToolCallPart("add", {"a": 1, "b": 2}, tool_call_id="call_1")]),
+        ModelRequest([ToolReturnPart("add", 3, tool_call_id="call_1")]),
+    ]
+
+
+class TestMessageCache:
+    def setup_method(self):
+        self.model = LiteLLMModel(model_name="gpt-4", api_key="test-key")
+
+    @pytest.mark.asyncio
+    async def test_only_appended_tail_is_mapped(self):
+        messages = _history()
+        first = await self.model._map_messages(messages, make_params())
+
+        messages.append(ModelResponse([TextPart("The answer is 3.")]))
+        second = await self.model._map_messages(messages, make_params())
+
+        assert len(second) == len(first) + 1
+        assert all(a is b for a, b in zip(first, second))
+        assert second[-1] == {'role': 'assistant', 'content': 'The answer is 3.'}
+        assert self.model._message_cache.hits == 3
+        assert self.model._message_cache.misses == 4
+
+    @pytest.mark.asyncio
+    async def test_result_matches_uncached_mapping(self):
+        uncached = LiteLLMModel(model_name="gpt-4", api_key="test-key", message_cache_size=0)
+        messages = _history()
+        await self.model._map_messages(messages[:2], make_params())
+
+        expected = await uncached._map_messages(messages, make_params())
+        assert await self.model._map_messages(messages, make_params()) == expected
+        assert uncached._message_cache.hits == 0
+
+    @pytest.mark.asyncio
+    async def test_replaced_message_is_remapped(self):
+        messages = _history()
+        await self.model._map_messages(messages, make_params())
+
+        messages[1] = ModelResponse([ToolCallPart("add", {"a": 5, "b": 2}, tool_call_id="call_1")])
+        result = await self.model._map_messages(messages, make_params())
+
+        assert result[2]['tool_calls'][0]['function']['arguments'] == '{"a":5,"b":2}'
+
+    @pytest.mark.asyncio
+    async def test_change_of_provider_remaps_messages(self):
+        messages = [ModelRequest([UserPromptPart([DocumentUrl("https://example.com/report.pdf")])])]
+        anthropic = await self.model._map_messages(messages, make_params(), {'litellm_custom_llm_provider': 'anthropic'})
+        gemini = await self.model._map_messages(messages, make_params(), {'litellm_custom_llm_provider': 'gemini'})
+
+        assert 'format' not in anthropic[0]['content'][0]['file']
+        assert gemini[0]['content'][0]['file']['format'] == 'application/pdf'
+        assert self.model._message_cache.hits == 0
+
+    @pytest.mark.asyncio
+    async def test_part_rewritten_in_place_is_remapped(self):
+        messages = _history()
+        await self.model._map_messages(messages, make_params())
+
+        messages[2].parts[0].content = 4
+        messages[0].parts.append(UserPromptPart("Be brief."))
+        result = await self.model._map_messages(messages, make_params())
+
+        assert result[2] == {'role': 'user', 'content': 'Be brief.'}
+        assert result[-1]['content'] == '4'
+
+    @pytest.mark.asyncio
+    async def test_trimmed_history_reuses_remaining_messages(self):
+        messages = _history()
+        first = await self.model._map_messages(messages, make_params())
+
+        trimmed = messages[1:]
+        result = await self.model._map_messages(trimmed, make_params())
+
+        assert result[0] is first[2]
+        assert result[1] is first[3]
+
+    @pytest.mark.asyncio
+    async def test_instructions_are_merged_on_top_of_cache(self):
+        messages = _history()
+        params = make_params(instruction_parts=[InstructionPart(content="Instruction A.")])
+        first = await self.model._map_messages(messages, params)
+        second = await self.model._map_messages(messages, params)
+
+        assert first == second
+        assert second[0] == {'role': 'system', 'content': 'Base prompt.\n\nInstruction A.'}
+        assert second[1] == {'role': 'user', 'content': 'Add 1 and 2'}
+
+        uncached = await self.model._map_messages(messages, make_params())
+        assert uncached[0] == {'role': 'system', 'content': 'Base prompt.'}
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_conversation_is_evicted(self):
+        model = LiteLLMModel(model_name="gpt-4", api_key="test-key", message_cache_size=1)
+        a, b = _history(), _history()
+        await model._map_messages(a, make_params())
+        await model._map_messages(b, make_params())
+        await model._map_messages(a, make_params())
+
+        assert model._message_cache.hits == 0
+
+    @pytest.mark.asyncio
+    async def test_litellm_transform_does_not_modify_cached_messages(self):
+        """LiteLLM rewrites content parts in place; requests get copies of the cached ones."""
+        from litellm import OpenAIGPTConfig
+        from pydantic_ai.messages import BinaryContent
+
+        video = BinaryContent(b"\x00\x00\x00\x18ftypmp42", media_type="video/mp4")
+        messages = [ModelRequest([UserPromptPart(["Describe this", video])])]
+        first = await self.model._map_messages(messages, make_params())
+        expected = [{**m, 'content': [{**p} for p in m['content']]} for m in first]
+        OpenAIGPTConfig()._transform_messages(first, model="gpt-4o")
+
+        assert 'filename' in first[0]['content'][1]['file']
+        assert await self.model._map_messages(messages, make_params()) == expected
+        assert self.model._message_cache.hits == 1
@@ -0,0 +1,94 @@
+"""Tests for streaming parallel tool calls keyed by provider index."""
+
+from unittest.mock import Mock
+
+import pytest
+from pydantic_ai.messages import ToolCallPart
+
+from pydantic_ai_litellm import LiteLLMModel
+from pydantic_ai_litellm._tool_call_stream import ToolCallCompletionTracker
+
+from helpers import make_chunk, make_params, make_stream, make_tool_call
+
+
+def _tool_call(index: int, arguments: str, tool_call_id: str | None = None, name: str | None = None) -> Mock:
+    return make_tool_call(arguments, index=index, tool_call_id=tool_call_id, name=name)
+
+
+def _chunk(*tool_calls: Mock) -> Mock:
+    return make_chunk(tool_calls=tool_calls)
+
+
+class TestParallelToolCalls:
+    @pytest.mark.asyncio
+    async def test_interleaved_deltas_are_keyed_by_index(self):
+        model = LiteLLMModel(model_name="gpt-4")
+        # Each chunk carries one delta, so its position within the chunk is always 0.
+        chunks = make_stream(
+            _chunk(_tool_call(0, '{"city":', "call_a", "get_weather")),
+            _chunk(_tool_call(1, '{"query":', "call_b", "search")),
+            _chunk(_tool_call(0, ' "Paris"}')),
+            _chunk(_tool_call(1, ' "hotels"}')),
+        )
+
+        streamed = await model._process_streamed_response(chunks, make_params())
+        [event async for event in streamed]
+
+        parts = streamed.get().parts
+        assert [(p.tool_name, p.tool_call_id, p.args) for p in parts] == [
+            ('get_weather', 'call_a', '{"city": "Paris"}'),
+            ('search', 'call_b', '{"query": "hotels"}'),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_calls_complete_before_stream_ends(self):
+        completed: list[tuple[str, int]] = []
+        chunks_read = 0
+
+        def on_complete(part: ToolCallPart) -> None:
+            completed.append((part.tool_name, chunks_read))
+
+        async def chunks():
+            nonlocal chunks_read
+            for chunk in (
+                _chunk(_tool_call(0, '', "call_a", "get_weather")),
+                _chunk(_tool_call(0, '{"city": "Pa')),
+                _chunk(_tool_call(0, 'ris"}')),  # JSON closes
+                _chunk(_tool_call(1, '{"query": "hotels', "call_b", "search")),
+                _chunk(_tool_call(1, ' in {Paris}"}')),  # braces inside strings don't count
+                _chunk(_tool_call(2, '', "call_c", "book")),  # no arguments yet
+                _chunk(_tool_call(3, '{}', "call_d", "noop")),  # next index starts
+            ):
+                chunks_read += 1
+                yield chunk
+
+        model = LiteLLMModel(model_name="gpt-4", on_tool_call_complete=on_complete)
+        streamed = await model._process_streamed_response(chunks(), make_params())
+        [event async for event in streamed]
+
+        assert completed == [('get_weather', 3), ('search', 5), ('book', 7), ('noop', 7)]
+        assert [p.tool_name for p in streamed.completed_tool_calls] == ['get_weather', 'search', 'book', 'noop']
+        assert streamed.completed_tool_calls[1].args == '{"query": "hotels in {Paris}"}'
+
+    @pytest.mark.asyncio
+    async def test_calls_without_index_fall_back_to_position(self):
+        model = LiteLLMModel(model_name="gpt-4")
+        first, second = _tool_call(0, '{}', "call_a", "a"), _tool_call(0, '{}', "call_b", "b")
+        first.index = second.index = None
+
+        streamed = await model._process_streamed_response(make_stream(_chunk(first, second)), make_params())
+        [event async for event in streamed]
+
+        assert [p.tool_name for p in streamed.get().parts] == ['a', 'b']
+
+
+class TestToolCallCompletionTracker:
+    def test_reports_each_call_once(self):
+        tracker = ToolCallCompletionTracker()
+
+        assert tracker.feed(0, '{"a": [1, ') == []
+        assert tracker.feed(0, '2]}') == [0]
+        assert tracker.feed(0, ' ') == []
+        assert tracker.feed(1, '{"b": "\\"}"') == []
+        assert tracker.finish() == [1]
+        assert tracker.finish() == []
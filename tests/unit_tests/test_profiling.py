@@ -0,0 +1,90 @@
+"""Tests for phase-level request profiling."""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from pydantic_ai.tools import ToolDefinition
+
+from pydantic_ai_litellm import LiteLLMModel, RequestProfile, SlowRequestLog, TextCoalescing
+
+from helpers import make_chunk, make_messages, make_params, make_response, make_stream
+
+_LOOKUP = ToolDefinition(name="lookup", parameters_json_schema={"type": "object", "properties": {}})
+
+
+class TestProfiler:
+    @pytest.mark.asyncio
+    async def test_request_phases(self):
+        profiles: list[RequestProfile] = []
+        model = LiteLLMModel("gpt-4o", profiler=profiles.append)
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', AsyncMock(return_value=make_response())):
+            await model.request(make_messages(), None, make_params(_LOOKUP))
+
+        [profile] = profiles
+        assert not profile.stream
+        assert profile.error is None
+        assert set(profile.phases) == {'get_tools', 'map_messages', 'build_kwargs', 'acompletion', 'process_response'}
+        assert all(timing.count == 1 for timing in profile.phases.values())
+        assert profile.wall >= sum(timing.wall for timing in profile.phases.values())
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('coalescing', [None, TextCoalescing(max_chars=2)])
+    async def test_stream_phases(self, coalescing):
+        profiles: list[RequestProfile] = []
+        model = LiteLLMModel("gpt-4o", profiler=profiles.append, text_coalescing=coalescing)
+        chunks = make_stream(make_chunk("a"), make_chunk("b"), make_chunk("c"))
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', AsyncMock(return_value=chunks)):
+            async with model.request_stream(make_messages(), None, make_params(_LOOKUP)) as stream:
+                assert profiles == []
+                async for _ in stream:
+                    pass
+
+        [profile] = profiles
+        assert profile.stream
+        assert {'acompletion', 'first_chunk', 'process_response', 'stream_events', 'stream_wait'} <= set(profile.phases)
+        assert profile.phases['stream_wait'].count >= 3
+        assert profile.phases['stream_events'].wall >= 0
+
+    @pytest.mark.asyncio
+    async def test_failed_request_is_profiled(self):
+        profiles: list[RequestProfile] = []
+        model = LiteLLMModel("gpt-4o", profiler=profiles.append)
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', AsyncMock(side_effect=ValueError("bad"))):
+            with pytest.raises(ValueError):
+                await model.request(make_messages(), None, make_params(_LOOKUP))
+
+        [profile] = profiles
+        assert profile.error == 'ValueError'
+        assert 'process_response' not in profile.phases
+
+
+class TestSlowRequestLog:
+    def _profile(self, wall: float) -> RequestProfile:
+        profile = RequestProfile(model_name="gpt-4o", stream=False)
+        profile.add('acompletion', wall, 0.001)
+        profile.finish()
+        profile.wall = wall
+        return profile
+
+    def test_logs_slow_requests(self, tmp_path):
+        log = SlowRequestLog(tmp_path / "slow.jsonl", min_wall=1.0)
+
+        log(self._profile(0.5))
+        log(self._profile(2.0))
+
+        [line] = (tmp_path / "slow.jsonl").read_text().splitlines()
+        record = json.loads(line)
+        assert record['wall'] == 2.0
+        assert record['phases']['acompletion'] == {'wall': 2.0, 'cpu': 0.001, 'count': 1}
+        assert log.logged == 1
+
+    def test_sampling(self, tmp_path):
+        log = SlowRequestLog(tmp_path / "slow.jsonl", min_wall=0.0, sample_rate=0.0)
+
+        log(self._profile(5.0))
+
+        assert not (tmp_path / "slow.jsonl").exists()
@@ -0,0 +1,177 @@
+"""Tests for automatic provider prompt-caching breakpoints."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from pydantic_ai.messages import ModelRequest, ModelResponse, SystemPromptPart, TextPart, UserPromptPart
+from pydantic_ai.tools import ToolDefinition
+
+from pydantic_ai_litellm import LiteLLMModel
+from pydantic_ai_litellm._prompt_caching import (
+    add_cache_breakpoints,
+    cache_strategy,
+    without_cache_control,
+)
+
+from helpers import make_params, make_response
+
+EPHEMERAL = {'type': 'ephemeral'}
+_SEARCH = ToolDefinition(name="search", description="Search", parameters_json_schema={'type': 'object'})
+
+
+def _history() -> list:
+    return [
+        ModelRequest([SystemPromptPart("You are helpful."), UserPromptPart("Hello")]),
+        ModelResponse([TextPart("Hi!")]),
+        ModelRequest([UserPromptPart("How are you?")]),
+    ]
+
+
+class TestCacheStrategy:
+    @pytest.mark.parametrize(
+        'model, provider, expected',
+        [
+            ("anthropic/claude-sonnet-4", None, 'breakpoints'),
+            ("claude-sonnet-4", None, 'breakpoints'),
+            ("bedrock/anthropic.claude-3-5-sonnet", None, 'breakpoints'),
+            ("openrouter/anthropic/claude-3.5-sonnet", None, 'breakpoints'),
+            ("my-claude", "anthropic", 'breakpoints'),
+            ("gemini/gemini-2.5-pro", None, 'prefix'),
+            ("vertex_ai/gemini-2.5-flash", None, 'prefix'),
+            ("gpt-4o", None, None),
+            ("hosted_vllm/claude-distill", None, None),
+        ],
+    )
+    def test_detects_provider(self, model, provider, expected):
+        assert cache_strategy(model, provider) == expected
+
+
+class TestAddCacheBreakpoints:
+    def test_marks_tools_system_and_last_message(self):
+        tool = {'type': 'function', 'function': {'name': 'search'}}
+        system = {'role': 'system', 'content': "You are helpful."}
+        last = {'role': 'user', 'content': "How are you?"}
+        kwargs = {'messages': [system, {'role': 'assistant', 'content': "Hi!"}, last], 'tools': [tool]}
+
+        assert add_cache_breakpoints(kwargs, 'breakpoints') == 3
+
+        assert kwargs['tools'][-1]['cache_control'] == EPHEMERAL
+        assert kwargs['messages'][0]['content'] == [
+            {'type': 'text', 'text': "You are helpful.", 'cache_control': EPHEMERAL}
+        ]
+        assert kwargs['messages'][1] == {'role': 'assistant', 'content': "Hi!"}
+        assert kwargs['messages'][2]['content'][0]['cache_control'] == EPHEMERAL
+        # The originals, which may be shared with the mapping caches, are left untouched.
+        assert 'cache_control' not in tool
+        assert system['content'] == "You are helpful."
+        assert last['content'] == "How are you?"
+
+    def test_tool_results_are_marked_on_the_message(self):
+        kwargs = {'messages': [{'role': 'tool', 'tool_call_id': "1", 'content': "42"}]}
+
+        add_cache_breakpoints(kwargs, 'breakpoints')
+
+        assert kwargs['messages'][0] == {'role': 'tool', 'tool_call_id': "1", 'content': "42", 'cache_control': EPHEMERAL}
+
+    def test_respects_breakpoint_limit(self):
+        marked = [{'type': 'text', 'text': "x", 'cache_control': EPHEMERAL}]
+        kwargs = {
+            'messages': [
+                {'role': 'system', 'content': "You are helpful."},
+                *({'role': 'user', 'content': marked} for _ in range(3)),
+            ],
+            'tools': [{'type': 'function', 'function': {'name': 'search'}}],
+        }
+
+        assert add_cache_breakpoints(kwargs, 'breakpoints') == 1
+        assert kwargs['tools'][-1]['cache_control'] == EPHEMERAL
+        assert kwargs['messages'][0]['content'] == "You are helpful."
+
+    def test_prefix_strategy_marks_only_system_block(self):
+        kwargs = {
+            'messages': [{'role': 'system', 'content': "You are helpful."}, {'role': 'user', 'content': "Hello"}],
+            'tools': [{'type': 'function', 'function': {'name': 'search'}}],
+        }
+
+        assert add_cache_breakpoints(kwargs, 'prefix') == 1
+        assert kwargs['messages'][0]['content'][0]['cache_control'] == EPHEMERAL
+        assert kwargs['messages'][1] == {'role': 'user', 'content': "Hello"}
+        assert 'cache_control' not in kwargs['tools'][-1]
+
+    def test_without_cache_control_restores_message(self):
+        for message in (
+            {'role': 'user', 'content': "Hello"},
+            {'role': 'tool', 'tool_call_id': "1", 'content': "42"},
+            {'role': 'user', 'content': [{'type': 'text', 'text': "a"}, {'type': 'image_url', 'image_url': "x"}]},
+        ):
+            kwargs = {'messages': [message]}
+            add_cache_breakpoints(kwargs, 'breakpoints')
+            assert without_cache_control(kwargs['messages'][0]) == message
+
+
+class TestPromptCachingSetting:
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        model = LiteLLMModel(model_name="anthropic/claude-sonnet-4")
+        kwargs = await model._prepare_completion_kwargs(_history(), False, {}, make_params(_SEARCH))
+
+        assert all(isinstance(m['content'], str) for m in kwargs['messages'])
+        assert 'cache_control' not in kwargs['tools'][0]
+
+    @pytest.mark.asyncio
+    async def test_setting_marks_request_without_touching_caches(self):
+        model = LiteLLMModel(model_name="anthropic/claude-sonnet-4", settings={'litellm_prompt_caching': True})
+        history = _history()
+
+        first = await model._prepare_completion_kwargs(history, False, model.settings, make_params(_SEARCH))
+        second = await model._prepare_completion_kwargs(history, False, {}, make_params(_SEARCH))
+
+        assert first['messages'][0]['content'][0]['cache_control'] == EPHEMERAL
+        assert first['messages'][-1]['content'][0]['cache_control'] == EPHEMERAL
+        assert first['tools'][-1]['cache_control'] == EPHEMERAL
+        # A later unmarked request of the same conversation gets clean messages from the caches.
+        assert all(isinstance(m['content'], str) for m in second['messages'])
+        assert 'cache_control' not in second['tools'][0]
+
+    @pytest.mark.asyncio
+    async def test_not_applied_to_providers_with_automatic_caching(self):
+        model = LiteLLMModel(model_name="gpt-4o", settings={'litellm_prompt_caching': True})
+        kwargs = await model._prepare_completion_kwargs(_history(), False, model.settings, make_params(_SEARCH))
+
+        assert all(isinstance(m['content'], str) for m in kwargs['messages'])
+
+
+class TestCacheUsage:
+    @pytest.mark.asyncio
+    async def test_anthropic_cache_tokens(self):
+        usage = Mock(
+            prompt_tokens=1200,
+            completion_tokens=10,
+            cache_read_input_tokens=1000,
+            cache_creation_input_tokens=150,
+            prompt_tokens_details=None,
+        )
+        model = LiteLLMModel(model_name="anthropic/claude-sonnet-4")
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', AsyncMock(return_value=make_response(usage=usage))):
+            response = await model.request(_history(), None, make_params(_SEARCH))
+
+        assert response.usage.cache_read_tokens == 1000
+        assert response.usage.cache_write_tokens == 150
+
+    @pytest.mark.asyncio
+    async def test_openai_cached_tokens(self):
+        usage = Mock(
+            prompt_tokens=1200,
+            completion_tokens=10,
+            cache_read_input_tokens=None,
+            cache_creation_input_tokens=None,
+            prompt_tokens_details=Mock(cached_tokens=1024),
+        )
+        model = LiteLLMModel(model_name="gpt-4o")
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', AsyncMock(return_value=make_response(usage=usage))):
+            response = await model.request(_history(), None, make_params(_SEARCH))
+
+        assert response.usage.cache_read_tokens == 1024
+        assert response.usage.cache_write_tokens == 0
@@ -0,0 +1,141 @@
+"""Tests for per-endpoint concurrency and RPM/TPM rate limiting."""
+
+import asyncio
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from pydantic_ai import ModelHTTPError
+
+from pydantic_ai_litellm import LiteLLMModel, RateLimiter
+from pydantic_ai_litellm.rate_limit import estimate_tokens
+
+from helpers import make_messages, make_params, make_response
+
+
+def _response(headers: dict | None = None, total_tokens: int = 15) -> Mock:
+    usage = Mock(prompt_tokens=10, completion_tokens=total_tokens - 10, total_tokens=total_tokens)
+    return make_response(usage=usage, headers=headers or {})
+
+
+class _RateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, headers: dict):
+        super().__init__("rate limited")
+        self.response = Mock(headers=headers)
+
+
+class TestRateLimiter:
+    @pytest.mark.asyncio
+    async def test_max_concurrency_is_enforced_and_shared(self):
+        limiter = RateLimiter(max_concurrency=2)
+        running = peak = 0
+
+        async def completion(**kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return _response()
+
+        models = [LiteLLMModel(model_name="gpt-4", api_base="http://a", rate_limiter=limiter) for _ in range(2)]
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', completion):
+            await asyncio.gather(*(models[i % 2].request(make_messages(), None, make_params()) for i in range(6)))
+
+        stats = limiter.stats("http://a", "gpt-4")
+        assert peak == 2
+        assert (stats.requests, stats.in_flight, stats.queued) == (6, 0, 0)
+        assert stats.max_queue_wait > 0
+
+    @pytest.mark.asyncio
+    async def test_endpoints_are_limited_separately(self):
+        limiter = RateLimiter(max_concurrency=1)
+        a = await limiter.acquire("http://a", "gpt-4")
+        b = await asyncio.wait_for(limiter.acquire("http://b", "gpt-4"), timeout=1)
+
+        assert limiter.stats("http://a", "gpt-4").in_flight == 1
+        assert limiter.stats("http://b", "gpt-4").in_flight == 1
+        a.release()
+        b.release()
+        b.release()
+        assert limiter.stats("http://b", "gpt-4").in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_exhausted_remaining_requests_header_delays_next_request(self):
+        limiter = RateLimiter(requests_per_minute=600)
+        model = LiteLLMModel(model_name="gpt-4", rate_limiter=limiter)
+        headers = {'x-ratelimit-remaining-requests': '0', 'x-ratelimit-reset-requests': '50ms'}
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', return_value=_response(headers)):
+            await model.request(make_messages(), None, make_params())
+            start = time.monotonic()
+            await model.request(make_messages(), None, make_params())
+
+        assert time.monotonic() - start >= 0.05
+        assert limiter.stats(None, "gpt-4").throttled >= 1
+
+    @pytest.mark.asyncio
+    async def test_retry_after_on_429_pauses_endpoint(self):
+        limiter = RateLimiter(max_concurrency=10)
+        model = LiteLLMModel(model_name="gpt-4", rate_limiter=limiter)
+
+        async def rate_limited(**kwargs):
+            raise _RateLimitError({'Retry-After': '0.05'})
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', rate_limited):
+            with pytest.raises(ModelHTTPError):
+                await model.request(make_messages(), None, make_params())
+
+        start = time.monotonic()
+        permit = await limiter.acquire(None, "gpt-4")
+        permit.release()
+
+        assert time.monotonic() - start >= 0.04
+        assert limiter.stats(None, "gpt-4").in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_token_estimate_is_reconciled_with_usage(self):
+        limiter = RateLimiter(tokens_per_minute=10_000)
+        model = LiteLLMModel(model_name="gpt-4", rate_limiter=limiter)
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', return_value=_response(total_tokens=1_000)):
+            await model.request(make_messages(), {'max_tokens': 100}, make_params())
+
+        bucket = limiter._endpoint(None, "gpt-4").tokens
+        assert 8_990 <= bucket.tokens <= 9_010
+
+    @pytest.mark.asyncio
+    async def test_stream_holds_slot_until_consumed(self):
+        limiter = RateLimiter(max_concurrency=1)
+        model = LiteLLMModel(model_name="gpt-4", rate_limiter=limiter)
+
+        def chunk(content, usage=None):
+            c = Mock(created=1_700_000_000, usage=usage)
+            c.choices = [Mock()]
+            c.choices[0].delta = Mock(content=content, tool_calls=[])
+            return c
+
+        async def stream():
+            yield chunk("Hel")
+            yield chunk("lo", usage=Mock(total_tokens=20))
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', return_value=stream()):
+            async with model.request_stream(make_messages(), None, make_params()) as streamed:
+                assert limiter.stats(None, "gpt-4").in_flight == 1
+                async for _ in streamed:
+                    break
+
+        assert limiter.stats(None, "gpt-4").in_flight == 0
+
+    def test_estimate_tokens_counts_messages_and_max_tokens(self):
+        kwargs = {
+            'messages': [
+                {'role': 'user', 'content': 'a' * 400},
+                {'role': 'assistant', 'tool_calls': [{'function': {'name': 'f', 'arguments': 'b' * 40}}]},
+            ],
+            'max_tokens': 50,
+        }
+
+        assert estimate_tokens(kwargs) == 100 + 10 + 2 * 4 + 50
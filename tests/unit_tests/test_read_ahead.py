@@ -0,0 +1,132 @@
+"""Tests for reading streamed chunks ahead of the consumer."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from pydantic_ai_litellm import LiteLLMConnectionError, LiteLLMModel
+from pydantic_ai_litellm._read_ahead import TIMED_OUT, ReadAhead
+
+from helpers import make_chunk, make_messages, make_params
+
+
+class _Source:
+    """An async generator of chunks that records how far it has been read and whether it was closed."""
+
+    def __init__(self, count: int, fail_after: int | None = None, stall_after: int | None = None):
+        self.count = count
+        self.fail_after = fail_after
+        self.stall_after = stall_after
+        self.produced = 0
+        self.closed = False
+
+    async def __call__(self):
+        try:
+            for i in range(self.count):
+                if i == self.fail_after:
+                    raise ConnectionError("connection reset")
+                if i == self.stall_after:
+                    await asyncio.sleep(10)
+                self.produced += 1
+                yield make_chunk(str(i))
+        finally:
+            self.closed = True
+
+
+class TestReadAhead:
+    @pytest.mark.asyncio
+    async def test_reads_ahead_up_to_maxsize(self):
+        source = _Source(100)
+        reader = ReadAhead(source(), maxsize=5)
+
+        assert await reader.get() is not None
+        await asyncio.sleep(0.01)
+
+        # One item consumed and five buffered; the reader waits for space before reading more.
+        assert source.produced == 6
+        await reader.aclose()
+        assert source.closed
+
+    @pytest.mark.asyncio
+    async def test_errors_follow_earlier_items(self):
+        reader = ReadAhead(_Source(10, fail_after=2)(), maxsize=10)
+
+        assert (await reader.get()).choices[0].delta.content == "0"
+        assert (await reader.get()).choices[0].delta.content == "1"
+        with pytest.raises(ConnectionError):
+            await reader.get()
+
+    @pytest.mark.asyncio
+    async def test_deadline(self):
+        reader = ReadAhead(_Source(10, stall_after=1)(), maxsize=10)
+        loop = asyncio.get_running_loop()
+
+        assert await reader.get(loop.time() + 1) is not TIMED_OUT
+        assert await reader.get(loop.time() + 0.01) is TIMED_OUT
+        await reader.aclose()
+
+
+class TestStreamReadAhead:
+    @pytest.mark.asyncio
+    async def test_prefetches_while_consumer_is_busy(self):
+        source = _Source(50)
+        model = LiteLLMModel(model_name="gpt-4", stream_read_ahead=8)
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', return_value=source()):
+            async with model.request_stream(make_messages(), None, make_params()) as stream:
+                events = aiter(stream)
+                await anext(events)
+                await asyncio.sleep(0.01)
+                assert 2 < source.produced <= 11
+                async for _ in events:
+                    pass
+
+        assert stream.get().parts[0].content == ''.join(str(i) for i in range(50))
+        assert source.closed
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_consumer(self):
+        model = LiteLLMModel(model_name="gpt-4", stream_read_ahead=8)
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', return_value=_Source(10, fail_after=5)()):
+            with pytest.raises(LiteLLMConnectionError):
+                async with model.request_stream(make_messages(), None, make_params()) as stream:
+                    async for _ in stream:
+                        pass
+
+    @pytest.mark.asyncio
+    async def test_abandoned_stream_stops_reader(self):
+        source = _Source(10, stall_after=3)
+        model = LiteLLMModel(model_name="gpt-4", stream_read_ahead=8)
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', return_value=source()):
+            async with model.request_stream(make_messages(), None, make_params()) as stream:
+                await anext(aiter(stream))
+                reader = stream._reader
+
+        assert reader is not None and reader._task.done()
+        assert source.closed
+
+    @pytest.mark.asyncio
+    async def test_cancelling_consumer_stops_reader(self):
+        source = _Source(10, stall_after=3)
+        model = LiteLLMModel(model_name="gpt-4", stream_read_ahead=8)
+        started = asyncio.Event()
+        streams = []
+
+        async def consume():
+            async with model.request_stream(make_messages(), None, make_params()) as stream:
+                streams.append(stream)
+                async for _ in stream:
+                    started.set()
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', return_value=source()):
+            task = asyncio.create_task(consume())
+            await started.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert streams[0]._reader._task.done()
+        assert source.closed
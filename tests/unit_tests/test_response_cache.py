@@ -0,0 +1,143 @@
+"""Tests for the opt-in response cache around `LiteLLMModel.request`."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from pydantic_ai.messages import PartStartEvent, TextPart, ToolCallPart
+
+from pydantic_ai_litellm import InMemoryResponseCache, LiteLLMModel, SQLiteResponseCache
+from pydantic_ai_litellm.response_cache import response_cache_key
+
+from helpers import make_chunk, make_messages, make_params, make_response, make_stream, make_tool_call
+
+
+def _response(content: str = "Cached answer") -> Mock:
+    tool_call = make_tool_call('{"a": 1}', tool_call_id="call_1", name="calculator")
+    return make_response(content, tool_calls=[tool_call], usage=Mock(prompt_tokens=10, completion_tokens=5))
+
+
+class TestResponseCacheKey:
+    def test_secrets_and_transport_arguments_are_excluded(self):
+        base = {'model': 'gpt-4', 'messages': [{'role': 'user', 'content': 'Hi'}]}
+
+        assert response_cache_key({**base, 'api_key': 'a', 'stream': True}) == response_cache_key(
+            {**base, 'api_key': 'b', 'stream': False, 'metadata': {'trace': 1}}
+        )
+        assert response_cache_key(
+            {**base, 'extra_headers': {'Authorization': 'Bearer a', 'X-Beta': '1'}}
+        ) == response_cache_key({**base, 'extra_headers': {'Authorization': 'Bearer b', 'X-Beta': '1'}})
+
+    def test_content_arguments_are_included(self):
+        base = {'model': 'gpt-4', 'messages': [{'role': 'user', 'content': 'Hi'}]}
+
+        assert response_cache_key(base) != response_cache_key({**base, 'temperature': 0.5})
+        assert response_cache_key(base) != response_cache_key(
+            {**base, 'extra_headers': {'X-Beta': '1'}}
+        )
+
+
+class TestResponseCache:
+    @pytest.mark.asyncio
+    @patch('pydantic_ai_litellm.litellm_model.acompletion', new_callable=AsyncMock)
+    async def test_identical_requests_are_served_from_cache(self, mock_acompletion):
+        mock_acompletion.return_value = _response()
+        cache = InMemoryResponseCache()
+        model = LiteLLMModel(model_name="gpt-4", api_key="test-key", response_cache=cache)
+
+        first = await model.request(make_messages(), None, make_params())
+        second = await model.request(make_messages(), None, make_params())
+
+        mock_acompletion.assert_awaited_once()
+        assert second.parts == first.parts
+        assert second.provider_response_id == "resp_1"
+        assert second.usage.input_tokens == 10
+        assert second.usage.details == {'response_cache_hits': 1}
+        assert first.usage.details == {}
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    @pytest.mark.asyncio
+    @patch('pydantic_ai_litellm.litellm_model.acompletion', new_callable=AsyncMock)
+    async def test_different_prompts_are_not_shared(self, mock_acompletion):
+        mock_acompletion.return_value = _response()
+        model = LiteLLMModel(model_name="gpt-4", response_cache=InMemoryResponseCache())
+
+        await model.request(make_messages("Hello"), None, make_params())
+        await model.request(make_messages("Goodbye"), None, make_params())
+
+        assert mock_acompletion.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_in_memory_cache_ttl_and_eviction(self):
+        cache = InMemoryResponseCache(maxsize=1, ttl=60)
+        await cache.set('a', b'1')
+        await cache.set('b', b'2')
+
+        assert await cache.get('a') is None
+        assert await cache.get('b') == b'2'
+
+        expired = InMemoryResponseCache(ttl=0)
+        await expired.set('a', b'1')
+        assert await expired.get('a') is None
+
+    @pytest.mark.asyncio
+    async def test_sqlite_cache_survives_restarts(self, tmp_path):
+        path = tmp_path / "responses.sqlite"
+        cache = SQLiteResponseCache(path)
+        await cache.set('a', b'1')
+        cache.close()
+
+        reopened = SQLiteResponseCache(path)
+        assert await reopened.get('a') == b'1'
+        await reopened.clear()
+        assert await reopened.get('a') is None
+        reopened.close()
+
+        expired = SQLiteResponseCache(path, ttl=0)
+        await expired.set('a', b'1')
+        assert await expired.get('a') is None
+        expired.close()
+
+    @pytest.mark.asyncio
+    @patch('pydantic_ai_litellm.litellm_model.acompletion', new_callable=AsyncMock)
+    async def test_stream_replays_cached_response(self, mock_acompletion, tmp_path):
+        mock_acompletion.return_value = _response()
+        model = LiteLLMModel(model_name="gpt-4", response_cache=SQLiteResponseCache(tmp_path / "cache.sqlite"))
+        await model.request(make_messages(), None, make_params())
+
+        async with model.request_stream(make_messages(), None, make_params()) as streamed:
+            events = [event async for event in streamed]
+
+        mock_acompletion.assert_awaited_once()
+        starts = [e.part for e in events if isinstance(e, PartStartEvent)]
+        assert isinstance(starts[0], TextPart) and starts[0].content == "Cached answer"
+        assert isinstance(starts[1], ToolCallPart) and starts[1].tool_name == "calculator"
+        response = streamed.get()
+        assert response.state == 'complete'
+        assert response.provider_response_id == "resp_1"
+        assert response.usage.details == {'response_cache_hits': 1}
+
+    @pytest.mark.asyncio
+    @patch('pydantic_ai_litellm.litellm_model.acompletion', new_callable=AsyncMock)
+    async def test_completed_stream_is_cached(self, mock_acompletion):
+        mock_acompletion.return_value = make_stream(make_chunk("Hello"), make_chunk(" there"))
+        model = LiteLLMModel(model_name="gpt-4", response_cache=InMemoryResponseCache())
+
+        async with model.request_stream(make_messages(), None, make_params()) as streamed:
+            _ = [event async for event in streamed]
+        response = await model.request(make_messages(), None, make_params())
+
+        mock_acompletion.assert_awaited_once()
+        assert response.parts == [TextPart("Hello there")]
+
+    @pytest.mark.asyncio
+    @patch('pydantic_ai_litellm.litellm_model.acompletion', new_callable=AsyncMock)
+    async def test_incomplete_stream_is_not_cached(self, mock_acompletion):
+        mock_acompletion.return_value = make_stream(make_chunk("Hello"), make_chunk(" there"))
+        cache = InMemoryResponseCache()
+        model = LiteLLMModel(model_name="gpt-4", response_cache=cache)
+
+        async with model.request_stream(make_messages(), None, make_params()) as streamed:
+            async for _ in streamed:
+                break
+
+        assert cache._entries == {}
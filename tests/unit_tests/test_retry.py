@@ -0,0 +1,156 @@
+"""Tests for typed error classification and the retry policy."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+import pytest
+from pydantic_ai import ModelHTTPError
+from pydantic_ai.messages import TextPart
+
+from pydantic_ai_litellm import LiteLLMModel, RetryPolicy
+from pydantic_ai_litellm.exceptions import (
+    LiteLLMConnectionError,
+    LiteLLMContextWindowExceededError,
+    LiteLLMRateLimitError,
+    LiteLLMServiceUnavailableError,
+    LiteLLMTimeoutError,
+    classify_error,
+)
+
+from helpers import make_chunk, make_messages, make_params, make_response
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code: int, headers: dict | None = None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = Mock(headers=headers or {})
+
+
+_FAST_RETRIES = RetryPolicy(max_attempts=3, initial_delay=0.001, jitter=False)
+
+
+class TestClassifyError:
+    def test_status_codes(self):
+        assert isinstance(classify_error(_StatusError(429), "gpt-4"), LiteLLMRateLimitError)
+        assert isinstance(classify_error(_StatusError(408), "gpt-4"), LiteLLMTimeoutError)
+        assert isinstance(classify_error(_StatusError(503), "gpt-4"), LiteLLMServiceUnavailableError)
+        plain = classify_error(_StatusError(401), "gpt-4")
+        assert type(plain) is ModelHTTPError and plain.status_code == 401
+
+    def test_transport_errors(self):
+        assert isinstance(classify_error(httpx.ReadTimeout("slow"), "gpt-4"), LiteLLMTimeoutError)
+        assert isinstance(classify_error(httpx.ConnectError("refused"), "gpt-4"), LiteLLMConnectionError)
+        assert classify_error(ValueError("bug"), "gpt-4") is None
+
+    def test_litellm_exceptions(self):
+        import litellm
+
+        error = litellm.ContextWindowExceededError(message="too long", model="gpt-4", llm_provider="openai")
+        classified = classify_error(error, "gpt-4")
+        assert isinstance(classified, LiteLLMContextWindowExceededError)
+        assert not classified.retryable
+
+        timeout = litellm.Timeout(message="slow", model="gpt-4", llm_provider="openai")
+        assert isinstance(classify_error(timeout, "gpt-4"), LiteLLMTimeoutError)
+
+    def test_retry_after_is_parsed(self):
+        error = classify_error(_StatusError(429, {'Retry-After': '2'}), "gpt-4")
+        assert error.retry_after == 2.0
+        assert isinstance(error, ModelHTTPError)
+
+
+class TestRetryPolicy:
+    def test_backoff_is_exponential_and_capped(self):
+        policy = RetryPolicy(initial_delay=1, multiplier=2, max_delay=5, jitter=False)
+
+        assert [policy.backoff(n) for n in (1, 2, 3, 4)] == [1, 2, 4, 5]
+        assert 0 <= RetryPolicy(initial_delay=1).backoff(1) <= 1
+
+    def test_retry_after_is_a_lower_bound(self):
+        policy = RetryPolicy(initial_delay=0.1, jitter=False)
+        error = LiteLLMRateLimitError(429, "gpt-4", retry_after=3)
+
+        assert policy.backoff(1, error) == 3
+
+    @pytest.mark.asyncio
+    async def test_retryable_errors_are_retried(self):
+        model = LiteLLMModel(model_name="gpt-4", retry_policy=_FAST_RETRIES)
+        mock_acompletion = AsyncMock(side_effect=[_StatusError(503), _StatusError(429), make_response("Recovered")])
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', mock_acompletion):
+            response = await model.request(make_messages(), None, make_params())
+
+        assert mock_acompletion.await_count == 3
+        assert response.parts == [TextPart("Recovered")]
+
+    @pytest.mark.asyncio
+    async def test_attempts_are_limited(self):
+        model = LiteLLMModel(model_name="gpt-4", retry_policy=_FAST_RETRIES)
+        mock_acompletion = AsyncMock(side_effect=_StatusError(503))
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', mock_acompletion):
+            with pytest.raises(LiteLLMServiceUnavailableError):
+                await model.request(make_messages(), None, make_params())
+
+        assert mock_acompletion.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_errors_fail_fast(self):
+        model = LiteLLMModel(model_name="gpt-4", retry_policy=_FAST_RETRIES)
+        mock_acompletion = AsyncMock(side_effect=_StatusError(400))
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', mock_acompletion):
+            with pytest.raises(ModelHTTPError):
+                await model.request(make_messages(), None, make_params())
+
+        mock_acompletion.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_time_budget_stops_retries(self):
+        policy = RetryPolicy(max_attempts=10, initial_delay=0.05, jitter=False, max_elapsed=0.01)
+        model = LiteLLMModel(model_name="gpt-4", retry_policy=policy)
+        mock_acompletion = AsyncMock(side_effect=_StatusError(503))
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', mock_acompletion):
+            with pytest.raises(LiteLLMServiceUnavailableError):
+                await model.request(make_messages(), None, make_params())
+
+        mock_acompletion.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stream_failing_before_first_chunk_is_retried(self):
+        async def failing_stream():
+            raise httpx.ReadError("reset")
+            yield  # pragma: no cover
+
+        async def stream():
+            yield make_chunk("Hello")
+
+        model = LiteLLMModel(model_name="gpt-4", retry_policy=_FAST_RETRIES)
+        mock_acompletion = AsyncMock(side_effect=[failing_stream(), stream()])
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', mock_acompletion):
+            async with model.request_stream(make_messages(), None, make_params()) as streamed:
+                _ = [event async for event in streamed]
+
+        assert mock_acompletion.await_count == 2
+        assert streamed.get().parts == [TextPart("Hello")]
+
+    @pytest.mark.asyncio
+    async def test_stream_failing_after_first_chunk_is_not_retried(self):
+        async def stream():
+            yield make_chunk("Hello")
+            await asyncio.sleep(0)
+            raise httpx.ReadError("reset")
+
+        model = LiteLLMModel(model_name="gpt-4", retry_policy=_FAST_RETRIES)
+        mock_acompletion = AsyncMock(return_value=stream())
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', mock_acompletion):
+            with pytest.raises(LiteLLMConnectionError):
+                async with model.request_stream(make_messages(), None, make_params()) as streamed:
+                    _ = [event async for event in streamed]
+
+        mock_acompletion.assert_awaited_once()
@@ -0,0 +1,242 @@
+"""Tests for routing requests across deployments."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from pydantic_ai.messages import ModelRequest, UserPromptPart
+
+from pydantic_ai_litellm import AffinityRouter, Deployment, LatencyRouter, LiteLLMModel, RetryPolicy
+
+from helpers import make_chunk, make_messages, make_params, make_response
+
+
+class _Backends:
+    """Stand-in for `acompletion` whose latency and failures depend on `api_base`."""
+
+    def __init__(self, latencies: dict, failing: frozenset = frozenset()):
+        self.latencies = latencies
+        self.failing = failing
+        self.calls: list = []
+
+    async def __call__(self, **kwargs):
+        api_base = kwargs.get('api_base')
+        self.calls.append(kwargs)
+        await asyncio.sleep(self.latencies.get(api_base, 0))
+        if api_base in self.failing:
+            raise ConnectionError(f"{api_base} is down")
+        if kwargs.get('stream'):
+            return self._stream(api_base)
+        return make_response(f"from {api_base}")
+
+    async def _stream(self, api_base):
+        yield make_chunk(f"from {api_base}")
+
+
+class TestLatencyRouter:
+    @pytest.mark.asyncio
+    async def test_prefers_lowest_latency_deployment(self):
+        fast, slow = Deployment(api_base="http://fast"), Deployment(api_base="http://slow")
+        router = LatencyRouter([fast, slow])
+        backends = _Backends({'http://fast': 0.001, 'http://slow': 0.05})
+        model = LiteLLMModel(model_name="gpt-4", router=router)
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', backends):
+            for _ in range(10):
+                await model.request(make_messages(), None, make_params())
+
+        # Both deployments are tried once, then the fast one takes the rest.
+        assert slow.stats.requests == 1
+        assert fast.stats.requests == 9
+        assert fast.stats.ewma_latency < slow.stats.ewma_latency
+        assert fast.stats.in_flight == slow.stats.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_in_flight_requests_spread_load(self):
+        a, b = Deployment(api_base="http://a"), Deployment(api_base="http://b")
+        a.stats.ewma_latency = b.stats.ewma_latency = 0.01
+        router = LatencyRouter([a, b])
+        backends = _Backends({'http://a': 0.02, 'http://b': 0.02})
+        model = LiteLLMModel(model_name="gpt-4", router=router)
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', backends):
+            await asyncio.gather(*(model.request(make_messages(), None, make_params()) for _ in range(4)))
+
+        assert a.stats.requests == b.stats.requests == 2
+
+    def test_weight_scales_score(self):
+        light, heavy = Deployment(api_base="http://light"), Deployment(api_base="http://heavy", weight=2)
+        light.stats.ewma_latency = heavy.stats.ewma_latency = 1.0
+        router = LatencyRouter([light, heavy])
+
+        assert router.score(heavy) == router.score(light) / 2
+        assert router.select({}) is heavy
+
+    @pytest.mark.asyncio
+    async def test_deployment_overrides_completion_kwargs(self):
+        deployment = Deployment(
+            api_base="http://vllm:8000", api_key="secret", custom_llm_provider="hosted_vllm", model_name="llama"
+        )
+        backends = _Backends({})
+        model = LiteLLMModel(model_name="gpt-4", api_base="http://ignored", router=LatencyRouter([deployment]))
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', backends):
+            await model.request(make_messages(), None, make_params())
+
+        call = backends.calls[0]
+        assert call['api_base'] == "http://vllm:8000"
+        assert call['api_key'] == "secret"
+        assert call['custom_llm_provider'] == "hosted_vllm"
+        assert call['model'] == "llama"
+        assert repr(deployment).count("secret") == 0
+
+    @pytest.mark.asyncio
+    async def test_failing_deployment_is_ejected(self):
+        good, bad = Deployment(api_base="http://good"), Deployment(api_base="http://bad")
+        router = LatencyRouter([bad, good], eject_after=2)
+        backends = _Backends({}, failing=frozenset({'http://bad'}))
+        model = LiteLLMModel(
+            model_name="gpt-4", router=router, retry_policy=RetryPolicy(initial_delay=0, jitter=False)
+        )
+
+        with (
+            patch('pydantic_ai_litellm.litellm_model.acompletion', backends),
+            patch.object(router, 'score', lambda d, stream=False: 0 if d is bad else 1),
+        ):
+            # Every request prefers `bad` until it is ejected; retries then land on `good`.
+            for _ in range(3):
+                await model.request(make_messages(), None, make_params())
+
+        assert bad.stats.failures == 2
+        assert bad.stats.ejected
+        assert bad.stats.ejections == 1
+        assert bad.stats.error_rate > 0
+        assert good.stats.requests == 3
+        assert router.healthy_deployments() == [good]
+
+    def test_all_ejected_falls_back_to_earliest_recovery(self):
+        a, b = Deployment(api_base="http://a"), Deployment(api_base="http://b")
+        a.stats.ejected_until = 1e12
+        b.stats.ejected_until = 1e11
+        router = LatencyRouter([a, b])
+
+        assert router.select({}) is b
+
+    @pytest.mark.asyncio
+    async def test_stream_holds_in_flight_until_consumed(self):
+        deployment = Deployment(api_base="http://a")
+        router = LatencyRouter([deployment])
+        model = LiteLLMModel(model_name="gpt-4", router=router)
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', _Backends({})):
+            async with model.request_stream(make_messages(), None, make_params()) as stream:
+                assert deployment.stats.in_flight == 1
+                async for _ in stream:
+                    pass
+
+        assert deployment.stats.in_flight == 0
+        assert deployment.stats.ewma_first_chunk_latency is not None
+        assert deployment.stats.ewma_latency is None
+
+    def test_requires_deployments(self):
+        with pytest.raises(ValueError):
+            LatencyRouter([])
+
+
+def _conversation(first_message: str, system: str = "You are helpful.") -> dict:
+    return {
+        'model': "llama",
+        'messages': [
+            {'role': 'system', 'content': system},
+            {'role': 'user', 'content': first_message},
+            {'role': 'assistant', 'content': "..."},
+        ],
+        'tools': [{'type': 'function', 'function': {'name': 'search', 'parameters': {}}}],
+    }
+
+
+class TestAffinityRouter:
+    def test_conversation_sticks_to_one_deployment(self):
+        router = AffinityRouter([Deployment(api_base=f"http://node-{i}") for i in range(4)])
+        kwargs = _conversation("Plan my trip")
+        chosen = router.select(kwargs)
+
+        # Later turns append messages but keep the same start.
+        kwargs['messages'].append({'role': 'user', 'content': "And the hotel?"})
+        assert router.select(kwargs) is chosen
+
+    def test_conversations_spread_across_deployments(self):
+        deployments = [Deployment(api_base=f"http://node-{i}") for i in range(4)]
+        router = AffinityRouter(deployments)
+
+        chosen = {router.select(_conversation(f"question {i}")).name for i in range(200)}
+
+        assert chosen == {d.name for d in deployments}
+
+    def test_prefix_key_groups_conversations_with_the_same_prompt(self):
+        router = AffinityRouter([Deployment(api_base=f"http://node-{i}") for i in range(4)], key='prefix')
+
+        assert len({router.select(_conversation(f"question {i}")).name for i in range(50)}) == 1
+
+    def test_adding_a_deployment_moves_a_minimal_share(self):
+        deployments = [Deployment(api_base=f"http://node-{i}") for i in range(4)]
+        before = AffinityRouter(deployments)
+        after = AffinityRouter([*deployments, Deployment(api_base="http://node-4")])
+
+        conversations = [_conversation(f"question {i}") for i in range(1000)]
+        moved = [before.select(c).name != after.select(c).name for c in conversations]
+
+        # Ideally 1/5 of the conversations move, all of them to the new node.
+        assert 0.1 < sum(moved) / len(moved) < 0.3
+        assert all(after.select(c).name == "http://node-4" for c, m in zip(conversations, moved) if m)
+
+    def test_ejected_deployment_falls_back_to_next_ranked(self):
+        router = AffinityRouter([Deployment(api_base=f"http://node-{i}") for i in range(3)])
+        kwargs = _conversation("Plan my trip")
+        first, second, _ = router.ranking(kwargs)
+
+        first.stats.ejected_until = 1e12
+
+        assert router.select(kwargs) is second
+
+    def test_weight_increases_share(self):
+        light, heavy = Deployment(api_base="http://light"), Deployment(api_base="http://heavy", weight=3)
+        router = AffinityRouter([light, heavy])
+
+        share = sum(router.select(_conversation(f"question {i}")) is heavy for i in range(1000)) / 1000
+
+        assert 0.65 < share < 0.85
+
+    def test_digest_is_cached_per_prompt_and_tool_schemas(self):
+        router = AffinityRouter([Deployment(api_base=f"http://node-{i}") for i in range(4)])
+        kwargs = _conversation("Plan my trip")
+        key = router.affinity_key(kwargs)
+
+        with patch('pydantic_ai_litellm.routing.json.dumps', wraps=json.dumps) as dumps:
+            kwargs['messages'].append({'role': 'user', 'content': "And the hotel?"})
+            assert router.affinity_key(kwargs) == key
+            # An equal but distinct schema object may belong to a changed tool, so it's serialized again.
+            kwargs['tools'] = [{'type': 'function', 'function': {'name': 'search', 'parameters': {}}}]
+            router.affinity_key(kwargs)
+
+        assert dumps.call_count == 1
+        assert router.affinity_key(_conversation("Plan my trip", system="Be brief.")) != key
+
+    def test_requires_distinct_names(self):
+        with pytest.raises(ValueError):
+            AffinityRouter([Deployment(api_base="http://a"), Deployment(api_base="http://a")])
+
+    @pytest.mark.asyncio
+    async def test_agent_turns_hit_the_same_backend(self):
+        router = AffinityRouter([Deployment(api_base=f"http://node-{i}") for i in range(4)])
+        backends = _Backends({})
+        model = LiteLLMModel(model_name="gpt-4", router=router)
+        messages = make_messages()
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', backends):
+            response = await model.request(messages, None, make_params())
+            messages = [*messages, response, ModelRequest([UserPromptPart("Tell me more")])]
+            await model.request(messages, None, make_params())
+
+        assert backends.calls[0]['api_base'] == backends.calls[1]['api_base']
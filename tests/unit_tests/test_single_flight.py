@@ -0,0 +1,147 @@
+"""Tests for single-flight coalescing of identical in-flight requests."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from pydantic_ai import Agent
+from pydantic_ai.messages import TextPart
+
+from pydantic_ai_litellm import LiteLLMModel, SingleFlight
+
+from helpers import make_messages, make_params, make_response
+
+_PROMPT = "Summarize the dashboard"
+
+
+class _SlowCompletion:
+    """Stand-in for `acompletion` that blocks until released, counting calls and cancellations."""
+
+    def __init__(self):
+        self.calls = 0
+        self.cancelled = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self, **kwargs):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return make_response(kwargs['messages'][-1]['content'])
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_identical_concurrent_requests_share_one_call(self):
+        completion = _SlowCompletion()
+        single_flight = SingleFlight()
+        model = LiteLLMModel(model_name="gpt-4", single_flight=single_flight)
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', completion):
+            tasks = [asyncio.create_task(model.request(make_messages(_PROMPT), None, make_params())) for _ in range(5)]
+            await asyncio.sleep(0)
+            assert single_flight.in_flight == 1
+            completion.release.set()
+            responses = await asyncio.gather(*tasks)
+
+        assert completion.calls == 1
+        assert (single_flight.calls, single_flight.coalesced, single_flight.in_flight) == (1, 4, 0)
+        assert all(r.parts == [TextPart(_PROMPT)] for r in responses)
+        assert len({id(r) for r in responses}) == 5
+
+    @pytest.mark.asyncio
+    async def test_different_requests_are_not_coalesced(self):
+        completion = _SlowCompletion()
+        completion.release.set()
+        model = LiteLLMModel(model_name="gpt-4", single_flight=SingleFlight())
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', completion):
+            a, b = await asyncio.gather(
+                model.request(make_messages("a"), None, make_params()),
+                model.request(make_messages("b"), None, make_params()),
+            )
+
+        assert completion.calls == 2
+        assert a.parts == [TextPart("a")]
+        assert b.parts == [TextPart("b")]
+
+    @pytest.mark.asyncio
+    async def test_cancelling_one_waiter_keeps_shared_call(self):
+        completion = _SlowCompletion()
+        model = LiteLLMModel(model_name="gpt-4", single_flight=SingleFlight())
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', completion):
+            first = asyncio.create_task(model.request(make_messages(_PROMPT), None, make_params()))
+            second = asyncio.create_task(model.request(make_messages(_PROMPT), None, make_params()))
+            await asyncio.sleep(0)
+            first.cancel()
+            await asyncio.sleep(0)
+            completion.release.set()
+            response = await second
+
+        assert first.cancelled()
+        assert completion.cancelled == 0
+        assert response.parts == [TextPart(_PROMPT)]
+
+    @pytest.mark.asyncio
+    async def test_cancelling_all_waiters_cancels_shared_call(self):
+        completion = _SlowCompletion()
+        single_flight = SingleFlight()
+        model = LiteLLMModel(model_name="gpt-4", single_flight=single_flight)
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', completion):
+            tasks = [asyncio.create_task(model.request(make_messages(_PROMPT), None, make_params())) for _ in range(2)]
+            await asyncio.sleep(0)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.sleep(0)
+
+        assert completion.cancelled == 1
+        assert single_flight.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_are_shared_with_all_waiters(self):
+        async def failing_completion(**kwargs):
+            await asyncio.sleep(0)
+            raise ValueError("boom")
+
+        model = LiteLLMModel(model_name="gpt-4", single_flight=SingleFlight())
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', failing_completion):
+            results = await asyncio.gather(
+                *(model.request(make_messages(_PROMPT), None, make_params()) for _ in range(3)), return_exceptions=True
+            )
+
+        assert all(isinstance(r, ValueError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_coalesced_agent_runs_keep_their_own_run_ids(self):
+        completion = _SlowCompletion()
+        agent = Agent(LiteLLMModel(model_name="gpt-4", single_flight=SingleFlight()))
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', completion):
+            tasks = [asyncio.create_task(agent.run(_PROMPT)) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            completion.release.set()
+            results = await asyncio.gather(*tasks)
+
+        assert completion.calls == 1
+        assert [r.all_messages()[-1].run_id for r in results] == [r.run_id for r in results]
+
+    @pytest.mark.asyncio
+    async def test_requests_with_different_api_keys_are_not_coalesced(self):
+        completion = _SlowCompletion()
+        single_flight = SingleFlight()
+        models = [LiteLLMModel(model_name="gpt-4", api_key=key, single_flight=single_flight) for key in ("a", "b")]
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', completion):
+            tasks = [asyncio.create_task(m.request(make_messages(_PROMPT), None, make_params())) for m in models]
+            await asyncio.sleep(0)
+            completion.release.set()
+            await asyncio.gather(*tasks)
+
+        assert completion.calls == 2
+        assert single_flight.coalesced == 0
@@ -0,0 +1,181 @@
+"""Tests for stream cancellation and first-chunk / idle-chunk timeouts."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from pydantic_ai_litellm import LiteLLMModel, LiteLLMStreamTimeoutError, RateLimiter, RetryPolicy
+
+from helpers import make_chunk, make_messages, make_params
+
+
+class _Stream:
+    """A stand-in for LiteLLM's stream wrapper: closing it fails a pending read, like a closed connection."""
+
+    def __init__(
+        self,
+        *contents: str,
+        stall_at: int | None = None,
+        first_delay: float = 0.0,
+        closed_error: Exception | None = None,
+    ):
+        self._chunks = [make_chunk(content) for content in contents]
+        self._stall_at = stall_at
+        self._first_delay = first_delay
+        self._closed_error = closed_error or ConnectionResetError('connection closed')
+        self._index = 0
+        self._closed = asyncio.Event()
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._index == 0 and self._first_delay:
+            await asyncio.sleep(self._first_delay)
+        if self._index == self._stall_at:
+            await self._closed.wait()
+            raise self._closed_error
+        if self.closed or self._index >= len(self._chunks):
+            raise StopAsyncIteration
+        self._index += 1
+        return self._chunks[self._index - 1]
+
+    async def aclose(self):
+        self.closed = True
+        self._closed.set()
+
+
+class TestStreamTimeouts:
+    @pytest.mark.asyncio
+    async def test_first_chunk_timeout(self):
+        stream = _Stream("a", first_delay=1.0)
+        model = LiteLLMModel("gpt-4o")
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', AsyncMock(return_value=stream)):
+            with pytest.raises(LiteLLMStreamTimeoutError) as exc_info:
+                async with model.request_stream(make_messages(), {'litellm_first_chunk_timeout': 0.05}, make_params()):
+                    pass
+
+        assert exc_info.value.stage == 'first_chunk'
+        assert exc_info.value.status_code == 408
+        assert stream.closed
+
+    @pytest.mark.asyncio
+    async def test_first_chunk_timeout_is_retried(self):
+        stalled, healthy = _Stream("a", first_delay=1.0), _Stream("b")
+        model = LiteLLMModel("gpt-4o", retry_policy=RetryPolicy(initial_delay=0, jitter=False))
+        mock = AsyncMock(side_effect=[stalled, healthy])
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', mock):
+            async with model.request_stream(make_messages(), {'litellm_first_chunk_timeout': 0.05}, make_params()) as s:
+                async for _ in s:
+                    pass
+
+        assert s.get().parts[0].content == "b"
+        assert stalled.closed
+
+    @pytest.mark.asyncio
+    async def test_idle_chunk_timeout(self):
+        stream = _Stream("a", "b", "c", stall_at=2)
+        model = LiteLLMModel("gpt-4o")
+        received = []
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', AsyncMock(return_value=stream)):
+            with pytest.raises(LiteLLMStreamTimeoutError) as exc_info:
+                async with model.request_stream(make_messages(), {'litellm_chunk_timeout': 0.05}, make_params()) as s:
+                    async for event in s:
+                        received.append(event)
+
+        assert exc_info.value.stage == 'next_chunk'
+        assert received
+        assert stream.closed
+
+    @pytest.mark.asyncio
+    async def test_outside_cancellation_is_not_a_timeout(self):
+        stream = _Stream("a", stall_at=1)
+        model = LiteLLMModel("gpt-4o")
+
+        async def consume():
+            async with model.request_stream(make_messages(), {'litellm_chunk_timeout': 10}, make_params()) as s:
+                async for _ in s:
+                    pass
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', AsyncMock(return_value=stream)):
+            task = asyncio.create_task(consume())
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert stream.closed
+
+
+class TestStreamCancellation:
+    @pytest.mark.asyncio
+    async def test_early_exit_closes_upstream(self):
+        stream = _Stream("a", "b", "c")
+        model = LiteLLMModel("gpt-4o", rate_limiter=RateLimiter(max_concurrency=1))
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', AsyncMock(return_value=stream)):
+            async with model.request_stream(make_messages(), None, make_params()) as s:
+                async for _ in s:
+                    break
+
+        assert stream.closed
+
+    @pytest.mark.asyncio
+    async def test_cancel_aborts_pending_read(self):
+        stream = _Stream("a", stall_at=1)
+        model = LiteLLMModel("gpt-4o")
+        first_event = asyncio.Event()
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', AsyncMock(return_value=stream)):
+            async with model.request_stream(make_messages(), None, make_params()) as s:
+
+                async def consume():
+                    async for _ in s:
+                        first_event.set()
+
+                task = asyncio.create_task(consume())
+                await first_event.wait()
+                await asyncio.sleep(0.01)
+                await s.cancel()
+                await asyncio.wait_for(task, 1)
+
+        assert stream.closed
+        assert s.get().state == 'interrupted'
+
+    @pytest.mark.asyncio
+    async def test_cancel_does_not_hide_other_errors(self):
+        stream = _Stream("a", stall_at=1, closed_error=ValueError('bad chunk'))
+        model = LiteLLMModel("gpt-4o")
+        first_event = asyncio.Event()
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', AsyncMock(return_value=stream)):
+            async with model.request_stream(make_messages(), None, make_params()) as s:
+
+                async def consume():
+                    async for _ in s:
+                        first_event.set()
+
+                task = asyncio.create_task(consume())
+                await first_event.wait()
+                await s.cancel()
+                with pytest.raises(ValueError, match='bad chunk'):
+                    await asyncio.wait_for(task, 1)
+
+    @pytest.mark.asyncio
+    async def test_cancel_before_reading(self):
+        stream = _Stream("a", "b")
+        model = LiteLLMModel("gpt-4o", stream_read_ahead=4)
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', AsyncMock(return_value=stream)):
+            async with model.request_stream(make_messages(), None, make_params()) as s:
+                await s.cancel()
+                async for _ in s:
+                    pass
+
+        assert stream.closed
+        assert s.cancelled
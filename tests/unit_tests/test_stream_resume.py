@@ -0,0 +1,151 @@
+"""Tests for resuming streams that fail part-way."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from pydantic_ai.messages import PartDeltaEvent, PartStartEvent, TextPart, TextPartDelta
+
+from pydantic_ai_litellm import LiteLLMConnectionError, LiteLLMModel, StreamResume
+
+from helpers import make_chunk, make_messages, make_params, make_tool_call
+
+
+def _tool_call_chunk(arguments: str) -> Mock:
+    return make_chunk(tool_calls=[make_tool_call(arguments, tool_call_id="call_1", name="get_weather")])
+
+
+class _Stream:
+    """A stand-in for LiteLLM's stream wrapper whose connection drops, or stalls, after some chunks."""
+
+    def __init__(self, *chunks: Mock, fail_at: int | None = None, stall_at: int | None = None):
+        self._chunks = list(chunks)
+        self._fail_at = fail_at
+        self._stall_at = stall_at
+        self._index = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._index == self._stall_at:
+            await asyncio.sleep(1)
+        if self._index == self._fail_at:
+            raise ConnectionResetError('connection reset by peer')
+        if self._index >= len(self._chunks):
+            raise StopAsyncIteration
+        self._index += 1
+        return self._chunks[self._index - 1]
+
+    async def aclose(self):
+        self.closed = True
+
+
+async def _stream_text(model: LiteLLMModel, settings: dict | None = None) -> tuple[list[str], object]:
+    deltas = []
+    async with model.request_stream(make_messages("What is the capital of France?"), settings, make_params()) as s:
+        async for event in s:
+            if isinstance(event, PartStartEvent) and isinstance(event.part, TextPart):
+                deltas.append(event.part.content)
+            elif isinstance(event, PartDeltaEvent) and isinstance(event.delta, TextPartDelta):
+                deltas.append(event.delta.content_delta)
+    return deltas, s
+
+
+class TestStreamResume:
+    @pytest.mark.asyncio
+    async def test_resumes_with_prefill(self):
+        failing = _Stream(make_chunk("The capital"), make_chunk(" of Fra"), fail_at=2)
+        resumed = _Stream(make_chunk("nce is"), make_chunk(" Paris."))
+        model = LiteLLMModel("anthropic/claude-sonnet-4-20250514", stream_resume=StreamResume())
+        mock = AsyncMock(side_effect=[failing, resumed])
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', mock):
+            deltas, s = await _stream_text(model)
+
+        response = s.get()
+        assert deltas == ["The capital", " of Fra", "nce is", " Paris."]
+        assert len(response.parts) == 1
+        assert response.parts[0].content == "The capital of France is Paris."
+        assert response.usage.details['stream_resumes'] == 1
+        assert mock.await_args_list[1].kwargs['messages'][-1] == {
+            'role': 'assistant',
+            'content': 'The capital of Fra',
+            'prefix': True,
+        }
+        assert failing.closed and resumed.closed
+
+    @pytest.mark.asyncio
+    async def test_continuation_prompt_drops_repeated_text(self):
+        failing = _Stream(make_chunk("The capital"), make_chunk(" of Fra"), fail_at=2)
+        resumed = _Stream(make_chunk("The capital of "), make_chunk("France"), make_chunk(" is Paris."))
+        model = LiteLLMModel("gpt-4o", stream_resume=StreamResume(continuation_prompt="Go on."))
+        mock = AsyncMock(side_effect=[failing, resumed])
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', mock):
+            _, s = await _stream_text(model)
+
+        assert s.get().parts[0].content == "The capital of France is Paris."
+        assert mock.await_args_list[1].kwargs['messages'][-2:] == [
+            {'role': 'assistant', 'content': 'The capital of Fra'},
+            {'role': 'user', 'content': 'Go on.'},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_short_coincidental_overlap_is_kept(self):
+        failing = _Stream(make_chunk("I think the"), fail_at=1)
+        resumed = _Stream(make_chunk(" answer is"), make_chunk(" Paris."))
+        model = LiteLLMModel("gpt-4o", stream_resume=StreamResume(prefill=False))
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', AsyncMock(side_effect=[failing, resumed])):
+            _, s = await _stream_text(model)
+
+        assert s.get().parts[0].content == "I think the answer is Paris."
+
+    @pytest.mark.asyncio
+    async def test_stalled_stream_is_resumed(self):
+        stalled = _Stream(make_chunk("Paris"), stall_at=1)
+        resumed = _Stream(make_chunk(" is the capital."))
+        model = LiteLLMModel("gpt-4o", stream_resume=StreamResume(prefill=True))
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', AsyncMock(side_effect=[stalled, resumed])):
+            _, s = await _stream_text(model, {'litellm_chunk_timeout': 0.05})
+
+        assert s.get().parts[0].content == "Paris is the capital."
+        assert s.get().usage.details['stream_resumes'] == 1
+        assert stalled.closed
+
+    @pytest.mark.asyncio
+    async def test_tool_calls_are_not_resumed(self):
+        failing = _Stream(_tool_call_chunk('{"city": "Par'), fail_at=1)
+        model = LiteLLMModel("gpt-4o", stream_resume=StreamResume(prefill=True))
+        mock = AsyncMock(side_effect=[failing])
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', mock):
+            with pytest.raises(LiteLLMConnectionError):
+                await _stream_text(model)
+
+        assert mock.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_resumes(self):
+        streams = [_Stream(make_chunk("a"), fail_at=1) for _ in range(2)]
+        model = LiteLLMModel("gpt-4o", stream_resume=StreamResume(max_resumes=1, prefill=True))
+        mock = AsyncMock(side_effect=streams)
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', mock):
+            with pytest.raises(LiteLLMConnectionError):
+                await _stream_text(model)
+
+        assert mock.await_count == 2
+        assert all(stream.closed for stream in streams)
+
+    @pytest.mark.asyncio
+    async def test_without_stream_resume_the_error_propagates(self):
+        failing = _Stream(make_chunk("a"), fail_at=1)
+        model = LiteLLMModel("gpt-4o")
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', AsyncMock(return_value=failing)):
+            with pytest.raises(LiteLLMConnectionError):
+                await _stream_text(model)
@@ -0,0 +1,109 @@
+"""Tests for native (JSON schema) and prompted structured output."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from pydantic import BaseModel
+from pydantic_ai import Agent, NativeOutput, PromptedOutput
+from pydantic_ai.exceptions import UserError
+from pydantic_ai.profiles import ModelProfile
+
+from pydantic_ai_litellm import LiteLLMModel
+
+from helpers import make_chunk, make_response, make_stream, make_tool_call
+
+_PERSON = '{"name": "Ada", "age": 36}'
+
+
+class Person(BaseModel):
+    name: str
+    age: int
+
+
+def _vllm() -> LiteLLMModel:
+    return LiteLLMModel("hosted_vllm/llama-3", api_base="http://vllm:8000/v1")
+
+
+class TestModelProfile:
+    def test_capabilities_come_from_litellm(self):
+        assert LiteLLMModel("gpt-4o").profile.supports_json_schema_output
+        vllm = _vllm().profile
+        assert not vllm.supports_json_schema_output
+        assert vllm.supports_json_object_output
+
+    def test_unknown_model_supports_neither(self):
+        profile = LiteLLMModel("not-a-real-model").profile
+        assert not profile.supports_json_schema_output
+        assert not profile.supports_json_object_output
+
+    def test_explicit_profile(self):
+        model = LiteLLMModel("hosted_vllm/llama-3", profile=ModelProfile(supports_json_schema_output=True))
+        assert model.profile.supports_json_schema_output
+
+
+class TestStructuredOutput:
+    @pytest.mark.asyncio
+    async def test_native_output(self):
+        agent = Agent(LiteLLMModel("gpt-4o"), output_type=NativeOutput(Person, description="A person"))
+        mock = AsyncMock(return_value=make_response(_PERSON))
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', mock):
+            result = await agent.run("Who wrote the first program?")
+
+        assert result.output == Person(name="Ada", age=36)
+        kwargs = mock.await_args.kwargs
+        assert 'tools' not in kwargs
+        assert kwargs['response_format']['type'] == 'json_schema'
+        json_schema = kwargs['response_format']['json_schema']
+        assert json_schema['name'] == 'Person'
+        assert json_schema['description'] == 'A person'
+        assert json_schema['schema']['required'] == ['name', 'age']
+
+    @pytest.mark.asyncio
+    async def test_native_output_streamed(self):
+        agent = Agent(LiteLLMModel("gpt-4o"), output_type=NativeOutput(Person))
+        mock = AsyncMock(return_value=make_stream(*map(make_chunk, ['{"name": "A', 'da", "age"', ': 36}'])))
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', mock):
+            async with agent.run_stream("Who wrote the first program?") as result:
+                partials = [output async for output in result.stream_output(debounce_by=None)]
+
+        assert partials[-1] == Person(name="Ada", age=36)
+        assert mock.await_args.kwargs['response_format']['type'] == 'json_schema'
+
+    @pytest.mark.asyncio
+    async def test_prompted_output_uses_json_mode(self):
+        agent = Agent(_vllm(), output_type=PromptedOutput(Person))
+        mock = AsyncMock(return_value=make_response(_PERSON))
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', mock):
+            result = await agent.run("Who wrote the first program?")
+
+        assert result.output == Person(name="Ada", age=36)
+        kwargs = mock.await_args.kwargs
+        assert kwargs['response_format'] == {'type': 'json_object'}
+        system = [m['content'] for m in kwargs['messages'] if m['role'] == 'system']
+        assert any('"required": ["name", "age"]' in content for content in system)
+
+    @pytest.mark.asyncio
+    async def test_native_output_unsupported(self):
+        agent = Agent(_vllm(), output_type=NativeOutput(Person))
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', AsyncMock()) as mock:
+            with pytest.raises(UserError, match='Native structured output is not supported'):
+                await agent.run("Who wrote the first program?")
+
+        mock.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_tool_output_is_unchanged(self):
+        agent = Agent(LiteLLMModel("gpt-4o"), output_type=Person)
+        tool_call = make_tool_call(_PERSON, tool_call_id="call_1", name="final_result")
+        response = make_response(None, tool_calls=[tool_call])
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', AsyncMock(return_value=response)) as mock:
+            result = await agent.run("Who wrote the first program?")
+
+        assert result.output == Person(name="Ada", age=36)
+        assert 'response_format' not in mock.await_args.kwargs
+        assert mock.await_args.kwargs['tool_choice'] == 'required'
@@ -0,0 +1,112 @@
+"""Tests for OpenTelemetry spans and metrics."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import StatusCode
+
+from pydantic_ai_litellm import LiteLLMModel, RateLimiter, Telemetry
+
+from helpers import make_chunk, make_messages, make_params, make_response, make_stream
+
+
+def _usage() -> SimpleNamespace:
+    return SimpleNamespace(prompt_tokens=10, completion_tokens=20)
+
+
+class _Recorder:
+    def __init__(self):
+        self.spans = InMemorySpanExporter()
+        tracer_provider = TracerProvider()
+        tracer_provider.add_span_processor(SimpleSpanProcessor(self.spans))
+        self.metrics = InMemoryMetricReader()
+        self.telemetry = Telemetry(
+            tracer_provider=tracer_provider, meter_provider=MeterProvider(metric_readers=[self.metrics])
+        )
+
+    def histograms(self) -> dict:
+        data = self.metrics.get_metrics_data()
+        return {
+            metric.name: metric.data.data_points[0]
+            for resource_metrics in data.resource_metrics
+            for scope_metrics in resource_metrics.scope_metrics
+            for metric in scope_metrics.metrics
+        }
+
+
+class TestTelemetry:
+    @pytest.mark.asyncio
+    async def test_request_span_and_metrics(self):
+        recorder = _Recorder()
+        model = LiteLLMModel("gpt-4o", api_base="http://a", telemetry=recorder.telemetry)
+
+        completion = AsyncMock(return_value=make_response(usage=_usage()))
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', completion):
+            await model.request(make_messages(), None, make_params())
+
+        [span] = recorder.spans.get_finished_spans()
+        assert span.name == 'chat gpt-4o'
+        assert span.attributes['litellm.api_base'] == 'http://a'
+        assert span.attributes['gen_ai.usage.input_tokens'] == 10
+        assert span.attributes['gen_ai.usage.output_tokens'] == 20
+        histograms = recorder.histograms()
+        assert histograms['litellm.client.request.duration'].count == 1
+        assert histograms['litellm.client.request.duration'].attributes['gen_ai.request.model'] == 'gpt-4o'
+        assert histograms['litellm.client.output_tokens_per_second'].count == 1
+        assert 'litellm.client.time_to_first_chunk' not in histograms
+
+    @pytest.mark.asyncio
+    async def test_stream_metrics(self):
+        recorder = _Recorder()
+        limiter = RateLimiter(max_concurrency=1)
+        model = LiteLLMModel(
+            "anthropic/claude-sonnet-4", telemetry=recorder.telemetry, rate_limiter=limiter
+        )
+        chunks = make_stream(make_chunk("a"), make_chunk("b"), make_chunk("c"), make_chunk(None, usage=_usage()))
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', AsyncMock(return_value=chunks)):
+            async with model.request_stream(make_messages(), None, make_params()) as stream:
+                async for _ in stream:
+                    pass
+
+        [span] = recorder.spans.get_finished_spans()
+        assert span.name == 'chat.stream anthropic/claude-sonnet-4'
+        assert span.attributes['litellm.provider'] == 'anthropic'
+        assert span.attributes['gen_ai.usage.output_tokens'] == 20
+        histograms = recorder.histograms()
+        assert histograms['litellm.client.queue_wait'].count == 1
+        assert histograms['litellm.client.time_to_first_chunk'].count == 1
+        assert histograms['litellm.client.inter_chunk_gap'].count == 3
+        assert histograms['litellm.client.request.duration'].count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_request_marks_span(self):
+        recorder = _Recorder()
+        model = LiteLLMModel("gpt-4o", telemetry=recorder.telemetry)
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', AsyncMock(side_effect=ValueError("bad"))):
+            with pytest.raises(ValueError):
+                await model.request(make_messages(), None, make_params())
+
+        [span] = recorder.spans.get_finished_spans()
+        assert span.status.status_code == StatusCode.ERROR
+        assert 'gen_ai.usage.output_tokens' not in span.attributes
+        assert recorder.histograms()['litellm.client.request.duration'].count == 1
+
+    @pytest.mark.asyncio
+    async def test_abandoned_stream_ends_span(self):
+        recorder = _Recorder()
+        model = LiteLLMModel("gpt-4o", telemetry=recorder.telemetry)
+
+        completion = AsyncMock(return_value=make_stream(make_chunk("a")))
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', completion):
+            async with model.request_stream(make_messages(), None, make_params()):
+                pass
+
+        assert len(recorder.spans.get_finished_spans()) == 1
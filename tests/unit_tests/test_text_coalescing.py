@@ -0,0 +1,117 @@
+"""Tests for coalescing streamed text deltas."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from unittest.mock import Mock
+
+import pytest
+from pydantic_ai.messages import PartDeltaEvent, PartStartEvent, TextPart, ToolCallPart
+
+from pydantic_ai_litellm import LiteLLMModel, TextCoalescing
+
+from helpers import make_chunk, make_params, make_tool_call
+
+
+async def _chunks(*items, pause: float = 0, pause_after: int | None = None) -> AsyncIterator[Mock]:
+    for i, item in enumerate(items):
+        if pause_after is not None and i == pause_after:
+            await asyncio.sleep(pause)
+        yield item
+
+
+def _text_events(events: list) -> list[str]:
+    texts = []
+    for event in events:
+        if isinstance(event, PartStartEvent) and isinstance(event.part, TextPart):
+            texts.append(event.part.content)
+        elif isinstance(event, PartDeltaEvent) and hasattr(event.delta, 'content_delta'):
+            texts.append(event.delta.content_delta)
+    return texts
+
+
+class TestTextCoalescing:
+    @pytest.mark.asyncio
+    async def test_merges_deltas_up_to_max_chars(self):
+        model = LiteLLMModel(model_name="gpt-4", text_coalescing=TextCoalescing(max_chars=6, max_delay=60))
+        chunks = _chunks(*(make_chunk(c) for c in "Hello, world!"))
+
+        streamed = await model._process_streamed_response(chunks, make_params())
+        events = [event async for event in streamed]
+
+        assert _text_events(events) == ["Hello,", " world", "!"]
+        assert streamed.get().parts == [TextPart("Hello, world!")]
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        model = LiteLLMModel(model_name="gpt-4")
+        streamed = await model._process_streamed_response(_chunks(*(make_chunk(c) for c in "Hi!")), make_params())
+
+        assert _text_events([event async for event in streamed]) == ["H", "i", "!"]
+
+    @pytest.mark.asyncio
+    async def test_flushes_after_max_delay_while_waiting(self):
+        model = LiteLLMModel(model_name="gpt-4", text_coalescing=TextCoalescing(max_chars=100, max_delay=0.01))
+        chunks = _chunks(make_chunk("Hel"), make_chunk("lo"), make_chunk(" again"), pause=0.2, pause_after=2)
+
+        streamed = await model._process_streamed_response(chunks, make_params())
+        loop = asyncio.get_running_loop()
+        timed = [(loop.time(), event) async for event in streamed]
+
+        assert _text_events([event for _, event in timed]) == ["Hello", " again"]
+        # "Hello" was emitted before the stalled chunk arrived.
+        assert timed[-1][0] - timed[0][0] > 0.1
+
+    @pytest.mark.asyncio
+    async def test_tool_calls_flush_text_and_keep_order(self):
+        model = LiteLLMModel(model_name="gpt-4", text_coalescing=TextCoalescing(max_chars=100, max_delay=60))
+        chunks = _chunks(
+            make_chunk("Let me "),
+            make_chunk("check."),
+            make_chunk(tool_calls=[make_tool_call('{"city":', tool_call_id="call_1", name="get_weather")]),
+            make_chunk(tool_calls=[make_tool_call(' "Paris"}')]),
+            make_chunk(None, usage=Mock(prompt_tokens=10, completion_tokens=5)),
+        )
+
+        streamed = await model._process_streamed_response(chunks, make_params())
+        events = [event async for event in streamed]
+
+        starts = [e.part for e in events if isinstance(e, PartStartEvent)]
+        assert isinstance(starts[0], TextPart) and starts[0].content == "Let me check."
+        assert isinstance(starts[1], ToolCallPart)
+        response = streamed.get()
+        assert response.parts[1].args == '{"city": "Paris"}'
+        assert response.usage.input_tokens == 10
+
+    @pytest.mark.asyncio
+    async def test_closing_early_cancels_pending_read(self):
+        closed = []
+
+        async def slow_chunks():
+            try:
+                yield make_chunk("Hi")
+                await asyncio.sleep(10)
+                yield make_chunk(" there")
+            finally:
+                closed.append(True)
+
+        model = LiteLLMModel(model_name="gpt-4", text_coalescing=TextCoalescing(max_chars=100, max_delay=0.01))
+        streamed = await model._process_streamed_response(slow_chunks(), make_params())
+        iterator = streamed._iter_chunk_events()
+
+        await asyncio.wait_for(anext(iterator), 1)
+        await iterator.aclose()
+
+        assert closed == [True]
+
+    @pytest.mark.asyncio
+    async def test_stream_errors_propagate(self):
+        async def failing_chunks():
+            yield make_chunk("Hi")
+            raise ConnectionError("connection reset")
+
+        model = LiteLLMModel(model_name="gpt-4", text_coalescing=TextCoalescing())
+        streamed = await model._process_streamed_response(failing_chunks(), make_params())
+
+        with pytest.raises(ConnectionError):
+            async for _ in streamed:
+                pass
@@ -0,0 +1,99 @@
+"""Tests for the memoized tool definition payloads used by `_get_tools`."""
+
+from dataclasses import replace
+
+from pydantic_ai.models import ModelRequestParameters
+from pydantic_ai.tools import ToolDefinition
+
+from pydantic_ai_litellm import LiteLLMModel
+
+from helpers import make_params
+
+
+def _tool(name: str = "calculator", description: str = "Do maths") -> ToolDefinition:
+    return ToolDefinition(
+        name=name,
+        description=description,
+        parameters_json_schema={
+            "type": "object",
+            "properties": {"a": {"type": "number"}, "b": {"type": "number"}},
+        },
+    )
+
+
+class TestToolCache:
+    def setup_method(self):
+        self.model = LiteLLMModel(model_name="gpt-4", api_key="test-key")
+
+    def test_same_tool_definition_is_reused(self):
+        tool = _tool()
+        first = self.model._get_tools(make_params(tool))
+        second = self.model._get_tools(make_params(tool))
+
+        assert first[0] is second[0]
+        assert first is not second
+        info = self.model.tool_cache_info
+        assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+    def test_rebuilt_tool_definitions_share_payload(self):
+        """pydantic-ai builds new tool definitions on every step, around the same schema dict."""
+        tool = _tool()
+        first = self.model._get_tools(make_params(tool))
+        second = self.model._get_tools(make_params(replace(tool)))
+
+        assert first[0] is second[0]
+        assert self.model.tool_cache_info.hits == 1
+
+    def test_equal_schema_in_a_new_dict_is_remapped(self):
+        first = self.model._get_tools(make_params(_tool()))
+        second = self.model._get_tools(make_params(_tool()))
+
+        assert first[0] == second[0]
+        assert self.model.tool_cache_info.misses == 2
+
+    def test_changed_tool_definition_is_remapped(self):
+        tool = _tool()
+        first = self.model._get_tools(make_params(tool))
+        tool.description = "Do more maths"
+        second = self.model._get_tools(make_params(tool))
+
+        assert second[0]['function']['description'] == "Do more maths"
+        assert first[0]['function']['description'] == "Do maths"
+        assert self.model.tool_cache_info.misses == 2
+
+    def test_output_tools_are_included(self):
+        params = ModelRequestParameters(
+            function_tools=[_tool("a")], output_tools=[_tool("final_result")], allow_text_output=False
+        )
+
+        tools = self.model._get_tools(params)
+
+        assert [t['function']['name'] for t in tools] == ["a", "final_result"]
+
+    def test_least_recently_used_tool_is_evicted(self):
+        model = LiteLLMModel(model_name="gpt-4", api_key="test-key", tool_cache_size=2)
+        a, b, c = _tool("a"), _tool("b"), _tool("c")
+        model._get_tools(make_params(a, b))
+        model._get_tools(make_params(a, c))
+        model._get_tools(make_params(b))
+
+        info = model.tool_cache_info
+        assert (info.hits, info.misses, info.currsize) == (1, 4, 2)
+
+    def test_disabled_cache_maps_every_time(self):
+        model = LiteLLMModel(model_name="gpt-4", api_key="test-key", tool_cache_size=0)
+        tool = _tool()
+
+        assert model._get_tools(make_params(tool))[0] is not model._get_tools(make_params(tool))[0]
+        assert model.tool_cache_info.currsize == 0
+
+    def test_stable_tool_set_larger_than_cache_is_reused(self):
+        model = LiteLLMModel(model_name="gpt-4", api_key="test-key", tool_cache_size=4)
+        params = make_params(*(_tool(f"tool_{i}") for i in range(10)))
+
+        first = model._get_tools(params)
+        second = model._get_tools(params)
+
+        assert all(a is b for a, b in zip(first, second))
+        info = model.tool_cache_info
+        assert (info.hits, info.misses, info.currsize) == (10, 10, 4)
@@ -0,0 +1,215 @@
+"""Tests for the direct OpenAI-compatible transport."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from aiohttp import web
+from pydantic_ai.messages import ModelRequest, TextPart, ToolCallPart, UserPromptPart
+
+from pydantic_ai_litellm import (
+    LiteLLMContextWindowExceededError,
+    LiteLLMModel,
+    LiteLLMRateLimitError,
+    LiteLLMTimeoutError,
+    OpenAICompatibleTransport,
+)
+
+from helpers import make_messages, make_params
+
+_PROMPT = "What's the weather in Paris?"
+
+
+_COMPLETION = {
+    'id': 'chatcmpl-1',
+    'object': 'chat.completion',
+    'created': 1_700_000_000,
+    'model': 'llama-3',
+    'choices': [
+        {
+            'index': 0,
+            'message': {
+                'role': 'assistant',
+                'content': 'Let me check.',
+                'tool_calls': [
+                    {
+                        'id': 'call_1',
+                        'type': 'function',
+                        'function': {'name': 'get_weather', 'arguments': '{"city": "Paris"}'},
+                    }
+                ],
+            },
+            'finish_reason': 'tool_calls',
+        }
+    ],
+    'usage': {'prompt_tokens': 12, 'completion_tokens': 7, 'prompt_tokens_details': {'cached_tokens': 4}},
+}
+
+_CHUNKS = [
+    {'choices': [{'index': 0, 'delta': {'role': 'assistant', 'content': 'Let me'}}]},
+    {'choices': [{'index': 0, 'delta': {'content': ' check.'}}]},
+    {
+        'choices': [
+            {
+                'index': 0,
+                'delta': {
+                    'tool_calls': [
+                        {'index': 0, 'id': 'call_1', 'function': {'name': 'get_weather', 'arguments': '{"city": '}}
+                    ]
+                },
+            }
+        ]
+    },
+    {'choices': [{'index': 0, 'delta': {'tool_calls': [{'index': 0, 'function': {'arguments': '"Paris"}'}}]}}]},
+    {'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'tool_calls'}]},
+    {'choices': [], 'usage': {'prompt_tokens': 12, 'completion_tokens': 7}},
+]
+
+
+class _Server:
+    """An OpenAI-compatible endpoint recording the requests it receives."""
+
+    def __init__(self, stall: bool = False):
+        self.requests: list[tuple[dict, dict]] = []
+        self.stall = stall
+        self.released = asyncio.Event()
+        self.runner: web.AppRunner | None = None
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        self.requests.append((body, dict(request.headers)))
+        if body['messages'][-1]['content'] == 'rate limit':
+            return web.json_response({'error': {'message': 'Slow down'}}, status=429, headers={'retry-after': '2'})
+        if body['messages'][-1]['content'] == 'too long':
+            error = {'message': 'Too many tokens', 'code': 'context_length_exceeded'}
+            return web.json_response({'error': error}, status=400)
+        if body['messages'][-1]['content'] == 'slow':
+            await self.released.wait()
+        if not body.get('stream'):
+            return web.json_response(_COMPLETION, headers={'x-ratelimit-remaining-requests': '99'})
+        response = web.StreamResponse(headers={'content-type': 'text/event-stream'})
+        await response.prepare(request)
+        for chunk in _CHUNKS:
+            await response.write(f'data: {json.dumps({"created": 1_700_000_000, **chunk})}\n\n'.encode())
+            if self.stall:
+                await self.released.wait()
+        await response.write(b'data: [DONE]\n\n')
+        return response
+
+    async def __aenter__(self) -> str:
+        app = web.Application()
+        app.router.add_post('/v1/chat/completions', self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        return f'http://127.0.0.1:{self.runner.addresses[0][1]}/v1'
+
+    async def __aexit__(self, *args) -> None:
+        assert self.runner is not None
+        self.released.set()
+        await self.runner.cleanup()
+
+
+class TestOpenAICompatibleTransport:
+    @pytest.mark.asyncio
+    async def test_request(self):
+        server = _Server()
+        async with server as api_base, OpenAICompatibleTransport() as transport:
+            model = LiteLLMModel("hosted_vllm/llama-3", api_base=api_base, api_key="sk-test", transport=transport)
+            response = await model.request(make_messages(_PROMPT), {'temperature': 0.5}, make_params())
+
+        body, headers = server.requests[0]
+        assert body['model'] == 'llama-3'
+        assert body['temperature'] == 0.5
+        assert not {'api_base', 'api_key', 'custom_llm_provider'} & body.keys()
+        assert headers['Authorization'] == 'Bearer sk-test'
+        assert response.parts[0] == TextPart(content='Let me check.')
+        assert isinstance(response.parts[1], ToolCallPart)
+        assert response.parts[1].args == '{"city": "Paris"}'
+        assert response.parts[1].tool_call_id == 'call_1'
+        assert response.usage.input_tokens == 12
+        assert response.usage.output_tokens == 7
+        assert response.usage.cache_read_tokens == 4
+        assert response.provider_response_id == 'chatcmpl-1'
+
+    @pytest.mark.asyncio
+    async def test_stream(self):
+        server = _Server()
+        async with server as api_base, OpenAICompatibleTransport() as transport:
+            model = LiteLLMModel("openai/llama-3", api_base=api_base, transport=transport)
+            async with model.request_stream(make_messages(_PROMPT), None, make_params()) as s:
+                async for _ in s:
+                    pass
+            # The stream was read to the end, so its connection is reused.
+            await model.request(make_messages(_PROMPT), None, make_params())
+            stats = transport.connection_pools.stats(api_base)
+
+        response = s.get()
+        assert server.requests[0][0]['stream_options'] == {'include_usage': True}
+        assert response.parts[0] == TextPart(content='Let me check.')
+        assert isinstance(response.parts[1], ToolCallPart)
+        assert response.parts[1].args == '{"city": "Paris"}'
+        assert response.usage.input_tokens == 12
+        assert response.usage.output_tokens == 7
+        assert stats.connections_created == 1
+        assert stats.connections_reused == 1
+
+    @pytest.mark.asyncio
+    async def test_errors_are_classified(self):
+        server = _Server()
+        async with server as api_base, OpenAICompatibleTransport() as transport:
+            model = LiteLLMModel("hosted_vllm/llama-3", api_base=api_base, transport=transport)
+            with pytest.raises(LiteLLMRateLimitError) as rate_limit:
+                await model.request([ModelRequest([UserPromptPart("rate limit")])], None, make_params())
+            with pytest.raises(LiteLLMContextWindowExceededError):
+                await model.request([ModelRequest([UserPromptPart("too long")])], None, make_params())
+
+        assert rate_limit.value.retry_after == 2
+
+    @pytest.mark.asyncio
+    async def test_read_timeouts_are_classified_as_timeouts(self):
+        server = _Server(stall=True)
+        async with server as api_base, OpenAICompatibleTransport() as transport:
+            model = LiteLLMModel("hosted_vllm/llama-3", api_base=api_base, transport=transport)
+            settings = {'timeout': 0.1}
+            with pytest.raises(LiteLLMTimeoutError):
+                await model.request([ModelRequest([UserPromptPart("slow")])], settings, make_params())
+            with pytest.raises(LiteLLMTimeoutError):
+                async with model.request_stream(make_messages(_PROMPT), settings, make_params()) as s:
+                    async for _ in s:
+                        pass
+
+    @pytest.mark.asyncio
+    async def test_cancel_closes_the_connection(self):
+        server = _Server(stall=True)
+        async with server as api_base, OpenAICompatibleTransport() as transport:
+            model = LiteLLMModel("hosted_vllm/llama-3", api_base=api_base, transport=transport)
+            async with model.request_stream(make_messages(_PROMPT), None, make_params()) as s:
+
+                async def consume():
+                    async for _ in s:
+                        pass
+
+                task = asyncio.create_task(consume())
+                await asyncio.sleep(0.05)
+                await s.cancel()
+                await asyncio.wait_for(task, 1)
+
+        assert s.get().state == 'interrupted'
+
+    @pytest.mark.asyncio
+    async def test_other_providers_use_litellm(self):
+        transport = OpenAICompatibleTransport()
+        model = LiteLLMModel("anthropic/claude-sonnet-4", api_base="http://gateway", transport=transport)
+        response = Mock(usage=None, model="claude-sonnet-4", id="msg_1", created=1_700_000_000)
+        response.choices = [Mock()]
+        response.choices[0].message = Mock(content="Hi", tool_calls=[])
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', AsyncMock(return_value=response)) as mock:
+            await model.request(make_messages(_PROMPT), None, make_params())
+
+        assert mock.await_count == 1
+        assert transport.provider({'model': 'hosted_vllm/llama-3'}) is None
+        assert transport.provider({'model': 'llama-3', 'api_base': 'http://x', 'custom_llm_provider': 'openai'}) == 'openai'
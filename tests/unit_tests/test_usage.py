@@ -0,0 +1,157 @@
+"""Tests for usage and cost mapping."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from pydantic_ai_litellm import Deployment, InMemoryResponseCache, LatencyRouter, LiteLLMModel
+from pydantic_ai_litellm.litellm_model import _map_usage
+
+from helpers import make_chunk, make_messages, make_params, make_response, make_stream
+
+
+def _usage(**kwargs) -> SimpleNamespace:
+    fields = {
+        'prompt_tokens': 1200,
+        'completion_tokens': 300,
+        'prompt_tokens_details': SimpleNamespace(cached_tokens=1024, audio_tokens=40),
+        'completion_tokens_details': SimpleNamespace(
+            reasoning_tokens=200, audio_tokens=0, accepted_prediction_tokens=None, rejected_prediction_tokens=3
+        ),
+    }
+    return SimpleNamespace(**{**fields, **kwargs})
+
+
+class TestMapUsage:
+    def test_maps_detail_fields(self):
+        run_usage = _map_usage(_usage())
+
+        assert run_usage.input_tokens == 1200
+        assert run_usage.output_tokens == 300
+        assert run_usage.cache_read_tokens == 1024
+        assert run_usage.cache_write_tokens == 0
+        assert run_usage.input_audio_tokens == 40
+        assert run_usage.output_audio_tokens == 0
+        assert run_usage.details == {'reasoning_tokens': 200, 'rejected_prediction_tokens': 3}
+        assert run_usage.requests == 0
+
+    def test_maps_anthropic_cache_fields(self):
+        run_usage = _map_usage(
+            _usage(cache_read_input_tokens=900, cache_creation_input_tokens=250, prompt_tokens_details=None)
+        )
+
+        assert run_usage.cache_read_tokens == 900
+        assert run_usage.cache_write_tokens == 250
+
+    def test_missing_details(self):
+        run_usage = _map_usage(SimpleNamespace(prompt_tokens=10, completion_tokens=5))
+
+        assert run_usage.input_tokens == 10
+        assert run_usage.cache_read_tokens == 0
+        assert run_usage.details == {}
+
+
+class TestStreamedUsage:
+    @pytest.mark.asyncio
+    async def test_requests_final_usage_chunk(self):
+        model = LiteLLMModel(model_name="gpt-4o")
+        mock = AsyncMock(return_value=make_stream(make_chunk("Hi"), make_chunk(None, usage=_usage())))
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', mock):
+            async with model.request_stream(make_messages(), None, make_params()) as stream:
+                async for _ in stream:
+                    pass
+
+        assert mock.call_args.kwargs['stream_options'] == {'include_usage': True}
+        run_usage = stream.usage
+        assert run_usage.cache_read_tokens == 1024
+        assert run_usage.details['reasoning_tokens'] == 200
+
+    @pytest.mark.asyncio
+    async def test_non_streamed_request_has_no_stream_options(self):
+        model = LiteLLMModel(model_name="gpt-4o")
+        mock = AsyncMock(return_value=make_response(usage=_usage()))
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', mock):
+            await model.request(make_messages(), None, make_params())
+
+        assert 'stream_options' not in mock.call_args.kwargs
+
+
+class TestCost:
+    @pytest.mark.asyncio
+    async def test_cost_is_opt_in(self):
+        model = LiteLLMModel(model_name="gpt-4o")
+
+        completion = AsyncMock(return_value=make_response(usage=_usage()))
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', completion):
+            response = await model.request(make_messages(), None, make_params())
+
+        assert 'cost' not in (response.provider_details or {})
+
+    @pytest.mark.asyncio
+    async def test_cost_from_model_cost_table(self):
+        model = LiteLLMModel(model_name="gpt-4o")
+        settings = {'litellm_include_cost': True}
+
+        completion = AsyncMock(return_value=make_response(usage=_usage()))
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', completion):
+            response = await model.request(make_messages(), settings, make_params())
+
+        assert response.provider_details['cost'] > 0
+
+    @pytest.mark.asyncio
+    async def test_streamed_cost(self):
+        model = LiteLLMModel(model_name="gpt-4o")
+        stream_mock = AsyncMock(return_value=make_stream(make_chunk("Hi"), make_chunk(None, usage=_usage())))
+
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', stream_mock):
+            async with model.request_stream(make_messages(), {'litellm_include_cost': True}, make_params()) as stream:
+                async for _ in stream:
+                    pass
+
+        assert stream.get().provider_details['cost'] > 0
+
+    @pytest.mark.asyncio
+    async def test_cost_of_routed_deployment_model(self):
+        direct = LiteLLMModel(model_name="gpt-4o-mini")
+        router = LatencyRouter([Deployment(model_name="gpt-4o-mini", name="mini")])
+        routed = LiteLLMModel(model_name="gpt-4o", router=router)
+        settings = {'litellm_include_cost': True}
+
+        completion = AsyncMock(return_value=make_response(usage=_usage()))
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', completion):
+            expected = await direct.request(make_messages(), settings, make_params())
+            response = await routed.request(make_messages(), settings, make_params())
+
+        stream_mock = AsyncMock(return_value=make_stream(make_chunk("Hi"), make_chunk(None, usage=_usage())))
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', stream_mock):
+            async with routed.request_stream(make_messages(), settings, make_params()) as stream:
+                async for _ in stream:
+                    pass
+
+        assert response.provider_details['cost'] == expected.provider_details['cost']
+        assert stream.get().provider_details['cost'] == expected.provider_details['cost']
+
+    @pytest.mark.asyncio
+    async def test_unknown_model_has_no_cost(self):
+        model = LiteLLMModel(model_name="hosted_vllm/my-finetune")
+
+        completion = AsyncMock(return_value=make_response(usage=_usage()))
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', completion):
+            response = await model.request(make_messages(), {'litellm_include_cost': True}, make_params())
+
+        assert 'cost' not in (response.provider_details or {})
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_costs_nothing(self):
+        model = LiteLLMModel(model_name="gpt-4o", response_cache=InMemoryResponseCache())
+        settings = {'litellm_include_cost': True}
+
+        completion = AsyncMock(return_value=make_response(usage=_usage()))
+        with patch('pydantic_ai_litellm.litellm_model.acompletion', completion):
+            await model.request(make_messages(), settings, make_params())
+            cached = await model.request(make_messages(), settings, make_params())
+
+        assert cached.provider_details['cost'] == 0.0
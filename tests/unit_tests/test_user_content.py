@@ -0,0 +1,195 @@
+"""Tests for multimodal user prompt content mapping and the base64 encoding cache."""
+
+import base64
+from unittest.mock import patch
+
+import pytest
+from pydantic_ai.exceptions import UserError
+from pydantic_ai.messages import (
+    AudioUrl,
+    BinaryContent,
+    CachePoint,
+    DocumentUrl,
+    ImageUrl,
+    ModelRequest,
+    TextContent,
+    UploadedFile,
+    UserPromptPart,
+    VideoUrl,
+)
+
+from pydantic_ai_litellm import Deployment, LatencyRouter, LiteLLMModel
+from pydantic_ai_litellm._user_content import Base64Cache, _b64encode
+
+from helpers import make_params
+
+_PNG = base64.b64decode(
+    'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8BQDwAEhQGAhKmMIQAAAABJRU5ErkJggg=='
+)
+
+
+class TestMapUserContent:
+    def setup_method(self):
+        self.model = LiteLLMModel(model_name="gpt-4o", api_key="test-key")
+
+    async def _content(self, *items, settings=None) -> list:
+        messages = await self.model._map_messages(
+            [ModelRequest([UserPromptPart(list(items))])], make_params(), settings
+        )
+        return messages[0]['content']
+
+    @pytest.mark.asyncio
+    async def test_text_and_binary_content(self):
+        content = await self._content(
+            "Compare these",
+            TextContent("carefully", metadata={'not': 'sent'}),
+            BinaryContent(_PNG, media_type="image/png", vendor_metadata={'detail': 'high'}),
+            BinaryContent(b"RIFF", media_type="audio/wav"),
+            BinaryContent(b"%PDF-1.4", media_type="application/pdf"),
+            BinaryContent(b"a,b\n1,2", media_type="text/csv", identifier="table"),
+        )
+
+        assert content[0] == {'type': 'text', 'text': 'Compare these'}
+        assert content[1] == {'type': 'text', 'text': 'carefully'}
+        assert content[2] == {
+            'type': 'image_url',
+            'image_url': {'url': f'data:image/png;base64,{base64.b64encode(_PNG).decode()}', 'detail': 'high'},
+        }
+        assert content[3] == {'type': 'input_audio', 'input_audio': {'data': 'UklGRg==', 'format': 'wav'}}
+        assert content[4] == {
+            'type': 'file',
+            'file': {
+                'file_data': 'data:application/pdf;base64,JVBERi0xLjQ=',
+                'format': 'application/pdf',
+                'filename': 'filename.pdf',
+            },
+        }
+        assert content[5]['type'] == 'text'
+        assert content[5]['text'].startswith('-----BEGIN FILE id="table" type="text/csv"-----\na,b\n1,2')
+
+    @pytest.mark.asyncio
+    async def test_urls_are_passed_through(self):
+        self.model = LiteLLMModel(model_name="gemini/gemini-2.5-pro", api_key="test-key")
+        content = await self._content(
+            ImageUrl("https://example.com/cat.png", vendor_metadata={'detail': 'low'}),
+            DocumentUrl("https://example.com/report.pdf"),
+            AudioUrl("https://example.com/clip", media_type="audio/mpeg"),
+            VideoUrl("https://example.com/talk", vendor_metadata={'fps': 1}),
+            UploadedFile(file_id="file-123", provider_name="google-gla"),
+        )
+
+        assert content == [
+            {'type': 'image_url', 'image_url': {'url': 'https://example.com/cat.png', 'detail': 'low'}},
+            {'type': 'file', 'file': {'file_id': 'https://example.com/report.pdf', 'format': 'application/pdf'}},
+            {'type': 'file', 'file': {'file_id': 'https://example.com/clip', 'format': 'audio/mpeg'}},
+            {'type': 'file', 'file': {'file_id': 'https://example.com/talk', 'video_metadata': {'fps': 1}}},
+            {'type': 'file', 'file': {'file_id': 'file-123'}},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_anthropic_document_urls_have_no_format(self):
+        self.model = LiteLLMModel(model_name="anthropic/claude-sonnet-4-5", api_key="test-key")
+        content = await self._content(DocumentUrl("https://example.com/report.pdf", media_type="application/pdf"))
+
+        assert content == [{'type': 'file', 'file': {'file_id': 'https://example.com/report.pdf'}}]
+
+    @pytest.mark.asyncio
+    async def test_file_urls_are_rejected_for_providers_that_download_them(self):
+        content = await self._content(ImageUrl("https://example.com/cat.png"))
+        assert content == [{'type': 'image_url', 'image_url': {'url': 'https://example.com/cat.png'}}]
+
+        with pytest.raises(UserError, match='`DocumentUrl` is only supported'):
+            await self._content(DocumentUrl("https://example.com/report.pdf"))
+
+    @pytest.mark.asyncio
+    async def test_provider_is_only_resolved_for_file_urls(self):
+        with patch('pydantic_ai_litellm.litellm_model.file_url_provider', return_value=None) as resolve:
+            await self._content(ImageUrl("https://example.com/cat.png"), BinaryContent(_PNG, media_type="image/png"))
+            assert not resolve.called
+
+            with pytest.raises(UserError):
+                await self._content(DocumentUrl("https://example.com/a.pdf"), DocumentUrl("https://example.com/b.pdf"))
+            assert resolve.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_custom_llm_provider_setting_is_used(self):
+        self.model = LiteLLMModel(model_name="my-model", api_key="test-key")
+        messages = [ModelRequest([UserPromptPart([DocumentUrl("https://example.com/report.pdf")])])]
+
+        with pytest.raises(UserError, match='`DocumentUrl` is only supported'):
+            await self.model._map_messages(messages, make_params())
+        mapped = await self.model._map_messages(messages, make_params(), {'litellm_custom_llm_provider': 'anthropic'})
+
+        assert mapped[0]['content'] == [{'type': 'file', 'file': {'file_id': 'https://example.com/report.pdf'}}]
+
+    @pytest.mark.asyncio
+    async def test_router_deployments_set_the_provider(self):
+        document = DocumentUrl("https://example.com/report.pdf")
+        self.model = LiteLLMModel(
+            model_name="gpt-4o",
+            router=LatencyRouter([Deployment(model_name="anthropic/claude-sonnet-4-5", name="a")]),
+        )
+        content = await self._content(document)
+        assert content == [{'type': 'file', 'file': {'file_id': 'https://example.com/report.pdf'}}]
+
+        self.model = LiteLLMModel(
+            model_name="anthropic/claude-sonnet-4-5",
+            router=LatencyRouter([Deployment(name="a"), Deployment(model_name="gpt-4o", name="b")]),
+        )
+        with pytest.raises(UserError, match='same provider \\(anthropic, unsupported\\)'):
+            await self._content(document)
+
+    @pytest.mark.asyncio
+    async def test_cache_point_marks_previous_part(self):
+        content = await self._content("Long document", CachePoint(), "Question")
+
+        assert content[0] == {'type': 'text', 'text': 'Long document', 'cache_control': {'type': 'ephemeral'}}
+        assert content[1] == {'type': 'text', 'text': 'Question'}
+
+    @pytest.mark.asyncio
+    async def test_force_download_is_rejected(self):
+        with pytest.raises(UserError, match='force_download'):
+            await self._content(DocumentUrl("https://example.com/report.pdf", force_download=True))
+
+    @pytest.mark.asyncio
+    async def test_binary_content_is_encoded_once(self):
+        """The same data in new conversations reuses the cached encoding; equal data in another object doesn't."""
+        data = bytes(range(256)) * 1000
+        first = await self._content(BinaryContent(data, media_type="image/png"))
+        second = await self._content(BinaryContent(data, media_type="image/png"))
+        third = await self._content(BinaryContent(bytes(bytearray(data)), media_type="image/png"))
+
+        assert first[0]['image_url']['url'] is second[0]['image_url']['url']
+        assert third[0]['image_url']['url'] == first[0]['image_url']['url']
+        info = self.model.base64_cache_info
+        assert (info.hits, info.misses, info.currsize) == (1, 2, 2 * (256_000 + len(first[0]['image_url']['url'])))
+
+
+class TestBase64Cache:
+    @pytest.mark.parametrize('size', [0, 1, 2, 3, 196_607, 196_608, 196_609, 500_000])
+    def test_encoding(self, size):
+        data = bytes(i % 251 for i in range(size))
+        assert _b64encode(data, b'data:x;base64,') == 'data:x;base64,' + base64.b64encode(data).decode()
+
+    def test_evicts_least_recently_used(self):
+        cache = Base64Cache(max_bytes=30)
+        a, b, c = b'a' * 6, b'b' * 6, b'c' * 6  # 6 bytes of data and 8 encoded each
+
+        cache.encode(a)
+        cache.encode(b)
+        cache.encode(a)
+        cache.encode(c)
+
+        assert cache.cache_info().currsize == 28
+        cache.encode(a)
+        cache.encode(b)
+        assert (cache.hits, cache.misses) == (2, 4)
+
+    def test_oversized_and_disabled(self):
+        cache = Base64Cache(max_bytes=4)
+        cache.encode(b'too long')
+        assert cache.cache_info().currsize == 0
+
+        disabled = Base64Cache(max_bytes=0)
+        assert disabled.encode(b'abc') == 'YWJj'
+        assert (disabled.hits, disabled.misses) == (0, 0)